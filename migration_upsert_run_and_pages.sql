@@ -0,0 +1,66 @@
+-- Migration: single round-trip writes of runs and their pages
+-- SupabaseWriterV2 calls these functions through PostgREST RPC; without them the writer
+-- falls back to three requests (delete pages, upsert runs, insert pages).
+-- Requires migration_fix_unique_constraint.sql (pages unique per nr, page_type).
+
+CREATE OR REPLACE FUNCTION upsert_run_and_pages(run JSONB, pages JSONB)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- Each nr keeps only the pages of its latest run
+    DELETE FROM cto_pages WHERE nr = (run->>'nr')::INTEGER;
+
+    INSERT INTO cto_runs (nr, run_id, gate_passed, gate_reason, status, started_at, finished_at, error, metrics)
+    SELECT nr, run_id, COALESCE(gate_passed, false), gate_reason, COALESCE(status, 'ok'),
+           started_at, finished_at, error, metrics
+    FROM jsonb_populate_record(NULL::cto_runs, run)
+    ON CONFLICT (nr) DO UPDATE SET
+        run_id = EXCLUDED.run_id,
+        gate_passed = EXCLUDED.gate_passed,
+        gate_reason = EXCLUDED.gate_reason,
+        status = EXCLUDED.status,
+        started_at = EXCLUDED.started_at,
+        finished_at = EXCLUDED.finished_at,
+        error = EXCLUDED.error,
+        metrics = EXCLUDED.metrics;
+
+    INSERT INTO cto_pages (run_id, nr, page_type, url, status_code, final_url, html_hash,
+                           content_length, extracted, raw_html_gz_b64)
+    SELECT run_id, nr, page_type, url, status_code, final_url, html_hash,
+           content_length, COALESCE(extracted, '{}'::jsonb), raw_html_gz_b64
+    FROM jsonb_populate_recordset(NULL::cto_pages, COALESCE(pages, '[]'::jsonb));
+END;
+$$;
+
+-- Bulk variant for a flushed buffer: runs is a JSON array of cto_runs rows,
+-- pages the flattened cto_pages rows of all those runs
+CREATE OR REPLACE FUNCTION upsert_runs_and_pages(runs JSONB, pages JSONB)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    DELETE FROM cto_pages
+    WHERE nr IN (SELECT (r->>'nr')::INTEGER FROM jsonb_array_elements(runs) AS r);
+
+    INSERT INTO cto_runs (nr, run_id, gate_passed, gate_reason, status, started_at, finished_at, error, metrics)
+    SELECT nr, run_id, COALESCE(gate_passed, false), gate_reason, COALESCE(status, 'ok'),
+           started_at, finished_at, error, metrics
+    FROM jsonb_populate_recordset(NULL::cto_runs, runs)
+    ON CONFLICT (nr) DO UPDATE SET
+        run_id = EXCLUDED.run_id,
+        gate_passed = EXCLUDED.gate_passed,
+        gate_reason = EXCLUDED.gate_reason,
+        status = EXCLUDED.status,
+        started_at = EXCLUDED.started_at,
+        finished_at = EXCLUDED.finished_at,
+        error = EXCLUDED.error,
+        metrics = EXCLUDED.metrics;
+
+    INSERT INTO cto_pages (run_id, nr, page_type, url, status_code, final_url, html_hash,
+                           content_length, extracted, raw_html_gz_b64)
+    SELECT run_id, nr, page_type, url, status_code, final_url, html_hash,
+           content_length, COALESCE(extracted, '{}'::jsonb), raw_html_gz_b64
+    FROM jsonb_populate_recordset(NULL::cto_pages, COALESCE(pages, '[]'::jsonb));
+END;
+$$;
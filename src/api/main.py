@@ -45,6 +45,13 @@ async def startup():
         logger.warning("Supabase connection test failed, but continuing...")
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    """Release the state database connection and the Supabase writer pool."""
+    await state_db.close()
+    await writer.close()
+
+
 class ScrapeRequest(BaseModel):
     """Request model for scraping."""
     nr: int
@@ -73,20 +80,19 @@ async def health():
 async def get_metrics(_: bool = Depends(verify_api_key)):
     """Get current metrics (requires API key if configured)."""
     # Read from metrics.jsonl
+    from collections import deque
     from src.config import DATA_DIR
-    import json
+    import orjson
     
     metrics_file = DATA_DIR / "metrics.jsonl"
     if not metrics_file.exists():
         return {"error": "No metrics available"}
     
-    # Return last 100 lines
-    lines = []
-    with open(metrics_file, "r") as f:
-        for line in f:
-            lines.append(json.loads(line))
+    # Return last 100 lines (only those are decoded)
+    with open(metrics_file, "rb") as f:
+        lines = deque(f, maxlen=100)
     
-    return {"metrics": lines[-100:]}
+    return {"metrics": [orjson.loads(line) for line in lines]}
 
 
 @app.post("/scrape", response_model=ScrapeResponse)
@@ -4,6 +4,31 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Compiled once; matched against the lowercased HTML, so no IGNORECASE
+# (case-insensitive patterns lose sre's fast literal scan)
+_DOUBLE_SESSION_INDICATORS = tuple(
+    re.compile(pattern)
+    for pattern in (
+        r'double session',
+        r'deuxième session.*active',
+        r'session en trop',
+        r'quittez et reconnectez',
+        r'fermer la session',
+    )
+)
+_LOGIN_INDICATORS = tuple(
+    re.compile(pattern)
+    for pattern in (
+        r'<title[^>]*>.*connexion.*</title>',
+        r'<h1[^>]*>.*se connecter.*</h1>',
+        r'<h2[^>]*>.*connexion.*</h2>',
+        r'name=["\']username["\']',
+        r'name=["\']password["\']',
+        r'id=["\']login["\']',
+        r'class=["\'][^"\']*login[^"\']*["\']',
+    )
+)
+
 
 def is_double_session_popup(response_html: str | None) -> bool:
     """
@@ -12,20 +37,13 @@ def is_double_session_popup(response_html: str | None) -> bool:
     """
     if not response_html:
         return False
-    
-    html_lower = response_html.lower()
-    
-    # Check for double session indicators
-    double_session_indicators = [
-        r'double session',
-        r'deuxième session.*active',
-        r'session en trop',
-        r'quittez et reconnectez',
-        r'fermer la session',
-    ]
-    
+    return _has_double_session_indicators(response_html.lower())
+
+
+def _has_double_session_indicators(html_lower: str) -> bool:
+    """At least 2 double session indicators in already-lowercased HTML."""
     # Need at least 2 indicators to be sure
-    matches = sum(1 for pattern in double_session_indicators if re.search(pattern, html_lower, re.IGNORECASE))
+    matches = sum(1 for pattern in _DOUBLE_SESSION_INDICATORS if pattern.search(html_lower))
     return matches >= 2
 
 
@@ -57,18 +75,8 @@ def is_login_page(
     html_lower = response_html.lower()
     
     # Strong indicators
-    login_indicators = [
-        r'<title[^>]*>.*connexion.*</title>',
-        r'<h1[^>]*>.*se connecter.*</h1>',
-        r'<h2[^>]*>.*connexion.*</h2>',
-        r'name=["\']username["\']',
-        r'name=["\']password["\']',
-        r'id=["\']login["\']',
-        r'class=["\'][^"\']*login[^"\']*["\']',
-    ]
-    
-    for pattern in login_indicators:
-        if re.search(pattern, html_lower, re.IGNORECASE):
+    for pattern in _LOGIN_INDICATORS:
+        if pattern.search(html_lower):
             return True
     
     # Weak indicators (need multiple)
@@ -84,7 +92,7 @@ def is_login_page(
         return True
     
     # Check for double session popup (also requires re-authentication)
-    if is_double_session_popup(response_html):
+    if _has_double_session_indicators(html_lower):
         return True
     
     return False
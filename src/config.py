@@ -1,5 +1,6 @@
 """Configuration management from environment variables."""
 import os
+from dataclasses import dataclass
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -31,8 +32,14 @@ class Config:
     CONCURRENCY: int = int(os.getenv("CONCURRENCY", "20"))
     BATCH_SIZE: int = int(os.getenv("BATCH_SIZE", "1000"))
     RATE_PER_DOMAIN: float = float(os.getenv("RATE_PER_DOMAIN", "2.0"))
+    # Max in-flight requests per host across all tasks (None: the run's concurrency)
+    PER_HOST_LIMIT: int | None = int(os.environ["PER_HOST_LIMIT"]) if os.getenv("PER_HOST_LIMIT") else None
     TIMEOUT: int = int(os.getenv("TIMEOUT", "20"))
     MAX_RETRIES: int = int(os.getenv("MAX_RETRIES", "5"))
+    # Threads used to parse the pages of one nr in parallel (1 = sequential)
+    PARSE_WORKERS: int = int(os.getenv("PARSE_WORKERS", "1"))
+    # HTML parser backend for page extraction: "lexbor" (default) or "modest" (fallback)
+    HTML_PARSER_BACKEND: str = os.getenv("HTML_PARSER_BACKEND", "lexbor").lower()
 
     # Supabase
     SUPABASE_URL: str | None = os.getenv("SUPABASE_URL")
@@ -62,3 +69,23 @@ class Config:
 
 config = Config()
 
+
+@dataclass(frozen=True, slots=True)
+class RunConfig:
+    """
+    Resolved settings for one scrape run, built once in main().
+    Precedence: CLI flags > DEV-mode defaults > environment (Config).
+    """
+
+    concurrency: int
+    batch_size: int
+    rate_per_domain: float
+
+    @classmethod
+    def from_config(cls, cfg: Config = config) -> "RunConfig":
+        """Snapshot of the environment-level configuration."""
+        return cls(
+            concurrency=cfg.CONCURRENCY,
+            batch_size=cfg.BATCH_SIZE,
+            rate_per_domain=cfg.RATE_PER_DOMAIN,
+        )
@@ -1,7 +1,9 @@
 """HTTP client with retries and error handling."""
 import asyncio
 import logging
+import weakref
 from typing import Optional
+from urllib.parse import urlparse
 import httpx
 from tenacity import (
     retry,
@@ -17,6 +19,26 @@ from src.fetch.rate_limit import RateLimiter
 logger = logging.getLogger(__name__)
 
 
+# Per-host in-flight request limit, shared by every FetchClient on the running loop
+# (the runner opens one client per nr, so a per-instance gate would not bound anything)
+_host_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _host_semaphore(url: str, limit: int) -> asyncio.Semaphore:
+    """
+    Get the shared semaphore limiting concurrent requests to the URL's host
+    (`limit` sizes it when the host is first seen on the running loop).
+    """
+    loop_semaphores = _host_semaphores.setdefault(asyncio.get_running_loop(), {})
+    host = urlparse(url).netloc
+    semaphore = loop_semaphores.get(host)
+    if semaphore is None:
+        semaphore = loop_semaphores[host] = asyncio.Semaphore(limit)
+    return semaphore
+
+
 def is_retryable_status(response: httpx.Response) -> bool:
     """Check if status code is retryable."""
     return response.status_code in (429, 500, 502, 503, 504)
@@ -25,7 +47,13 @@ def is_retryable_status(response: httpx.Response) -> bool:
 class FetchClient:
     """HTTP client with rate limiting, retries, and session management."""
 
-    def __init__(self, cookie_only: bool = False, login_only: bool = False):
+    def __init__(
+        self,
+        cookie_only: bool = False,
+        login_only: bool = False,
+        rate_per_domain: float | None = None,
+        per_host_limit: int | None = None,
+    ):
         # Configure connection pool
         limits = httpx.Limits(
             max_connections=100,
@@ -39,7 +67,8 @@ class FetchClient:
             follow_redirects=False,  # We handle redirects manually to detect login
             limits=limits,
         )
-        self.rate_limiter = RateLimiter(config.RATE_PER_DOMAIN)
+        self.per_host_limit = per_host_limit or config.PER_HOST_LIMIT or config.CONCURRENCY
+        self.rate_limiter = RateLimiter(rate_per_domain if rate_per_domain is not None else config.RATE_PER_DOMAIN)
         self.session_manager = SessionManager(self.client, cookie_only=cookie_only, login_only=login_only)
         self.retry_count = 0
         self.backoff_time_total = 0.0
@@ -59,6 +88,11 @@ class FetchClient:
     )
     async def fetch(self, url: str) -> Optional[httpx.Response]:
         """Fetch a URL with rate limiting, retries, and session management."""
+        async with _host_semaphore(url, self.per_host_limit):
+            return await self._fetch(url)
+
+    async def _fetch(self, url: str) -> Optional[httpx.Response]:
+        """Single fetch attempt; callers hold the per-host semaphore."""
         await self.rate_limiter.acquire(url)
 
         # Ensure authenticated
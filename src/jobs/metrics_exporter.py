@@ -1,9 +1,9 @@
 """Metrics exporter for observability."""
-import json
 import time
 from pathlib import Path
 from typing import Dict
 import aiofiles
+import orjson
 
 from src.config import DATA_DIR
 
@@ -45,7 +45,7 @@ class MetricsExporter:
             "avg_time_per_nr": round(avg_time_per_nr, 3),
         }
         
-        line = json.dumps(metrics) + "\n"
-        async with aiofiles.open(self.metrics_file, "a") as f:
+        line = orjson.dumps(metrics, option=orjson.OPT_APPEND_NEWLINE)
+        async with aiofiles.open(self.metrics_file, "ab") as f:
             await f.write(line)
 
@@ -3,16 +3,17 @@ import asyncio
 import logging
 import time
 import uuid
+from pathlib import Path
 from typing import Optional
 
-from src.config import config
+from src.config import config, RunConfig
 from src.fetch.client import FetchClient
 from src.fetch.endpoints import get_urls_for_nr
-from src.parse.html_parser import parse_html_pages
+from src.parse.html_parser import get_page_type, parse_html_pages
 from src.parse.models import SaleRecord
 from src.parse.redact import redact_json, redact_string
-from src.parse.explorer_enhanced import filter_and_tag_explorer_links
 from src.store.state import StateDB
+from src.store.checkpoint import Checkpoint, checkpoint_path_for
 from src.store.supabase_writer_v2 import SupabaseWriterV2
 from src.store.spool import SpoolManager
 from src.store.dev_storage import DevStorage
@@ -49,6 +50,8 @@ class ScrapeRunner:
         login_only: bool = False,
         dev_limit_payment: Optional[int] = None,
         dev_limit_transaction: Optional[int] = None,
+        run_config: Optional[RunConfig] = None,
+        checkpoint_path: Optional[Path] = None,
     ):
         self.start = start
         self.end = end
@@ -64,6 +67,9 @@ class ScrapeRunner:
         self.login_only = login_only
         self.dev_limit_payment = dev_limit_payment
         self.dev_limit_transaction = dev_limit_transaction
+        self.run_config = run_config or RunConfig.from_config(config)
+        # PER_HOST_LIMIT when set, else the run's (CLI-overridable) concurrency
+        self.per_host_limit = config.PER_HOST_LIMIT or self.run_config.concurrency
         
         # Generate run_id
         self.run_id = str(uuid.uuid4())
@@ -81,6 +87,7 @@ class ScrapeRunner:
         )
         
         self.state_db = StateDB()
+        self.checkpoint = Checkpoint(checkpoint_path or checkpoint_path_for(start, end))
         if not self.dry_run:
             try:
                 self.writer = SupabaseWriterV2()
@@ -119,6 +126,10 @@ class ScrapeRunner:
         # Get list of nr to process
         if self.resume:
             nrs = await self.state_db.get_next_undone(self.start, self.end)
+            # The checkpoint also covers not_found nrs, which the state DB would retry
+            completed = self.checkpoint.load()
+            if completed:
+                nrs = [nr for nr in nrs if nr not in completed]
             if nrs:
                 logger.info(f"Resuming: {len(nrs)} remaining records (first: {nrs[0]}, last: {nrs[-1]})")
             else:
@@ -128,7 +139,7 @@ class ScrapeRunner:
             logger.info(f"Starting fresh: {len(nrs)} records (first: {nrs[0]}, last: {nrs[-1]})")
 
         # Process with concurrency
-        semaphore = asyncio.Semaphore(config.CONCURRENCY)
+        semaphore = asyncio.Semaphore(self.run_config.concurrency)
 
         async def process_nr(nr: int) -> None:
             async with semaphore:
@@ -172,6 +183,7 @@ class ScrapeRunner:
                     
                     # Flush buffer after each chunk
                     await self._flush_buffer()
+                    self._save_checkpoint()
                 except Exception as e:
                     # Log but continue - don't let one chunk failure stop the whole run
                     logger.error(f"Error processing chunk starting at index {i}: {e}", exc_info=True)
@@ -194,12 +206,28 @@ class ScrapeRunner:
                 await self._flush_buffer()
             except Exception as e:
                 logger.error(f"Error in final flush: {e}", exc_info=True)
+            self._save_checkpoint()
             
             # Final report
             try:
                 await self._final_report()
             except Exception as e:
                 logger.error(f"Error generating final report: {e}", exc_info=True)
+            await self.state_db.close()
+            if self.writer:
+                await self.writer.close()
+
+    async def _mark_done(self, nr: int) -> None:
+        """Mark nr as done in the state DB and the checkpoint."""
+        await self.state_db.mark_done(nr)
+        self.checkpoint.add(nr)
+
+    def _save_checkpoint(self) -> None:
+        """Persist the checkpoint; a failed write must not stop the run."""
+        try:
+            self.checkpoint.save()
+        except Exception as e:
+            logger.error(f"Error saving checkpoint: {e}", exc_info=True)
 
     async def _export_metrics(self) -> None:
         """Export current metrics."""
@@ -262,7 +290,12 @@ class ScrapeRunner:
             if self.dev_mode:
                 logger.info(f"[DEV] Fetching view page for nr {cto_nr}...")
             
-            async with FetchClient(cookie_only=self.cookie_only, login_only=self.login_only) as client:
+            async with FetchClient(
+                cookie_only=self.cookie_only,
+                login_only=self.login_only,
+                rate_per_domain=self.run_config.rate_per_domain,
+                per_host_limit=self.per_host_limit,
+            ) as client:
                 view_response = await client.fetch(view_url)
 
             # Check for errors
@@ -291,6 +324,7 @@ class ScrapeRunner:
             # Check for 404
             if view_response.status_code == 404:
                 await self.state_db.mark_not_found(cto_nr)
+                self.checkpoint.add(cto_nr)
                 self.metrics.increment("not_found")
                 self.metrics.increment("processed")
                 self.run_control.record_success()
@@ -356,9 +390,9 @@ class ScrapeRunner:
                         record_data["gate_matched_text"] = gate_reason["gate_matched_text"]
                 
                 # Redact before storing
-                record_data = redact_json(record_data)
+                record_data = redact_json(record_data, in_place=True)
                 
-                record = SaleRecord(
+                record = SaleRecord.model_construct(
                     nr=cto_nr,
                     status="ok",
                     data=record_data,
@@ -382,12 +416,12 @@ class ScrapeRunner:
                 self.run_control.record_success()
                 
                 # Flush if needed
-                if len(self.batch_buffer) >= config.BATCH_SIZE:
+                if len(self.batch_buffer) >= self.run_config.batch_size:
                     await self._flush_buffer()
                 
                 # Mark as done only after successful flush (or if dry-run/no writer)
                 if self.dry_run or not self.writer:
-                    await self.state_db.mark_done(cto_nr)
+                    await self._mark_done(cto_nr)
                 # Otherwise, mark_done will be called in _flush_buffer after successful write
                 return
 
@@ -400,7 +434,12 @@ class ScrapeRunner:
                 page_types = [self._get_page_type_from_url(u) for u in urls]
                 logger.info(f"[DEV] nr {cto_nr}: Crawling {len(urls)} URLs: {page_types}")
             
-            async with FetchClient(cookie_only=self.cookie_only, login_only=self.login_only) as client:
+            async with FetchClient(
+                cookie_only=self.cookie_only,
+                login_only=self.login_only,
+                rate_per_domain=self.run_config.rate_per_domain,
+                per_host_limit=self.per_host_limit,
+            ) as client:
                 responses = await client.fetch_all(urls)
             
             # Verify all URLs are in responses (even if None due to fetch failure)
@@ -478,7 +517,12 @@ class ScrapeRunner:
                 if self.dev_mode:
                     logger.info(f"[PAYMENT] Fetching {len(detail_urls)} detail modals...")
                 
-                async with FetchClient(cookie_only=self.cookie_only, login_only=self.login_only) as detail_client:
+                async with FetchClient(
+                    cookie_only=self.cookie_only,
+                    login_only=self.login_only,
+                    rate_per_domain=self.run_config.rate_per_domain,
+                    per_host_limit=self.per_host_limit,
+                ) as detail_client:
                     detail_responses = await detail_client.fetch_all(detail_urls.keys())
                     
                     # Log fetch results in DEV mode
@@ -522,7 +566,13 @@ class ScrapeRunner:
                     status = "OK" if html_content else "FAILED"
                     logger.debug(f"[DEV]   - {page_type}: {url} [{status}]")
             
-            parsed_data = parse_html_pages(main_pages_responses, config.BASE_URL, gate_passed=True, store_debug_snippets=self.dev_mode)
+            parsed_data = parse_html_pages(
+                main_pages_responses,
+                config.BASE_URL,
+                gate_passed=True,
+                store_debug_snippets=self.dev_mode,
+                explorer_max_links=self.explorer_max_links,
+            )
             
             # Log parsed pages
             parsed_pages = parsed_data.get("pages", {})
@@ -543,19 +593,12 @@ class ScrapeRunner:
                 if missing_page_types:
                     logger.warning(f"[DEV] nr {cto_nr}: Missing pages: {missing_page_types}")
             
-            # Process explorer links with enhanced filtering
+            # Explorer links were already filtered and tagged by parse_html_pages
+            # (with explorer_max_links), reusing each page's parsed tree
             if self.store_explorer:
-                for page_type, page_data in parsed_data.get("pages", {}).items():
-                    # Use main_pages_responses to get HTML (consistent with what was parsed)
-                    page_url = page_data.get("url", "")
-                    html_content = main_pages_responses.get(page_url)
-                    if html_content:
-                        explorer_links = filter_and_tag_explorer_links(
-                            html_content,
-                            config.BASE_URL,
-                            max_links=self.explorer_max_links,
-                        )
-                        page_data["explorer_links"] = explorer_links
+                for page_data in parsed_data.get("pages", {}).values():
+                    if page_data.get("content_length"):
+                        page_data.setdefault("explorer_links", [])
             else:
                 parsed_data.pop("explorer_links", None)
                 for page_data in parsed_data.get("pages", {}).values():
@@ -618,7 +661,7 @@ class ScrapeRunner:
             # Redact secrets before storing
             data = redact_json(data)
 
-            record = SaleRecord(
+            record = SaleRecord.model_construct(
                 nr=cto_nr,
                 status="ok",
                 data=data,
@@ -664,7 +707,7 @@ class ScrapeRunner:
             page_types = list(parsed_data.get("pages", {}).keys())
             logger.info(
                 f"[GATE_PASSED] nr {cto_nr}: Parsed {pages_count} pages: {page_types}. "
-                f"Adding to buffer (buffer_size={len(self.batch_buffer) + 1}/{config.BATCH_SIZE})"
+                f"Adding to buffer (buffer_size={len(self.batch_buffer) + 1}/{self.run_config.batch_size})"
             )
             
             # Log warning if pages count is unexpected
@@ -681,12 +724,12 @@ class ScrapeRunner:
             self.batch_buffer.append(record)
 
             # Flush if buffer is full
-            if len(self.batch_buffer) >= config.BATCH_SIZE:
+            if len(self.batch_buffer) >= self.run_config.batch_size:
                 await self._flush_buffer()
 
             # Mark as done only after successful flush (or if dry-run/no writer)
             if self.dry_run or not self.writer:
-                await self.state_db.mark_done(cto_nr)
+                await self._mark_done(cto_nr)
             # Otherwise, mark_done will be called in _flush_buffer after successful write
             
             self.metrics.increment("ok")
@@ -810,7 +853,7 @@ class ScrapeRunner:
                         details_url,
                     )
                     # Redact before storing
-                    modal_data = redact_json(modal_data)
+                    modal_data = redact_json(modal_data, in_place=True)
                     
                     # Merge item data with modal details
                     enriched_item = dict(item)  # Copy all fields from JSinfos
@@ -827,7 +870,7 @@ class ScrapeRunner:
                         details_url,
                     )
                     # Redact before storing
-                    modal_data = redact_json(modal_data)
+                    modal_data = redact_json(modal_data, in_place=True)
                     
                     # Merge item data with modal details
                     enriched_item = dict(item)  # Copy all fields from JSinfos
@@ -872,16 +915,7 @@ class ScrapeRunner:
 
     def _get_page_type_from_url(self, url: str) -> str:
         """Extract page type from URL."""
-        if "viewLogistic" in url:
-            return "logistic"
-        elif "viewPayment" in url:
-            return "payment"
-        elif "viewInfos" in url:
-            return "infos"
-        elif "viewOrders" in url:
-            return "orders"
-        else:
-            return "view"
+        return get_page_type(url)
 
     async def _flush_buffer(self) -> None:
         """Flush buffer to Supabase or spool."""
@@ -898,7 +932,7 @@ class ScrapeRunner:
                 logger.info(f"[DEV] Skipping Supabase write ({len(records)} records) - dry-run mode")
             # Mark as done even in dry-run mode (since we're not writing to Supabase)
             for record in records:
-                await self.state_db.mark_done(record.nr)
+                await self._mark_done(record.nr)
             return
 
         try:
@@ -907,8 +941,27 @@ class ScrapeRunner:
             failed_nrs = []
             
             logger.info(f"[FLUSH_BUFFER] Flushing {len(records)} records to Supabase (batch_id={self.batch_id})")
+
+            # One bulk write for the whole buffer; records are written one by one only if it fails
+            records_to_write = records
+            if len(records) > 1:
+                try:
+                    await self.writer.upsert_runs_and_pages_batch(
+                        self.run_id,
+                        records,
+                        max_html_bytes=self.max_html_bytes if self.store_html else None,
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"[FLUSH_BUFFER] Bulk write of {len(records)} records failed, writing one by one: {e}"
+                    )
+                else:
+                    records_to_write = []
+                    for record in records:
+                        successfully_written_nrs.append(record.nr)
+                        await self._mark_done(record.nr)
             
-            for record in records:
+            for record in records_to_write:
                 # Log pages count before writing
                 pages_count = len(record.data.get("pages", {}))
                 gate_passed = record.data.get("gate_passed", False)
@@ -938,7 +991,7 @@ class ScrapeRunner:
                     )
                     # Mark as done only after successful Supabase write
                     successfully_written_nrs.append(record.nr)
-                    await self.state_db.mark_done(record.nr)
+                    await self._mark_done(record.nr)
                     if gate_passed:
                         logger.info(
                             f"[SUCCESS] nr={record.nr} successfully written to Supabase with {pages_count} pages: {page_types}"
@@ -992,5 +1045,5 @@ class ScrapeRunner:
             for record in records:
                 # Redact before spooling
                 record.data = redact_json(record.data)
-                await self.spool.write_record(record, self.batch_id)
+            await self.spool.write_records(records, self.batch_id)
 
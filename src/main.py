@@ -1,15 +1,17 @@
 """Main entry point with CLI."""
 import argparse
 import asyncio
+import dataclasses
 import sys
 from pathlib import Path
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.config import config, Config
+# Only lightweight modules here: config feeds the --help defaults, while the
+# runner (httpx, supabase, selectolax...) is imported in main() once args are valid
+from src.config import config, Config, RunConfig
 from src.logging_conf import setup_logging
-from src.jobs.runner import ScrapeRunner
 
 import logging
 
@@ -209,6 +211,15 @@ def main() -> None:
     is_dry_run = args.dry_run
     write_supabase = args.write_supabase
 
+    # Resolve run settings once: CLI > DEV defaults > env
+    run_config = RunConfig.from_config(config)
+    if is_dev:
+        run_config = dataclasses.replace(run_config, concurrency=2, batch_size=10, rate_per_domain=0.5)
+    if args.concurrency:
+        run_config = dataclasses.replace(run_config, concurrency=args.concurrency)
+    if args.batch_size:
+        run_config = dataclasses.replace(run_config, batch_size=args.batch_size)
+
     # Apply DEV mode defaults
     if is_dev:
         if args.start is None and args.end is None and args.nr is None:
@@ -216,11 +227,6 @@ def main() -> None:
             if args.nr is None:
                 args.start = 52000
                 args.end = 52005
-        if args.concurrency is None:
-            config.CONCURRENCY = 2
-        if args.batch_size is None:
-            config.BATCH_SIZE = 10
-        config.RATE_PER_DOMAIN = 0.5
         # Resume disabled in DEV by default (only if not explicitly set)
         if args.resume is None:
             args.resume = False
@@ -242,12 +248,6 @@ def main() -> None:
         logger.error("Must specify either --nr or --start/--end")
         sys.exit(1)
 
-    # Override config from args
-    if args.concurrency:
-        config.CONCURRENCY = args.concurrency
-    if args.batch_size:
-        config.BATCH_SIZE = args.batch_size
-
     # Security: DEV mode requires explicit --write-supabase
     if is_dev and not write_supabase:
         logger.warning("DEV mode: Supabase writes disabled (use --write-supabase to enable)")
@@ -267,14 +267,18 @@ def main() -> None:
     logger.info("DigiFactory Scraper Starting")
     logger.info(f"Mode: {'DEV' if is_dev else 'PROD'}")
     logger.info(f"Range: {start} - {end}")
-    logger.info(f"Concurrency: {config.CONCURRENCY}")
-    logger.info(f"Rate per domain: {config.RATE_PER_DOMAIN}")
-    logger.info(f"Batch size: {config.BATCH_SIZE}")
+    logger.info(f"Concurrency: {run_config.concurrency}")
+    logger.info(f"Rate per domain: {run_config.rate_per_domain}")
+    logger.info(f"Batch size: {run_config.batch_size}")
     logger.info(f"Resume: {args.resume}")
     logger.info(f"Dry-run: {is_dry_run}")
     logger.info(f"Write Supabase: {write_supabase and not is_dry_run}")
     logger.info("=" * 60)
 
+    # Deferred: heavy imports are only paid for an actual run
+    from src.jobs.runner import ScrapeRunner
+    from src.store.checkpoint import checkpoint_path_for
+
     # Run scraper
     runner = ScrapeRunner(
         start=start,
@@ -298,6 +302,8 @@ def main() -> None:
         login_only=args.login_only,
         dev_limit_payment=(args.dev_limit_payment or args.dev_payment_limit) if is_dev else None,
         dev_limit_transaction=args.dev_limit_transaction if is_dev else None,
+        run_config=run_config,
+        checkpoint_path=checkpoint_path_for(start, end),
     )
     try:
         asyncio.run(runner.run())
@@ -1,11 +1,36 @@
 """Extract basket data from jBasketComposer JavaScript calls."""
-import json
 import logging
 import re
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
+_BASKET_MARKER = "jBasketComposer"
+_OPENERS = {"[": "]", "{": "}"}
+# Common fields: standard key -> accepted aliases, by priority
+_FIELD_MAPPING = {
+    "name": ["name", "nom", "label", "libelle"],
+    "ref": ["ref", "reference", "code", "sku"],
+    "price": ["price", "prix", "amount", "montant"],
+    "qtty": ["qtty", "quantity", "qty", "quantite"],
+    "tax": ["tax", "tva", "vat"],
+    "rate": ["rate", "taux", "tax_rate"],
+    "subscription": ["subscription", "abonnement"],
+    "sub_start": ["sub_start", "subscription_start", "debut_abonnement"],
+    "total": ["total", "total_ht", "total_ttc"],
+}
+# alias -> (standard key, priority)
+_ALIAS_TO_STANDARD = {
+    alias: (standard_key, rank)
+    for standard_key, aliases in _FIELD_MAPPING.items()
+    for rank, alias in enumerate(aliases)
+}
+
+# Only characters that change bracket/string state; everything between them is skipped in C
+_STRUCTURAL = re.compile(r"[\[\]{}\"'\\]")
+
 
 def extract_basket_lines(html_content: str) -> list[dict[str, Any]]:
     """
@@ -15,21 +40,13 @@ def extract_basket_lines(html_content: str) -> list[dict[str, Any]]:
     if not html_content:
         return []
 
-    # Pattern to find jBasketComposer calls
-    # Matches: jBasketComposer([...]) or jBasketComposer({...})
-    pattern = r"jBasketComposer\s*\(\s*(\[[^\]]+\]|\{[^\}]+\})\s*\)"
-    
-    matches = re.finditer(pattern, html_content, re.DOTALL | re.IGNORECASE)
     basket_lines = []
 
-    for match in matches:
+    for json_str in _iter_basket_payloads(html_content):
         try:
-            # Extract the JSON-like content
-            json_str = match.group(1)
-            
             # Try to parse as JSON
             try:
-                parsed = json.loads(json_str)
+                parsed = orjson.loads(json_str)
                 
                 # If it's a list, extract items
                 if isinstance(parsed, list):
@@ -50,7 +67,7 @@ def extract_basket_lines(html_content: str) -> list[dict[str, Any]]:
                         # Single item
                         basket_lines.append(_normalize_basket_item(parsed))
                         
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 # Try to extract array items manually
                 logger.debug(f"Could not parse JSON from jBasketComposer: {json_str[:100]}")
                 continue
@@ -62,33 +79,66 @@ def extract_basket_lines(html_content: str) -> list[dict[str, Any]]:
     return basket_lines
 
 
+def _iter_basket_payloads(html_content: str) -> Iterator[str]:
+    """
+    Yield the argument of each jBasketComposer([...]) / jBasketComposer({...}) call.
+    Walks balanced brackets (ignoring those inside string literals) so nested
+    arrays/objects are returned whole, in a single linear scan of the HTML.
+    """
+    length = len(html_content)
+    idx = 0
+    while (pos := html_content.find(_BASKET_MARKER, idx)) != -1:
+        idx = pos + len(_BASKET_MARKER)
+
+        # Skip to the opening bracket: jBasketComposer ( [
+        while idx < length and html_content[idx].isspace():
+            idx += 1
+        if idx >= length or html_content[idx] != "(":
+            continue
+        idx += 1
+        while idx < length and html_content[idx].isspace():
+            idx += 1
+        if idx >= length or html_content[idx] not in _OPENERS:
+            continue
+
+        start = idx
+        stack = []
+        quote = None
+        while (match := _STRUCTURAL.search(html_content, idx)) is not None:
+            char = match.group()
+            idx = match.end()
+            if quote:
+                if char == "\\":
+                    idx += 1  # skip the escaped character
+                elif char == quote:
+                    quote = None
+            elif char in ("\"", "'"):
+                quote = char
+            elif char in _OPENERS:
+                stack.append(_OPENERS[char])
+            elif char in ("]", "}"):
+                if not stack or char != stack.pop():
+                    break
+                if not stack:
+                    yield html_content[start:idx]
+                    break
+
+
 def _normalize_basket_item(item: dict) -> dict[str, Any]:
     """Normalize basket item to standard format."""
     normalized = {}
-    
-    # Common fields
-    field_mapping = {
-        "name": ["name", "nom", "label", "libelle"],
-        "ref": ["ref", "reference", "code", "sku"],
-        "price": ["price", "prix", "amount", "montant"],
-        "qtty": ["qtty", "quantity", "qty", "quantite"],
-        "tax": ["tax", "tva", "vat"],
-        "rate": ["rate", "taux", "tax_rate"],
-        "subscription": ["subscription", "abonnement"],
-        "sub_start": ["sub_start", "subscription_start", "debut_abonnement"],
-        "total": ["total", "total_ht", "total_ttc"],
-    }
-    
-    for standard_key, possible_keys in field_mapping.items():
-        for key in possible_keys:
-            if key in item:
-                normalized[standard_key] = item[key]
-                break
-    
-    # Include all other fields
+    ranks = {}
+
     for key, value in item.items():
-        if key not in normalized:
+        mapped = _ALIAS_TO_STANDARD.get(key)
+        if mapped is not None:
+            # Earlier aliases in _FIELD_MAPPING win when several are present
+            standard_key, rank = mapped
+            if rank < ranks.get(standard_key, len(_FIELD_MAPPING[standard_key])):
+                ranks[standard_key] = rank
+                normalized[standard_key] = value
+        # Include all other fields (aliases are kept under their original name too)
+        if key not in _FIELD_MAPPING:
             normalized[key] = value
-    
-    return normalized
 
+    return normalized
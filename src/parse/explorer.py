@@ -3,73 +3,134 @@ import logging
 import re
 from urllib.parse import urljoin, urlparse
 
-from selectolax.parser import HTMLParser
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
 
 logger = logging.getLogger(__name__)
 
+# Matches url:'...' / url:"..." / url:... inside a jsinfos attribute value
+# (a whole key only: not the tail of returnUrl / backUrl)
+_JSINFOS_URL = re.compile(r"(?:^|[{,\s])url\s*:\s*['\"]?([^'\",}]+)", re.IGNORECASE)
 
-def extract_explorer_links(html_content: str, base_url: str) -> list[str]:
+# Every element carrying a link-like attribute, walked in a single pass
+_LINK_SELECTOR = "a[href], [jsinfos], [data-url], [data-href]"
+# Pages without jsinfos/data-* attributes only need the anchors
+_HREF_SELECTOR = "a[href]"
+
+
+def extract_explorer_links(
+    html_content: str,
+    base_url: str,
+    parser: HTMLParser | None = None,
+    sort: bool = False,
+) -> list[str]:
     """
     Extract all explorer links from HTML:
     - <a href="...">
     - jsinfos="url:'...'" attributes
     - jsinfos="{url:'...'}" attributes
-    Returns normalized absolute URLs (deduplicated).
+    - data-url / data-href attributes
+    Returns normalized absolute URLs (deduplicated, in document order;
+    pass `sort=True` for alphabetical order).
+    Pass `parser` when the page is already parsed to avoid tokenizing it twice.
     """
     if not html_content:
         return []
 
-    parser = HTMLParser(html_content)
-    links: set[str] = set()
+    # Cheap substring gates: skip attribute selectors that cannot match. Attribute names
+    # are case-insensitive (the parser lowercases them), so probe a lowered copy
+    html_lower = html_content.lower()
+    has_js = "jsinfos" in html_lower
+    has_data = "data-url" in html_lower or "data-href" in html_lower
+    selector = _LINK_SELECTOR if has_js or has_data else _HREF_SELECTOR
 
-    # Extract <a href="...">
-    for link in parser.css("a[href]"):
-        href = link.attributes.get("href")
-        if href:
-            normalized = _normalize_url(href, base_url)
-            if normalized:
-                links.add(normalized)
-
-    # Extract jsinfos attributes
-    # Pattern: jsinfos="url:'...'" or jsinfos="{url:'...'}"
-    jsinfos_pattern = r'jsinfos\s*=\s*["\'](?:url:\s*["\']([^"\']+)["\']|url:\s*([^"\']+)|{url:\s*["\']([^"\']+)["\']|{url:\s*([^"\']+))'
-    
-    for match in re.finditer(jsinfos_pattern, html_content, re.IGNORECASE):
-        for group in match.groups():
-            if group:
-                normalized = _normalize_url(group, base_url)
-                if normalized:
-                    links.add(normalized)
-
-    # Also check data attributes
-    for element in parser.css("[data-url], [data-href]"):
-        url = element.attributes.get("data-url") or element.attributes.get("data-href")
-        if url:
-            normalized = _normalize_url(url, base_url)
+    if parser is None:
+        parser = HTMLParser(html_content)
+    # dict keeps first-seen order while deduplicating
+    links: dict[str, None] = {}
+
+    # Parse the base once instead of once per relative link
+    parsed_base = urlparse(base_url)
+    scheme, netloc = parsed_base.scheme, parsed_base.netloc
+    base_dir = _base_dir(parsed_base)
+
+    for node in parser.css(selector):
+        attrs = node.attributes
+        candidates = []
+
+        # <a href="...">
+        if node.tag == "a":
+            href = attrs.get("href")
+            if href:
+                candidates.append(href)
+
+        # jsinfos="url:'...'" or jsinfos="{url:'...'}"
+        jsinfos = attrs.get("jsinfos") if has_js else None
+        if jsinfos:
+            match = _JSINFOS_URL.search(jsinfos)
+            if match:
+                candidates.append(match.group(1))
+
+        # data-url / data-href
+        data_url = (attrs.get("data-url") or attrs.get("data-href")) if has_data else None
+        if data_url:
+            candidates.append(data_url)
+
+        for url in candidates:
+            normalized = _normalize_url(url, scheme, netloc, base_url, base_dir)
             if normalized:
-                links.add(normalized)
+                links.setdefault(normalized, None)
 
-    return sorted(list(links))
+    if sort:
+        return sorted(links)
+    return list(links)
 
 
-def _normalize_url(url: str, base_url: str) -> str | None:
-    """Normalize URL to absolute form."""
-    if not url or url.startswith("#") or url.startswith("javascript:"):
+def _base_dir(parsed_base) -> str | None:
+    """
+    Directory of a parsed base URL, e.g. https://host/digi/com/ for .../com/view?nr=1.
+    None when the base has no scheme or host (relative links then go through urljoin).
+    """
+    if not (parsed_base.scheme and parsed_base.netloc):
+        return None
+    path = parsed_base.path
+    directory = path[: path.rfind("/") + 1] if "/" in path else "/"
+    return f"{parsed_base.scheme}://{parsed_base.netloc}{directory}"
+
+
+def _normalize_url(
+    url: str,
+    base_scheme: str,
+    base_netloc: str,
+    base_url: str,
+    base_dir: str | None = None,
+) -> str | None:
+    """
+    Normalize URL to absolute form (`base_scheme`/`base_netloc` come from urlparse(base_url),
+    `base_dir` from _base_dir()).
+    """
+    if not url or url.startswith(("#", "javascript:")):
         return None
 
     # Remove whitespace
     url = url.strip()
 
     # Make absolute
-    if url.startswith("http://") or url.startswith("https://"):
+    if url.startswith(("http://", "https://")):
         return url
     elif url.startswith("//"):
-        parsed = urlparse(base_url)
-        return f"{parsed.scheme}:{url}"
+        return f"{base_scheme}:{url}"
     elif url.startswith("/"):
-        parsed = urlparse(base_url)
-        return f"{parsed.scheme}://{parsed.netloc}{url}"
+        return f"{base_scheme}://{base_netloc}{url}"
+    elif (
+        base_dir
+        and ":" not in url
+        and not url.startswith((".", "?"))
+        and "./" not in url
+        and "/.." not in url
+        and "//" not in url
+    ):
+        # Plain relative path (view?nr=1, sub/page): no dot segments to resolve
+        return base_dir + url
     else:
         # Relative URL
         return urljoin(base_url, url)
-
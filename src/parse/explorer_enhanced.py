@@ -1,27 +1,83 @@
 """Enhanced explorer links extraction with normalization, filtering, and tagging."""
-import re
+from collections import Counter
 from typing import List, Dict
-from urllib.parse import urljoin, urlparse, parse_qs
+from urllib.parse import urlparse
 
-from src.parse.explorer import extract_explorer_links
+import ahocorasick
+from selectolax.lexbor import LexborHTMLParser
+
+from src.parse.explorer import _base_dir, _normalize_url, extract_explorer_links
 from src.config import config
 
 
+# Substring tokens per link type, tested in this order by tag_link_type()
+_TAB_TOKENS = ("/cto/view", "/cto/viewpayment", "/cto/viewlogistic")
+_CONTACT_TOKENS = ("/ct/view", "/crm/ct")
+_VEHICLE_TOKENS = ("/vehicles/view", "/mod-ep/vehicles")
+_BIZ_TOKENS = ("/biz/view", "/com/biz")
+_DOC_EXT = (".pdf", ".doc", ".docx", ".xls", ".xlsx")
+# Loose tokens used by tag_link_type(); is_dangerous_link() is stricter
+_DANGER_TYPE_TOKENS = ("logout", "quit", "del")
+
+# Logout, delete and other destructive actions
+_DANGER_TOKENS = ("logout", "quit=1", "/del", "xact:'del'", "action=delete", "destroy", "remove")
+_HEAVY_EXT = (".pdf", ".zip", ".tar", ".gz", ".rar")
+
+# Link types in tag_link_type() priority order ("doc" is a suffix test, not a token)
+_TYPE_PRIORITY = ("tab", "contact", "vehicle", "biz")
+# Link types reported by get_explorer_links_summary()
+_SUMMARY_TYPES = ("tab", "contact", "vehicle", "biz", "doc", "dangerous", "other")
+# Scopes in _extract_scope() priority order
+_SCOPE_PRIORITY = ("digi", "com", "crm", "help")
+
+
+def _build_token_automaton() -> ahocorasick.Automaton:
+    """Aho-Corasick automaton mapping every classification token to its categories."""
+    token_categories: dict[str, set[str]] = {}
+    groups = (
+        ("tab", _TAB_TOKENS),
+        ("contact", _CONTACT_TOKENS),
+        ("vehicle", _VEHICLE_TOKENS),
+        ("biz", _BIZ_TOKENS),
+        ("danger_type", _DANGER_TYPE_TOKENS),
+        ("danger", _DANGER_TOKENS),
+        ("scope:digi", ("/digi/",)),
+        ("scope:com", ("/com/",)),
+        ("scope:crm", ("/crm/",)),
+        ("scope:help", ("/help/", "/doc/")),
+    )
+    for category, tokens in groups:
+        for token in tokens:
+            token_categories.setdefault(token, set()).add(category)
+
+    automaton = ahocorasick.Automaton()
+    for token, categories in token_categories.items():
+        automaton.add_word(token, frozenset(categories))
+    automaton.make_automaton()
+    return automaton
+
+
+_TOKEN_AUTOMATON = _build_token_automaton()
+
+
 def tag_link_type(url: str) -> str:
     """Tag link type based on URL pattern."""
-    url_lower = url.lower()
-    
-    if "/cto/view" in url_lower or "/cto/viewpayment" in url_lower or "/cto/viewlogistic" in url_lower:
+    return _tag_link_type_lower(url.lower())
+
+
+def _tag_link_type_lower(u: str) -> str:
+    """tag_link_type() for an already-lowercased URL."""
+    if any(t in u for t in _TAB_TOKENS):
         return "tab"
-    elif "/ct/view" in url_lower or "/crm/ct" in url_lower:
+    elif any(t in u for t in _CONTACT_TOKENS):
         return "contact"
-    elif "/vehicles/view" in url_lower or "/mod-ep/vehicles" in url_lower:
+    elif any(t in u for t in _VEHICLE_TOKENS):
         return "vehicle"
-    elif "/biz/view" in url_lower or "/com/biz" in url_lower:
+    elif any(t in u for t in _BIZ_TOKENS):
         return "biz"
-    elif url_lower.endswith(('.pdf', '.doc', '.docx', '.xls', '.xlsx')):
+    elif u.endswith(_DOC_EXT):
         return "doc"
-    elif "logout" in url_lower or "quit" in url_lower or "del" in url_lower:
+    elif any(t in u for t in _DANGER_TYPE_TOKENS):
         return "dangerous"
     else:
         return "other"
@@ -29,60 +85,91 @@ def tag_link_type(url: str) -> str:
 
 def is_dangerous_link(url: str) -> bool:
     """Check if link is dangerous (logout, delete, etc.)."""
-    url_lower = url.lower()
-    
-    # Logout patterns
-    if "logout" in url_lower or "quit=1" in url_lower:
-        return True
-    
-    # Delete patterns
-    if "/del" in url_lower or "xact:'del'" in url_lower or "action=delete" in url_lower:
-        return True
-    
-    # Other dangerous patterns
-    if "destroy" in url_lower or "remove" in url_lower:
-        return True
-    
-    return False
+    return _is_dangerous_lower(url.lower())
+
+
+def _is_dangerous_lower(u: str) -> bool:
+    """is_dangerous_link() for an already-lowercased URL."""
+    return any(t in u for t in _DANGER_TOKENS)
 
 
 def is_heavy_download(url: str) -> bool:
     """Check if link is a heavy download (PDF, etc.)."""
-    url_lower = url.lower()
-    return url_lower.endswith(('.pdf', '.zip', '.tar', '.gz', '.rar'))
+    return _is_heavy_lower(url.lower())
+
+
+def _is_heavy_lower(u: str) -> bool:
+    """is_heavy_download() for an already-lowercased URL."""
+    return u.endswith(_HEAVY_EXT)
+
+
+def classify_url(url: str) -> tuple[str, str, bool, bool]:
+    """
+    Classify a URL in one go: (type, scope, dangerous, heavy).
+    Same results as tag_link_type/_extract_scope/is_dangerous_link/is_heavy_download,
+    but every token is matched in a single Aho-Corasick pass over the lowered URL.
+    """
+    return _classify_lower(url.lower())
+
+
+def _classify_lower(u: str) -> tuple[str, str, bool, bool]:
+    """classify_url() for an already-lowercased URL."""
+    # One pass over the URL collects every matched category (overlaps included)
+    categories: set[str] = set()
+    for _, token_categories in _TOKEN_AUTOMATON.iter(u):
+        categories |= token_categories
+
+    link_type = next((t for t in _TYPE_PRIORITY if t in categories), None)
+    if link_type is None:
+        if u.endswith(_DOC_EXT):
+            link_type = "doc"
+        elif "danger_type" in categories:
+            link_type = "dangerous"
+        else:
+            link_type = "other"
+
+    scope = next((s for s in _SCOPE_PRIORITY if f"scope:{s}" in categories), "other")
+    return link_type, scope, "danger" in categories, _is_heavy_lower(u)
 
 
 def filter_and_tag_explorer_links(
     html_content: str,
     base_url: str,
     max_links: int = 200,
+    parser: LexborHTMLParser | None = None,
 ) -> List[Dict[str, str]]:
     """
     Extract, normalize, filter, and tag explorer links.
     Returns list of dicts with url, type, reason (if dangerous), scope, and notes.
     Deduplicates links and canonicalizes URLs.
+    `parser` is an already-parsed tree of `html_content`, reused if given.
     """
     # Extract raw links
-    raw_links = extract_explorer_links(html_content, base_url)
+    raw_links = extract_explorer_links(html_content, base_url, parser=parser)
     
-    # Canonicalize and deduplicate by URL
-    seen = set()
-    unique_links = []
-    for link in raw_links:
-        # Canonicalize URL (remove duplicate paths, normalize)
-        canonical = _canonicalize_url(link, base_url)
-        if canonical and canonical not in seen:
-            seen.add(canonical)
-            unique_links.append(canonical)
+    # Canonicalize (remove duplicate paths, normalize) and deduplicate by URL, keeping order;
+    # stop canonicalizing once max_links distinct URLs are collected
+    parsed_base = urlparse(base_url)
+    scheme, netloc = parsed_base.scheme, parsed_base.netloc
+    base_dir = _base_dir(parsed_base)
+    seen: set[str] = set()
+    unique_links: list[str] = []
+    if max_links > 0:
+        for link in raw_links:
+            canonical = _canonicalize_url(link, scheme, netloc, base_url, base_dir)
+            if canonical and canonical not in seen:
+                seen.add(canonical)
+                unique_links.append(canonical)
+                if len(unique_links) >= max_links:
+                    break
     
-    # Filter and tag
+    # Filter and tag (each URL is lowercased once, here)
     filtered = []
-    for url in unique_links[:max_links]:
-        link_type = tag_link_type(url)
-        scope = _extract_scope(url)
+    for url, url_lower in ((u, u.lower()) for u in unique_links):
+        link_type, scope, dangerous, heavy = _classify_lower(url_lower)
         
         # Handle dangerous links (note but don't skip - user wants to see them)
-        if is_dangerous_link(url):
+        if dangerous:
             filtered.append({
                 "url": url,
                 "type": "dangerous",
@@ -94,7 +181,7 @@ def filter_and_tag_explorer_links(
         
         # Note heavy downloads but include them
         notes = []
-        if is_heavy_download(url):
+        if heavy:
             notes.append("heavy_download")
         
         filtered.append({
@@ -108,87 +195,51 @@ def filter_and_tag_explorer_links(
     return filtered
 
 
-def _canonicalize_url(url: str, base_url: str) -> str | None:
+def _canonicalize_url(
+    url: str,
+    base_scheme: str,
+    base_netloc: str,
+    base_url: str,
+    base_dir: str | None = None,
+) -> str | None:
     """Canonicalize URL to remove functional duplicates."""
-    normalized = _normalize_url(url, base_url)
+    normalized = _normalize_url(url, base_scheme, base_netloc, base_url, base_dir)
     if not normalized:
         return None
     
-    # Parse URL
-    parsed = urlparse(normalized)
-    
-    # Remove duplicate /digi/ or /com/ in path
-    path = parsed.path
-    # Replace /digi/com/ with /digi/com/ (single occurrence)
-    path = re.sub(r"/digi/digi/", "/digi/", path)
-    path = re.sub(r"/com/com/", "/com/", path)
-    
-    # Reconstruct canonical URL
-    canonical = f"{parsed.scheme}://{parsed.netloc}{path}"
-    if parsed.query:
-        canonical += f"?{parsed.query}"
-    if parsed.fragment:
-        canonical += f"#{parsed.fragment}"
-    
-    return canonical
+    # Remove duplicate /digi/ or /com/ in path only; query and fragment stay intact
+    cut = len(normalized)
+    for sep in ("?", "#"):
+        pos = normalized.find(sep)
+        if pos != -1 and pos < cut:
+            cut = pos
+    path_part = normalized[:cut].replace("/digi/digi/", "/digi/").replace("/com/com/", "/com/")
+
+    return path_part + normalized[cut:]
 
 
 def _extract_scope(url: str) -> str:
     """Extract URL scope (digi, com, crm, help, etc.)."""
-    url_lower = url.lower()
-    if "/digi/" in url_lower:
+    return _scope_lower(url.lower())
+
+
+def _scope_lower(u: str) -> str:
+    """_extract_scope() for an already-lowercased URL."""
+    if "/digi/" in u:
         return "digi"
-    elif "/com/" in url_lower:
+    elif "/com/" in u:
         return "com"
-    elif "/crm/" in url_lower:
+    elif "/crm/" in u:
         return "crm"
-    elif "/help/" in url_lower or "/doc/" in url_lower:
+    elif "/help/" in u or "/doc/" in u:
         return "help"
     else:
         return "other"
 
 
-def _normalize_url(url: str, base_url: str) -> str | None:
-    """Normalize URL to absolute form (from explorer.py)."""
-    from urllib.parse import urljoin, urlparse
-    
-    if not url or url.startswith("#") or url.startswith("javascript:"):
-        return None
-
-    # Remove whitespace
-    url = url.strip()
-
-    # Make absolute
-    if url.startswith("http://") or url.startswith("https://"):
-        return url
-    elif url.startswith("//"):
-        parsed = urlparse(base_url)
-        return f"{parsed.scheme}:{url}"
-    elif url.startswith("/"):
-        parsed = urlparse(base_url)
-        return f"{parsed.scheme}://{parsed.netloc}{url}"
-    else:
-        # Relative URL
-        return urljoin(base_url, url)
-
-
 def get_explorer_links_summary(links: List[Dict[str, str]]) -> Dict[str, int]:
     """Get summary statistics of explorer links."""
-    summary = {
-        "total": len(links),
-        "tab": 0,
-        "contact": 0,
-        "vehicle": 0,
-        "biz": 0,
-        "doc": 0,
-        "dangerous": 0,
-        "other": 0,
-    }
-    
-    for link in links:
-        link_type = link.get("type", "other")
-        if link_type in summary:
-            summary[link_type] += 1
-    
+    counts = Counter(link.get("type", "other") for link in links)
+    summary = {"total": len(links)}
+    summary.update((link_type, counts.get(link_type, 0)) for link_type in _SUMMARY_TYPES)
     return summary
-
@@ -0,0 +1,105 @@
+"""Selector and numeric helpers shared by the view and tab extractors."""
+import re
+import sys
+from functools import lru_cache
+from typing import Any, Iterator
+
+from selectolax.lexbor import LexborHTMLParser as HTMLParser, LexborNode as Node
+
+# nr=<digits> query parameter of a Digifactory URL; the [?&] keeps ordernr=/mandatnr= out.
+# A compiled search is ~6x faster than urlsplit() + parse_qs() on these short hrefs
+RE_NR = re.compile(r"[?&]nr=(\d+)")
+# First numeric run, thousands separators included ("1 234,56"); normalized by NUM_TRANS
+RE_NUM_RUN = re.compile(r"\d[\d,. \u00a0\u202f]*")
+NUM_TRANS = str.maketrans({" ": "", "\u00a0": "", "\u202f": "", ",": "."})
+
+
+def extract_text_by_selector(parser: HTMLParser, selector: str, default: str = "") -> str:
+    """Extract text from first matching element."""
+    node = parser.css_first(selector)
+    return node.text(strip=True) if node else default
+
+
+def intern_text(value: str | None, max_len: int = 64) -> str | None:
+    """
+    sys.intern() short strings drawn from a small vocabulary (dates, statuses,
+    currencies, product names repeated across rows) so repeats share one object.
+    """
+    if isinstance(value, str) and len(value) <= max_len:
+        return sys.intern(value)
+    return value
+
+
+@lru_cache(maxsize=4096)
+def extract_numeric_from_text(text: str) -> float | None:
+    """Extract numeric value from text (memoized: cell texts such as "0,00 €" repeat a lot)."""
+    if not text:
+        return None
+    match = RE_NUM_RUN.search(text)
+    if not match:
+        return None
+    try:
+        return float(match.group().translate(NUM_TRANS).rstrip("."))
+    except ValueError:
+        return None
+
+
+def iter_first_nodes(parser: HTMLParser, selectors: list[str]) -> Iterator[Node | None]:
+    """
+    Lazily yield css_first() for each selector, in order.
+    Most fallback selectors match nothing on a given page, so one comma-joined
+    query first checks whether any of them can match before probing each one.
+    """
+    if parser.css_first(", ".join(selectors)) is None:
+        return
+    for selector in selectors:
+        yield parser.css_first(selector)
+
+
+def extract_text_by_patterns(parser: HTMLParser, selectors: list[str]) -> str:
+    """Try multiple selectors to extract text."""
+    for node in iter_first_nodes(parser, selectors):
+        if node:
+            text = node.text(strip=True)
+            if text:
+                return text
+    return ""
+
+
+def extract_numeric(parser: HTMLParser, selectors: list[str]) -> float | None:
+    """Extract numeric value using multiple selectors."""
+    for node in iter_first_nodes(parser, selectors):
+        if node:
+            value = extract_numeric_from_text(node.text(strip=True))
+            if value is not None:
+                return value
+    return None
+
+
+def extract_fields(
+    parser: HTMLParser,
+    fields: dict[str, list[str]],
+    numeric: bool = False,
+) -> dict[str, Any]:
+    """
+    Resolve several fallback-selector fields with one css() query.
+    Each field keeps the semantics of extract_text_by_patterns / extract_numeric:
+    selectors are tried in order on their first match, the first non-empty text
+    (or parsed number when `numeric`) wins. Fields that resolve to nothing are omitted.
+    """
+    nodes = parser.css(", ".join(selector for selectors in fields.values() for selector in selectors))
+    values: dict[str, Any] = {}
+    if not nodes:
+        return values
+    for field, selectors in fields.items():
+        for selector in selectors:
+            # Combined results are in document order, so this is css_first(selector)
+            node = next((node for node in nodes if node.css_matches(selector)), None)
+            if node is None:
+                continue
+            text = node.text(strip=True)
+            value = extract_numeric_from_text(text) if numeric else text
+            if value is not None and value != "":
+                values[field] = value
+                break
+    return values
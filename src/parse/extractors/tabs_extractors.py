@@ -1,21 +1,111 @@
 """Extractors for payment, logistic, infos, and orders tabs."""
 import logging
 import re
+from functools import lru_cache
 from typing import Any, Dict
-from selectolax.parser import HTMLParser
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
 
-from src.parse.jsinfos import parse_jsinfos
+from src.parse.extractors._common import (
+    extract_fields as _extract_fields,
+    extract_numeric as _extract_numeric,
+    extract_numeric_from_text as _extract_numeric_from_text,
+    extract_text_by_patterns as _extract_text_by_patterns,
+    intern_text as _intern_text,
+)
+from src.parse.page import ParsedPage
+from src.parse.payment_details import extract_payment_data_from_jsinfos
 
 logger = logging.getLogger(__name__)
 
+# JS variable / JSON key / data-attribute patterns for totals (value is the last group),
+# listed by priority: for each key, the earliest pattern in this list that matches wins
+_JS_NUMERIC_PATTERNS = [
+    (r"(?:var|let|const)\s+(totaltax|totalTax|total_tax)\s*=\s*([\d.]+)", "totaltax"),
+    (r"(?:var|let|const)\s+(totalprice|totalPrice|total_price)\s*=\s*([\d.]+)", "totalprice"),
+    (r"(?:var|let|const)\s+(shippingprice|shippingPrice|shipping_price|port)\s*=\s*([\d.]+)", "shippingprice"),
+    (r'"totaltax"\s*:\s*([\d.]+)', "totaltax"),
+    (r'"totalprice"\s*:\s*([\d.]+)', "totalprice"),
+    (r'"shippingprice"\s*:\s*([\d.]+)', "shippingprice"),
+    (r"data-total-tax\s*=\s*['\"]([\d.]+)['\"]", "totaltax"),
+    (r"data-total-price\s*=\s*['\"]([\d.]+)['\"]", "totalprice"),
+    (r"data-shipping-price\s*=\s*['\"]([\d.]+)['\"]", "shippingprice"),
+]
+# All of them as one alternation, so the HTML is scanned once
+_RE_JS_NUMERIC = re.compile(
+    "|".join(f"(?P<p{rank}>{pattern})" for rank, (pattern, _) in enumerate(_JS_NUMERIC_PATTERNS)),
+    re.IGNORECASE,
+)
+# outer group name -> (key, rank, index of the value group)
+_JS_NUMERIC_GROUPS = {
+    f"p{rank}": (
+        key,
+        rank,
+        _RE_JS_NUMERIC.groupindex[f"p{rank}"] + re.compile(pattern).groups,
+    )
+    for rank, (pattern, key) in enumerate(_JS_NUMERIC_PATTERNS)
+}
+_RE_TEMPLATE = re.compile(r"\{\{([^}]+)\}\}")
+_RE_TEMPLATE_RESOLVABLE = re.compile(r"(totaltax|totalprice|shippingprice)", re.IGNORECASE)
+_RE_TEMPLATE_VARS = re.compile(r"(totaltax|totalprice|shippingprice|total|price|tax)", re.IGNORECASE)
+# Keywords marking a logistic document link (href or text)
+# ("bl" as a standalone token: bl_123, /bl/, BL-42, not "tables" or "publication")
+_RE_DOC_KEYWORDS = re.compile(
+    r"\.pdf|document|(?<![a-z])bl(?![a-z])|bon-livraison|tracking|suivi|expedition", re.IGNORECASE
+)
+# Document link categories: one empty named group per category behind a lookahead over the whole
+# string, tried in priority order (bl > tracking > pdf), so match().lastgroup is the category
+_RE_DOC_CLASSIFY = re.compile(
+    r"(?=.*?(?:(?<![a-z])bl(?![a-z])|bon-livraison))(?P<bl>)"
+    r"|(?=.*?(?:tracking|suivi))(?P<tracking>)"
+    r"|(?=.*?\.pdf)(?P<pdf>)",
+    re.IGNORECASE | re.DOTALL,
+)
+# Markers of the payment tab's HTML part (invoice rows, summary selectors); without one the DOM is not needed
+_RE_PAYMENT_HTML_PROBE = re.compile(r"invoice|facture|payment-status|data-status|total-due|total-paid|balance", re.IGNORECASE)
+# Fallback selectors per summary field, each group resolved by one _extract_fields() query
+_PAYMENT_NUMERIC_FIELDS = {
+    "total_due": [".total-due", "[class*='total-due']", "[data-total-due]"],
+    "total_paid": [".total-paid", "[class*='total-paid']", "[data-total-paid]"],
+    "balance": [".balance", "[class*='balance']", "[data-balance]"],
+}
+_LOGISTIC_TEXT_FIELDS = {
+    "delivery_method": [
+        ".delivery-method", "[class*='delivery-method']", "[data-delivery]",
+        ".methode-livraison", "[class*='livraison']",
+    ],
+    "shipping_status": [
+        ".shipping-status", "[class*='shipping-status']", "[data-shipping-status]",
+        ".statut-livraison", "[class*='statut']",
+    ],
+    "tracking_number": [".tracking", "[class*='tracking']", "[data-tracking]", ".numero-suivi"],
+}
+_ORDERS_NUMERIC_FIELDS = {
+    "total_orders": [".total-orders", "[class*='total-orders']", "[data-total-orders]"],
+    "total": [".total-amount", "[class*='total-amount']", "[data-total]"],
+    "margin": [".margin", "[class*='margin']", "[data-margin]", ".marge"],
+}
+# Table cell tags, matched on a row's child elements
+_CELL_TAGS = frozenset(("td", "th"))
+# Purchase lines: marked rows, or any element (div, li...) with a purchase/order line class
+_PURCHASE_LINE_SELECTOR = (
+    "tr[data-line], tr[data-product], .purchase-line, [class*='purchase-line'], [class*='order-line']"
+)
+
 
-def extract_payment_data(html_content: str, base_url: str = "") -> Dict[str, Any]:
-    """Extract payment tab data from JSinfos spans (NEW METHOD - JSON-based)."""
+def extract_payment_data(
+    html_content: str,
+    base_url: str = "",
+    page: ParsedPage | None = None,
+) -> Dict[str, Any]:
+    """
+    Extract payment tab data from JSinfos spans (NEW METHOD - JSON-based).
+    `page` is the shared ParsedPage of `html_content`, built here if not given.
+    """
+    page = page or ParsedPage(html_content)
     extracted = {}
     
     # Extract payment requests and transactions from JSinfos spans (NEW METHOD)
     if base_url:
-        from src.parse.payment_details import extract_payment_data_from_jsinfos
         payment_data = extract_payment_data_from_jsinfos(html_content, base_url)
         
         # Store payment requests and transactions (raw data from JSinfos)
@@ -27,12 +117,16 @@ def extract_payment_data(html_content: str, base_url: str = "") -> Dict[str, Any
             extracted["debug"] = payment_data["debug"]
         
         # Also extract traditional JSinfos base64 for other uses
-        jsinfos = parse_jsinfos(html_content)
+        jsinfos = page.jsinfos
         if jsinfos:
             extracted["jsinfos"] = jsinfos
     
+    # The HTML part below needs the DOM only if one of its markers is in the page
+    if not _RE_PAYMENT_HTML_PROBE.search(html_content or ""):
+        return extracted
+    
     # Extract invoices (still from HTML)
-    parser = HTMLParser(html_content)
+    parser = page.parser
     invoices = _extract_list_items(parser, "invoice", ["invoice", "facture"])
     if invoices:
         extracted["invoices"] = invoices
@@ -43,16 +137,8 @@ def extract_payment_data(html_content: str, base_url: str = "") -> Dict[str, Any
     if status:
         payment_summary["status"] = status
     
-    total_due = _extract_numeric(parser, [".total-due", "[class*='total-due']", "[data-total-due]"])
-    total_paid = _extract_numeric(parser, [".total-paid", "[class*='total-paid']", "[data-total-paid]"])
-    balance = _extract_numeric(parser, [".balance", "[class*='balance']", "[data-balance]"])
-    
-    if total_due is not None:
-        payment_summary["total_due"] = total_due
-    if total_paid is not None:
-        payment_summary["total_paid"] = total_paid
-    if balance is not None:
-        payment_summary["balance"] = balance
+    # total_due / total_paid / balance, resolved with one selector query
+    payment_summary.update(_extract_fields(parser, _PAYMENT_NUMERIC_FIELDS, numeric=True))
     
     if payment_summary:
         extracted["payment_summary"] = payment_summary
@@ -60,63 +146,37 @@ def extract_payment_data(html_content: str, base_url: str = "") -> Dict[str, Any
     return extracted
 
 
-def extract_logistic_data(html_content: str) -> Dict[str, Any]:
+def extract_logistic_data(html_content: str, page: ParsedPage | None = None) -> Dict[str, Any]:
     """Extract logistic tab data - must return at least minimal structure."""
-    parser = HTMLParser(html_content)
+    page = page or ParsedPage(html_content)
+    parser = page.parser
     extracted = {}
     
     # Logistic summary (always present, even if empty)
     logistic_summary = {}
     
-    # Extract delivery method
-    delivery_method = _extract_text_by_patterns(parser, [
-        ".delivery-method", "[class*='delivery-method']", "[data-delivery]",
-        ".methode-livraison", "[class*='livraison']"
-    ])
-    if delivery_method:
-        logistic_summary["delivery_method"] = delivery_method
-    
-    # Extract shipping status
-    shipping_status = _extract_text_by_patterns(parser, [
-        ".shipping-status", "[class*='shipping-status']", "[data-shipping-status]",
-        ".statut-livraison", "[class*='statut']"
-    ])
-    if shipping_status:
-        logistic_summary["shipping_status"] = shipping_status
-    
-    # Extract tracking number if available
-    tracking = _extract_text_by_patterns(parser, [
-        ".tracking", "[class*='tracking']", "[data-tracking]",
-        ".numero-suivi"
-    ])
-    if tracking:
-        logistic_summary["tracking_number"] = tracking
+    # Delivery method, shipping status and tracking number, resolved with one selector query
+    logistic_summary.update(_extract_fields(parser, _LOGISTIC_TEXT_FIELDS))
+    for key in ("delivery_method", "shipping_status"):
+        if key in logistic_summary:
+            logistic_summary[key] = _intern_text(logistic_summary[key])
     
     extracted["logistic_summary"] = logistic_summary
     
     # Extract documents (BL, tracking links, etc.)
-    documents = []
-    for link in parser.css("a[href]"):
-        href = link.attributes.get("href", "")
-        text = link.text(strip=True) or ""
-        href_lower = href.lower()
-        text_lower = text.lower()
-        
-        # Look for document links (PDF, BL, tracking, etc.)
-        if any(keyword in href_lower or keyword in text_lower for keyword in [
-            ".pdf", "document", "bl", "bon-livraison", "tracking", "suivi", "expedition"
-        ]):
-            documents.append({
-                "url": href,
-                "label": text or href,
-                "type": _classify_document_link(href, text)
-            })
+    links = ((link.attrs.get("href") or "", link.text(strip=True) or "") for link in parser.tags("a"))
+    # Look for document links (PDF, BL, tracking, etc.)
+    documents = [
+        {"url": href, "label": text or href, "type": _classify_document_link(href, text)}
+        for href, text in links
+        if href and (_RE_DOC_KEYWORDS.search(href) or _RE_DOC_KEYWORDS.search(text))
+    ]
     
     if documents:
         extracted["documents"] = documents
     
     # Extract JSinfos if present
-    jsinfos = parse_jsinfos(html_content)
+    jsinfos = page.jsinfos
     if jsinfos:
         extracted["jsinfos"] = jsinfos
     
@@ -124,21 +184,15 @@ def extract_logistic_data(html_content: str) -> Dict[str, Any]:
 
 
 def _classify_document_link(url: str, text: str) -> str:
-    """Classify document link type."""
-    combined = (url + " " + text).lower()
-    if "bl" in combined or "bon-livraison" in combined:
-        return "bl"
-    elif "tracking" in combined or "suivi" in combined:
-        return "tracking"
-    elif ".pdf" in combined:
-        return "pdf"
-    else:
-        return "document"
+    """Classify document link type (returns the interned group-name / literal constants)."""
+    match = _RE_DOC_CLASSIFY.match(url + " " + text)
+    return match.lastgroup if match else "document"
 
 
-def extract_infos_data(html_content: str) -> Dict[str, Any]:
+def extract_infos_data(html_content: str, page: ParsedPage | None = None) -> Dict[str, Any]:
     """Extract infos tab data, resolving template variables to real values."""
-    parser = HTMLParser(html_content)
+    page = page or ParsedPage(html_content)
+    parser = page.parser
     extracted = {}
     
     # First, try to extract numeric values from JS/JSON/variables
@@ -149,29 +203,36 @@ def extract_infos_data(html_content: str) -> Dict[str, Any]:
     
     # Look for common patterns: label: value
     # Try to find definition lists, tables, or div pairs
-    for dl in parser.css("dl"):
-        dt = dl.css_first("dt")
-        dd = dl.css_first("dd")
-        if dt and dd:
-            key = dt.text(strip=True)
-            value = dd.text(strip=True)
+    # One pass over each list's children pairs every <dt> with the <dd> that follows it
+    # (HTML allows wrapping each dt/dd group in a <div>)
+    for dl in parser.tags("dl"):
+        key = None
+        children = (
+            item
+            for child in dl.iter(include_text=False)
+            for item in (child.iter(include_text=False) if child.tag == "div" else (child,))
+        )
+        for child in children:
+            if child.tag == "dt":
+                key = child.text(strip=True)
+            elif child.tag == "dd" and key:
+                value = child.text(strip=True)
+                if value:
+                    # Try to resolve template variables like {{price(...)}}
+                    infos_fields[key] = _resolve_template_value(value, resolved_values)
+                key = None
+    
+    # Try tables (the parser keeps <tr> only inside tables; cells are the row's child elements)
+    for row in parser.tags("tr"):
+        cells = [cell for cell in row.iter(include_text=False) if cell.tag in _CELL_TAGS]
+        if len(cells) >= 2:
+            key = cells[0].text(strip=True)
+            value = cells[1].text(strip=True)
             if key and value:
-                # Try to resolve template variables like {{price(...)}}
+                # Try to resolve template variables
                 resolved_value = _resolve_template_value(value, resolved_values)
                 infos_fields[key] = resolved_value
     
-    # Try tables
-    for table in parser.css("table"):
-        for row in table.css("tr"):
-            cells = row.css("td, th")
-            if len(cells) >= 2:
-                key = cells[0].text(strip=True)
-                value = cells[1].text(strip=True)
-                if key and value:
-                    # Try to resolve template variables
-                    resolved_value = _resolve_template_value(value, resolved_values)
-                    infos_fields[key] = resolved_value
-    
     if infos_fields:
         extracted["infos_fields"] = infos_fields
     
@@ -181,7 +242,7 @@ def extract_infos_data(html_content: str) -> Dict[str, Any]:
         extracted["template_variables"] = template_vars
     
     # Extract JSinfos if present
-    jsinfos = parse_jsinfos(html_content)
+    jsinfos = page.jsinfos
     if jsinfos:
         extracted["jsinfos"] = jsinfos
     
@@ -190,46 +251,32 @@ def extract_infos_data(html_content: str) -> Dict[str, Any]:
 
 def _extract_numeric_values_from_js(html_content: str) -> Dict[str, float]:
     """Extract numeric values from JavaScript variables/JSON in HTML."""
-    import re
     values = {}
+    ranks = {}
     
-    # Try to find common variable patterns
-    patterns = [
-        (r"(?:var|let|const)\s+(totaltax|totalTax|total_tax)\s*=\s*([\d.]+)", "totaltax"),
-        (r"(?:var|let|const)\s+(totalprice|totalPrice|total_price)\s*=\s*([\d.]+)", "totalprice"),
-        (r"(?:var|let|const)\s+(shippingprice|shippingPrice|shipping_price|port)\s*=\s*([\d.]+)", "shippingprice"),
-        (r'"totaltax"\s*:\s*([\d.]+)', "totaltax"),
-        (r'"totalprice"\s*:\s*([\d.]+)', "totalprice"),
-        (r'"shippingprice"\s*:\s*([\d.]+)', "shippingprice"),
-        (r"data-total-tax\s*=\s*['\"]([\d.]+)['\"]", "totaltax"),
-        (r"data-total-price\s*=\s*['\"]([\d.]+)['\"]", "totalprice"),
-        (r"data-shipping-price\s*=\s*['\"]([\d.]+)['\"]", "shippingprice"),
-    ]
-    
-    for pattern, key in patterns:
-        matches = re.finditer(pattern, html_content, re.IGNORECASE)
-        for match in matches:
-            try:
-                value = float(match.group(1) if match.groups() else match.group(0))
-                if key not in values:  # Keep first match
-                    values[key] = value
-            except (ValueError, IndexError):
-                continue
+    # Single scan; a key keeps the value from its highest-priority pattern
+    for match in _RE_JS_NUMERIC.finditer(html_content):
+        key, rank, value_group = _JS_NUMERIC_GROUPS[match.lastgroup]
+        if rank >= ranks.get(key, len(_JS_NUMERIC_PATTERNS)):
+            continue
+        try:
+            values[key] = float(match.group(value_group))
+            ranks[key] = rank
+        except (ValueError, IndexError):
+            continue
     
     return values
 
 
 def _resolve_template_value(value: str, resolved_values: Dict[str, float]) -> str | float:
     """Try to resolve template variables in value, fallback to original."""
-    import re
-    
-    # Check if it's a template like {{price(...)}} or {{totalTax}}
-    template_match = re.search(r"\{\{([^}]+)\}\}", value)
+    # Check if it's a template like {{price(...)}} or {{totalTax}} (substring test skips the regex for plain cells)
+    template_match = _RE_TEMPLATE.search(value) if "{{" in value else None
     if template_match:
         expr = template_match.group(1).strip()
         
         # Try to extract variable name
-        var_match = re.search(r"(totaltax|totalprice|shippingprice)", expr, re.IGNORECASE)
+        var_match = _RE_TEMPLATE_RESOLVABLE.search(expr)
         if var_match:
             var_name = var_match.group(1).lower()
             if var_name in resolved_values:
@@ -248,15 +295,14 @@ def _resolve_template_value(value: str, resolved_values: Dict[str, float]) -> st
 
 def _extract_template_variables(html_content: str) -> Dict[str, Any]:
     """Extract template variables used in the page."""
-    import re
-    
     variables = {}
-    template_pattern = r"\{\{([^}]+)\}\}"
+    if "{{" not in html_content:
+        return variables
     
-    for match in re.finditer(template_pattern, html_content):
+    for match in _RE_TEMPLATE.finditer(html_content):
         expr = match.group(1).strip()
         # Extract variable names from expressions
-        var_matches = re.findall(r"(totaltax|totalprice|shippingprice|total|price|tax)", expr, re.IGNORECASE)
+        var_matches = _RE_TEMPLATE_VARS.findall(expr)
         for var in var_matches:
             var_lower = var.lower()
             if var_lower not in variables:
@@ -265,36 +311,42 @@ def _extract_template_variables(html_content: str) -> Dict[str, Any]:
     return variables
 
 
-def extract_orders_data(html_content: str) -> Dict[str, Any]:
+def extract_orders_data(html_content: str, page: ParsedPage | None = None) -> Dict[str, Any]:
     """Extract orders tab data - must return at least minimal structure."""
-    parser = HTMLParser(html_content)
+    page = page or ParsedPage(html_content)
+    parser = page.parser
     extracted = {}
     
     # Orders summary (always present, even if empty)
     orders_summary = {}
     
-    # Try to extract summary fields
-    total_orders = _extract_numeric(parser, [".total-orders", "[class*='total-orders']", "[data-total-orders]"])
-    if total_orders is not None:
-        orders_summary["total_orders"] = total_orders
+    # Summary and totals fields, resolved with one selector query
+    numbers = _extract_fields(parser, _ORDERS_NUMERIC_FIELDS, numeric=True)
+    if "total_orders" in numbers:
+        orders_summary["total_orders"] = numbers["total_orders"]
     
     extracted["orders_summary"] = orders_summary
     
     # Extract purchase lines (similar to basket but for purchases)
     purchase_lines = []
     
-    # Method 1: Look for table rows with data attributes
-    for row in parser.css("tr[data-line], tr[data-product], .purchase-line, [class*='purchase-line'], [class*='order-line']"):
+    # Method 1: Look for table rows with data attributes or purchase/order line containers
+    matched_ids: set[int] = set()
+    for row in parser.css(_PURCHASE_LINE_SELECTOR):
+        # The comma query can return a node twice; a row inside a matched container is part of it
+        if row.mem_id in matched_ids or _has_matched_ancestor(row, matched_ids):
+            continue
+        matched_ids.add(row.mem_id)
         line_data = {}
         cells = row.css("td")
         if len(cells) >= 2:
-            line_data["name"] = cells[0].text(strip=True) if cells[0] else ""
+            line_data["name"] = _intern_text(cells[0].text(strip=True)) if cells[0] else ""
             if len(cells) > 1:
                 line_data["amount"] = _extract_numeric_from_text(cells[1].text(strip=True))
             if len(cells) > 2:
                 line_data["quantity"] = _extract_numeric_from_text(cells[2].text(strip=True))
             if len(cells) > 3:
-                line_data["date"] = cells[3].text(strip=True) if cells[3] else None
+                line_data["date"] = _intern_text(cells[3].text(strip=True)) if cells[3] else None
             if line_data.get("name") or line_data.get("amount"):
                 purchase_lines.append(line_data)
     
@@ -308,13 +360,13 @@ def extract_orders_data(html_content: str) -> Dict[str, Any]:
             date = item.css_first(".date")
             
             if name:
-                line_data["name"] = name.text(strip=True)
+                line_data["name"] = _intern_text(name.text(strip=True))
             if amount:
                 line_data["amount"] = _extract_numeric_from_text(amount.text(strip=True))
             if qty:
                 line_data["quantity"] = _extract_numeric_from_text(qty.text(strip=True))
             if date:
-                line_data["date"] = date.text(strip=True)
+                line_data["date"] = _intern_text(date.text(strip=True))
             
             if line_data.get("name") or line_data.get("amount"):
                 purchase_lines.append(line_data)
@@ -324,71 +376,43 @@ def extract_orders_data(html_content: str) -> Dict[str, Any]:
     
     # Extract totals
     totals = {}
-    total_amount = _extract_numeric(parser, [".total-amount", "[class*='total-amount']", "[data-total]"])
-    if total_amount is not None:
-        totals["total"] = total_amount
+    if "total" in numbers:
+        totals["total"] = numbers["total"]
     
     # Extract margin if available
-    margin = _extract_numeric(parser, [".margin", "[class*='margin']", "[data-margin]", ".marge"])
-    if margin is not None:
-        totals["margin"] = margin
+    if "margin" in numbers:
+        totals["margin"] = numbers["margin"]
     
     if totals:
         extracted["totals"] = totals
     
     # Extract JSinfos if present
-    jsinfos = parse_jsinfos(html_content)
+    jsinfos = page.jsinfos
     if jsinfos:
         extracted["jsinfos"] = jsinfos
     
     return extracted
 
 
-def _extract_text_by_patterns(parser: HTMLParser, selectors: list[str]) -> str:
-    """Try multiple selectors to extract text."""
-    for selector in selectors:
-        node = parser.css_first(selector)
-        if node:
-            text = node.text(strip=True)
-            if text:
-                return text
-    return ""
-
-
-def _extract_numeric(parser: HTMLParser, selectors: list[str]) -> float | None:
-    """Extract numeric value using multiple selectors."""
-    for selector in selectors:
-        node = parser.css_first(selector)
-        if node:
-            text = node.text(strip=True)
-            value = _extract_numeric_from_text(text)
-            if value is not None:
-                return value
-    return None
-
-
-def _extract_numeric_from_text(text: str) -> float | None:
-    """Extract numeric value from text."""
-    if not text:
-        return None
-    cleaned = text.replace(" ", "").replace(",", ".")
-    match = re.search(r"[\d.]+", cleaned)
-    if match:
-        try:
-            return float(match.group())
-        except ValueError:
-            pass
-    return None
+def _has_matched_ancestor(node, matched_ids: set[int]) -> bool:
+    """True if one of the node's ancestors is in `matched_ids` (mem_id values)."""
+    parent = node.parent
+    while parent is not None:
+        if parent.mem_id in matched_ids:
+            return True
+        parent = parent.parent
+    return False
 
 
 def _extract_list_items(parser: HTMLParser, item_type: str, keywords: list[str]) -> list[Dict[str, Any]]:
     """Extract list items (invoices, transactions, etc.)."""
     items = []
+    keyword_re = _keyword_regex(tuple(keywords))
     
     # Look for rows or list items containing keywords
     for row in parser.css("tr, li, .item"):
-        text = row.text(strip=True).lower()
-        if any(keyword in text for keyword in keywords):
+        text = row.text(strip=True)
+        if keyword_re.search(text):
             item = {}
             # Try to extract structured data
             cells = row.css("td, .cell")
@@ -397,10 +421,16 @@ def _extract_list_items(parser: HTMLParser, item_type: str, keywords: list[str])
                 if len(cells) > 1:
                     item["amount"] = _extract_numeric_from_text(cells[1].text(strip=True))
             else:
-                item["label"] = row.text(strip=True)
+                item["label"] = text
             
             if item.get("label"):
                 items.append(item)
     
     return items
 
+
+@lru_cache(maxsize=32)
+def _keyword_regex(keywords: tuple[str, ...]) -> re.Pattern:
+    """Case-insensitive alternation of keywords, compiled once per keyword set."""
+    return re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+
@@ -1,19 +1,46 @@
 """Extractors for the main view page."""
 import logging
+import math
 import re
-from typing import Any, Dict, Optional
-from selectolax.parser import HTMLParser
+from operator import itemgetter
+from typing import Any, Dict
+
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
+
+from src.parse.basket import extract_basket_lines
+from src.parse.extractors._common import (
+    RE_NR as _RE_NR,
+    extract_numeric_from_text,
+    extract_text_by_selector,
+    intern_text,
+)
+from src.parse.html_parser import parse_date
+from src.parse.page import ParsedPage
 
 logger = logging.getLogger(__name__)
 
+_RE_BASKET_SCRIPT = re.compile(r"jBasketComposer\s*\(", re.IGNORECASE)
+_RE_VEHICLE = re.compile(r"([A-Z\s]+\([A-Z0-9\-]+\))")
+_RE_PLATE = re.compile(r"\(([A-Z0-9\-]+)\)")
+_RE_SEMAINE = re.compile(r"(?:semaine|week)[\s:]+([0-9]{4}-[0-9]{1,2})", re.IGNORECASE)
+_RE_SEMAINE_HINT = re.compile(r"semaine|week", re.IGNORECASE)
+# Class fragments targeted by the _extract_basket_totals selectors
+_TOTAL_TOKENS = ("total-ht", "total_ht", "total-ttc", "total_ttc", "total-tva", "total_tva", "currency", "devise")
+_PRICE_QTTY = itemgetter("price", "qtty")
+_RE_TYPE = re.compile(r"type\s+de\s+vente[:\s]+([A-Z_]+)", re.IGNORECASE)
+_RE_TYPE_HINT = re.compile(r"de\s+vente", re.IGNORECASE)
+
 
-def extract_basket_data(html_content: str, dev_mode: bool = False) -> Dict[str, Any]:
+def extract_basket_data(
+    html_content: str,
+    dev_mode: bool = False,
+    page: ParsedPage | None = None,
+) -> Dict[str, Any]:
     """
     Extract basket lines and totals from view page.
     Returns: {basket_lines: [], basket_totals: {}, debug: {...} if empty}
     """
-    from src.parse.basket import extract_basket_lines
-    import re
+    page = page or ParsedPage(html_content)
     
     result = {
         "basket_lines": [],
@@ -24,23 +51,20 @@ def extract_basket_data(html_content: str, dev_mode: bool = False) -> Dict[str,
     debug = {}
     
     # Check if jBasketComposer script exists
-    basket_script_pattern = r"jBasketComposer\s*\("
-    found_script = bool(re.search(basket_script_pattern, html_content, re.IGNORECASE))
+    match = _RE_BASKET_SCRIPT.search(html_content)
+    found_script = match is not None
     debug["found_basket_script"] = found_script
     
     if found_script:
-        # Extract script excerpt for debugging
-        matches = list(re.finditer(basket_script_pattern, html_content, re.IGNORECASE))
-        if matches:
-            match = matches[0]
-            start = max(0, match.start() - 100)
-            end = min(len(html_content), match.end() + 1000)
-            script_excerpt = html_content[start:end]
-            debug["basket_script_len"] = len(script_excerpt)
-            
-            if dev_mode:
-                # Store raw excerpt (max 500 chars) in DEV mode only
-                debug["basket_raw_excerpt"] = script_excerpt[:500] if len(script_excerpt) > 500 else script_excerpt
+        # Extract script excerpt for debugging (around the first call only)
+        start = max(0, match.start() - 100)
+        end = min(len(html_content), match.end() + 1000)
+        script_excerpt = html_content[start:end]
+        debug["basket_script_len"] = len(script_excerpt)
+        
+        if dev_mode:
+            # Store raw excerpt (max 500 chars) in DEV mode only
+            debug["basket_raw_excerpt"] = script_excerpt[:500] if len(script_excerpt) > 500 else script_excerpt
     else:
         debug["basket_script_len"] = 0
     
@@ -53,7 +77,7 @@ def extract_basket_data(html_content: str, dev_mode: bool = False) -> Dict[str,
             result["debug"] = debug
         
         # Try to extract totals from basket lines or HTML
-        totals = _extract_basket_totals(html_content, basket_lines)
+        totals = _extract_basket_totals(page, basket_lines)
         if totals:
             result["basket_totals"] = totals
             
@@ -67,19 +91,26 @@ def extract_basket_data(html_content: str, dev_mode: bool = False) -> Dict[str,
     return result
 
 
-def _extract_basket_totals(html_content: str, basket_lines: list) -> Dict[str, Any]:
+def _extract_basket_totals(page: ParsedPage, basket_lines: list) -> Dict[str, Any]:
     """Extract basket totals from HTML or calculate from lines."""
     totals = {}
-    parser = HTMLParser(html_content)
+    total_ht = total_ttc = total_tax = None
+    currency_text = ""
     
-    # Try to find totals in HTML
-    total_ht = extract_numeric_from_text(extract_text_by_selector(parser, ".total-ht, [class*='total-ht'], [class*='total_ht']"))
-    total_ttc = extract_numeric_from_text(extract_text_by_selector(parser, ".total-ttc, [class*='total-ttc'], [class*='total_ttc']"))
-    total_tax = extract_numeric_from_text(extract_text_by_selector(parser, ".total-tva, [class*='total-tva'], [class*='total_tva']"))
+    # Try to find totals in HTML (only parse it if one of the selectors can match)
+    html_content = page.html_content or ""
+    if any(token in html_content for token in _TOTAL_TOKENS):
+        parser = page.parser
+        total_ht = extract_numeric_from_text(extract_text_by_selector(parser, ".total-ht, [class*='total-ht'], [class*='total_ht']"))
+        total_ttc = extract_numeric_from_text(extract_text_by_selector(parser, ".total-ttc, [class*='total-ttc'], [class*='total_ttc']"))
+        total_tax = extract_numeric_from_text(extract_text_by_selector(parser, ".total-tva, [class*='total-tva'], [class*='total_tva']"))
+        currency_text = extract_text_by_selector(parser, ".currency, [class*='currency'], [class*='devise']")
     
     # If not found, try to calculate from basket lines
     if not total_ht and basket_lines:
-        total_ht = sum(line.get("price", 0) * line.get("qtty", 0) for line in basket_lines)
+        pairs = (_PRICE_QTTY(line) for line in basket_lines if "price" in line and "qtty" in line)
+        # fsum: exact float summation, no drift on long carts
+        total_ht = math.fsum(price * qtty for price, qtty in pairs if price and qtty)
     
     if total_ht is not None:
         totals["total_ht"] = total_ht
@@ -88,56 +119,75 @@ def _extract_basket_totals(html_content: str, basket_lines: list) -> Dict[str, A
     if total_tax is not None:
         totals["total_tax"] = total_tax
     
-    # Try to find currency
-    currency_text = extract_text_by_selector(parser, ".currency, [class*='currency'], [class*='devise']")
+    # Currency found in HTML, or default
     if currency_text:
-        totals["currency"] = currency_text.strip()
+        totals["currency"] = intern_text(currency_text.strip())
     else:
         totals["currency"] = "EUR"  # Default
     
     return totals
 
 
-def extract_location_vehicule(html_content: str) -> Dict[str, Any]:
+def extract_location_vehicule(html_content: str, page: ParsedPage | None = None) -> Dict[str, Any]:
     """
     Extract Location de véhicule data from view page.
     Returns: {vehicle_label, vehicle_nr, plate, semaine, contract_cto_nr, last_subscription_cto_nr}
     """
-    parser = HTMLParser(html_content)
+    parser = (page or ParsedPage(html_content)).parser
     location = {}
     
     # Extract vehicle label (look for text near "Location de véhicule" heading)
     # Try to find vehicle info after <h5>Location de véhicule</h5>
     h5_location = parser.css_first("h5")
-    if h5_location and "location" in h5_location.text(strip=True).lower() and "véhicule" in h5_location.text(strip=True).lower():
+    h5_text = h5_location.text(strip=True).lower() if h5_location else ""
+    if "location" in h5_text and "véhicule" in h5_text:
         # Look for vehicle info in the next elements
         parent = h5_location.parent
         if parent:
             # Search for vehicle label in nearby text
             vehicle_text = parent.text(separator=" ", strip=True)
             # Try to extract vehicle label pattern (e.g., "TOYOTA PRIUS (GK-345-BT)")
-            vehicle_match = re.search(r"([A-Z\s]+\([A-Z0-9\-]+\))", vehicle_text)
+            vehicle_match = _RE_VEHICLE.search(vehicle_text)
             if vehicle_match:
                 location["vehicle_label"] = vehicle_match.group(1).strip()
     
-    # Extract vehicle link and nr
-    for link in parser.css("a[href*='vehicles/view']"):
-        href = link.attributes.get("href", "")
-        if href:
-            # Extract nr from URL: vehicles/view?nr=28953
-            nr_match = re.search(r"nr=(\d+)", href)
+    # One pass over the anchors fills the vehicle link and the two buttons; each slot takes its first match
+    vehicle_found = contract_found = subscription_found = False
+    for link in parser.tags("a"):
+        href = link.attrs.get("href") or ""
+        if not href:
+            continue
+        nr_match = _RE_NR.search(href)
+        
+        # Vehicle link and nr: vehicles/view?nr=28953
+        if not vehicle_found and "vehicles/view" in href:
+            vehicle_found = True
             if nr_match:
                 location["vehicle_nr"] = int(nr_match.group(1))
-            
             # Extract vehicle label from link text
             link_text = link.text(strip=True)
             if link_text and not location.get("vehicle_label"):
                 location["vehicle_label"] = link_text
+        
+        if "nr=" in href and not (contract_found and subscription_found):
+            text = link.text(strip=True).lower()
+            # contract_cto_nr from "Contrat initial & Caution" button
+            if not contract_found and "contrat" in text and "caution" in text:
+                contract_found = True
+                if nr_match:
+                    location["contract_cto_nr"] = int(nr_match.group(1))
+            # last_subscription_cto_nr from "Dernière vente d'abonnement" button
+            if not subscription_found and ("dernière" in text or "derniere" in text) and "abonnement" in text:
+                subscription_found = True
+                if nr_match:
+                    location["last_subscription_cto_nr"] = int(nr_match.group(1))
+        
+        if vehicle_found and contract_found and subscription_found:
             break
     
     # Extract plate from vehicle_label if present
     if location.get("vehicle_label"):
-        plate_match = re.search(r"\(([A-Z0-9\-]+)\)", location["vehicle_label"])
+        plate_match = _RE_PLATE.search(location["vehicle_label"])
         if plate_match:
             location["plate"] = plate_match.group(1)
     
@@ -145,50 +195,28 @@ def extract_location_vehicule(html_content: str) -> Dict[str, Any]:
     semaine = extract_text_by_selector(parser, ".semaine, [class*='semaine'], [class*='week'], [data-semaine]")
     if not semaine:
         # Try to find in text near "semaine" or "week"
-        body_text = parser.body.text()
-        semaine_match = re.search(r"(?:semaine|week)[\s:]+([0-9]{4}-[0-9]{1,2})", body_text, re.IGNORECASE)
+        semaine_match = _search_page_text(_RE_SEMAINE, _RE_SEMAINE_HINT, html_content, parser)
         if semaine_match:
             semaine = semaine_match.group(1)
     if semaine:
         location["semaine"] = semaine.strip()
     
-    # Extract contract_cto_nr from "Contrat initial & Caution" button
-    for link in parser.css("a[href*='nr=']"):
-        href = link.attributes.get("href", "")
-        text = link.text(strip=True)
-        if href and ("contrat" in text.lower() and "caution" in text.lower()):
-            nr_match = re.search(r"nr=(\d+)", href)
-            if nr_match:
-                location["contract_cto_nr"] = int(nr_match.group(1))
-            break
-    
-    # Extract last_subscription_cto_nr from "Dernière vente d'abonnement" button
-    for link in parser.css("a[href*='nr=']"):
-        href = link.attributes.get("href", "")
-        text = link.text(strip=True)
-        if href and ("dernière" in text.lower() or "derniere" in text.lower()) and "abonnement" in text.lower():
-            nr_match = re.search(r"nr=(\d+)", href)
-            if nr_match:
-                location["last_subscription_cto_nr"] = int(nr_match.group(1))
-            break
-    
     return location
 
 
-def extract_sale_header(html_content: str) -> Dict[str, Any]:
+def extract_sale_header(html_content: str, page: ParsedPage | None = None) -> Dict[str, Any]:
     """
     Extract sale header information (type_code, status, created_at, contact_nr, biz_nr).
     Returns minimal dict with what can be found.
     """
-    parser = HTMLParser(html_content)
+    parser = (page or ParsedPage(html_content)).parser
     header = {}
     
     # Extract type_code (Type de vente)
     type_code = extract_text_by_selector(parser, "[data-type-code], .type-code, [class*='type-code']")
     if not type_code:
         # Try to find in text
-        body_text = parser.body.text()
-        type_match = re.search(r"type\s+de\s+vente[:\s]+([A-Z_]+)", body_text, re.IGNORECASE)
+        type_match = _search_page_text(_RE_TYPE, _RE_TYPE_HINT, html_content, parser)
         if type_match:
             type_code = type_match.group(1)
     if type_code:
@@ -202,44 +230,35 @@ def extract_sale_header(html_content: str) -> Dict[str, Any]:
     # Extract created_at (date de création)
     created_at = extract_text_by_selector(parser, "[data-created-at], .created-at, [class*='created-at'], [class*='date-creation']")
     if created_at:
-        from src.parse.html_parser import parse_date
         header["created_at"] = parse_date(created_at)
     
-    # Extract contact_nr from links
-    for link in parser.css("a[href*='ct/view'], a[href*='crm/ct']"):
-        href = link.attributes.get("href", "")
-        nr_match = re.search(r"nr=(\d+)", href)
-        if nr_match:
-            header["contact_nr"] = int(nr_match.group(1))
-            break
-    
-    # Extract biz_nr from links
-    for link in parser.css("a[href*='biz/view'], a[href*='com/biz']"):
-        href = link.attributes.get("href", "")
-        nr_match = re.search(r"nr=(\d+)", href)
-        if nr_match:
-            header["biz_nr"] = int(nr_match.group(1))
+    # Extract contact_nr and biz_nr from the first matching links, in one pass over the anchors
+    for link in parser.tags("a"):
+        href = link.attrs.get("href") or ""
+        if "nr=" not in href:
+            continue
+        if "contact_nr" not in header and ("ct/view" in href or "crm/ct" in href):
+            nr_match = _RE_NR.search(href)
+            if nr_match:
+                header["contact_nr"] = int(nr_match.group(1))
+        if "biz_nr" not in header and ("biz/view" in href or "com/biz" in href):
+            nr_match = _RE_NR.search(href)
+            if nr_match:
+                header["biz_nr"] = int(nr_match.group(1))
+        if "contact_nr" in header and "biz_nr" in header:
             break
     
     return header
 
 
-def extract_text_by_selector(parser: HTMLParser, selector: str, default: str = "") -> str:
-    """Extract text from first matching element."""
-    node = parser.css_first(selector)
-    return node.text(strip=True) if node else default
-
-
-def extract_numeric_from_text(text: str) -> Optional[float]:
-    """Extract numeric value from text."""
-    if not text:
-        return None
-    cleaned = text.replace(" ", "").replace(",", ".")
-    match = re.search(r"[\d.]+", cleaned)
-    if match:
-        try:
-            return float(match.group())
-        except ValueError:
-            pass
-    return None
-
+def _search_page_text(pattern: re.Pattern, hint: re.Pattern, html_content: str, parser: HTMLParser) -> re.Match | None:
+    """
+    Search `pattern` in the raw HTML first (no DOM-to-text conversion). The body
+    text, a full-DOM walk, is only built when the raw search failed but `hint`
+    shows the label is present (markup between the label and its value).
+    """
+    html_content = html_content or ""
+    match = pattern.search(html_content)
+    if match is None and parser.body is not None and hint.search(html_content):
+        match = pattern.search(parser.body.text())
+    return match
@@ -2,16 +2,51 @@
 import logging
 import re
 import hashlib
+import threading
 from typing import Any
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from urllib.parse import urljoin, urlparse
 
-from selectolax.parser import HTMLParser, Node
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
 
-from src.parse.jsinfos import parse_jsinfos
+from src.config import config
+from src.parse.extractors._common import NUM_TRANS, extract_fields
+from src.parse.page import ParsedPage
 
 logger = logging.getLogger(__name__)
 
+_RE_NUMERIC = re.compile(r"[\d.]+")
+# _extract_page_data fields: one comma selector each, first match wins (key order is output order).
+# Explicit classes only: substring matchers like [class*='ht'] also hit "text-right", "support", ...
+_PAGE_FIELDS = {
+    "ref": ["span.ref, .ref"],
+    "commande": ["date-commande, .date-commande"],
+    "facturation": ["date-facturation, .date-facturation"],
+    "livraison": ["date-livraison, .date-livraison"],
+    "ttc": ["montant-ttc, .montant-ttc, .ttc"],
+    "tva": ["montant-tva, .montant-tva, .tva"],
+    "ht": ["montant-ht, .montant-ht, .ht"],
+    "port": ["port, .port"],
+    "client_name": [".client-name, .client"],
+    "entity": [".entity"],
+    "vehicule": [".vehicule"],
+}
+_VIEW_PAGE_FIELDS = {**_PAGE_FIELDS, "semaine": [".semaine, .week"]}
+_PAGE_DATE_KEYS = frozenset(("commande", "facturation", "livraison"))
+_PAGE_AMOUNT_KEYS = frozenset(("ttc", "tva", "ht", "port"))
+
+# Tab pages by URL (viewLogistic?nr=...); anything else is the main view page
+_RE_PAGE_TYPE = re.compile(r"view(Logistic|Payment|Infos|Orders)")
+_PAGE_TYPES = {"Logistic": "logistic", "Payment": "payment", "Infos": "infos", "Orders": "orders"}
+
+# Gate patterns for contains_location_vehicule
+# Both run on the lowercased HTML: a plain pattern uses sre's literal-prefix scan,
+# an IGNORECASE one steps through every character (~10x slower on a full page)
+_RE_LOCATION = re.compile(r"location\s+de\s+véhicule")
+_RE_TYPE_SUBSCRIPTION = re.compile(r"type\s+de\s+vente.*location[_-]?subscription")
+
 
 def extract_text_by_selector(parser: HTMLParser, selector: str, default: str = "") -> str:
     """Extract text from first matching element."""
@@ -24,10 +59,20 @@ def extract_all_text_by_selector(parser: HTMLParser, selector: str) -> list[str]
     return [node.text(strip=True) for node in parser.css(selector) if node.text(strip=True)]
 
 
+@lru_cache(maxsize=4096)
 def parse_date(date_str: str) -> str | None:
-    """Try to parse a date string and return ISO format."""
+    """Try to parse a date string and return ISO format (memoized: portal dates repeat a lot)."""
     if not date_str:
         return None
+    value = date_str.strip()
+    # Fast path for dd/mm/yyyy (most portal dates): slice instead of strptime
+    if len(value) == 10 and value[2] == "/" and value[5] == "/":
+        digits = value[:2] + value[3:5] + value[6:]
+        if digits.isascii() and digits.isdigit():
+            try:
+                return datetime(int(value[6:]), int(value[3:5]), int(value[:2])).isoformat()
+            except ValueError:
+                pass
     # Common date formats in French
     formats = [
         "%d/%m/%Y",
@@ -37,21 +82,22 @@ def parse_date(date_str: str) -> str | None:
     ]
     for fmt in formats:
         try:
-            dt = datetime.strptime(date_str.strip(), fmt)
+            dt = datetime.strptime(value, fmt)
             return dt.isoformat()
         except ValueError:
             continue
     return date_str  # Return as-is if can't parse
 
 
+@lru_cache(maxsize=4096)
 def extract_numeric(text: str) -> float | None:
-    """Extract numeric value from text (handles French number format)."""
+    """Extract numeric value from text (handles French number format; memoized)."""
     if not text:
         return None
-    # Remove spaces, replace comma with dot
-    cleaned = text.replace(" ", "").replace(",", ".")
+    # Remove spaces (incl. no-break), replace comma with dot, in one pass
+    cleaned = text.translate(NUM_TRANS)
     # Extract number
-    match = re.search(r"[\d.]+", cleaned)
+    match = _RE_NUMERIC.search(cleaned)
     if match:
         try:
             return float(match.group())
@@ -72,6 +118,12 @@ def contains_location_vehicule(html_content: str) -> tuple[bool, dict[str, Any]]
         return False, {"gate_reason": "empty_html"}
 
     html_lower = html_content.lower()
+    # Every check below needs "location": settle the common negative case with one substring scan
+    if "location" not in html_lower:
+        return False, {
+            "gate_reason": "missing_location_de_vehicule",
+            "gate_match_count": 0,
+        }
     matches = []
     matched_texts = []
 
@@ -81,14 +133,19 @@ def contains_location_vehicule(html_content: str) -> tuple[bool, dict[str, Any]]
         matched_texts.append("<h5>Location de véhicule</h5>")
 
     # Check 2: Regex "Location\s+de\s+véhicule" (case-insensitive)
-    regex_match = re.search(r"location\s+de\s+véhicule", html_content, re.IGNORECASE)
+    regex_match = _RE_LOCATION.search(html_lower)
     if regex_match:
         matches.append("regex")
-        matched_texts.append(regex_match.group(0))
+        # Report the original casing when lowering kept offsets aligned (it does unless
+        # the page has characters like "İ" whose lowercase is longer)
+        if len(html_lower) == len(html_content):
+            matched_texts.append(html_content[regex_match.start():regex_match.end()])
+        else:
+            matched_texts.append(regex_match.group(0))
 
     # Check 3: "Type de vente (code) = Location_Subscription"
     if "location_subscription" in html_lower or "type de vente" in html_lower:
-        type_match = re.search(r"type\s+de\s+vente.*location[_-]?subscription", html_lower)
+        type_match = _RE_TYPE_SUBSCRIPTION.search(html_lower)
         if type_match:
             matches.append("type_code")
             matched_texts.append(type_match.group(0))
@@ -112,11 +169,80 @@ def parse_html_pages(
     base_url: str,
     gate_passed: bool = True,
     store_debug_snippets: bool = False,
+    explorer_max_links: int = 200,
+    max_workers: int | None = None,
 ) -> dict[str, Any]:
     """
     Parse all HTML pages and extract data.
     Only does full extraction if gate_passed is True.
+    Pages are independent: with `max_workers` > 1 (default config.PARSE_WORKERS)
+    they are parsed on a shared thread pool, results merged in input order.
+    """
+    data = {
+        "pages": {},
+        "explorer_links_all": [],
+    }
+
+    items = list(responses.items())
+    if max_workers is None:
+        max_workers = config.PARSE_WORKERS
+
+    def parse_one(item: tuple[str, str | None]) -> tuple[str, dict[str, Any], list[str]]:
+        url, html_content = item
+        return _parse_single_page(
+            url, html_content, base_url, gate_passed, store_debug_snippets, explorer_max_links
+        )
+
+    # Parse each page
+    if max_workers > 1 and len(items) > 1:
+        results = list(_get_parse_executor(max_workers).map(parse_one, items))
+    else:
+        results = map(parse_one, items)
+
+    # Global explorer links, deduplicated as they are collected
+    seen_links: set[str] = set()
+    for page_type, page_result, explorer_urls in results:
+        data["pages"][page_type] = page_result
+        for link_url in explorer_urls:
+            if link_url not in seen_links:
+                seen_links.add(link_url)
+                data["explorer_links_all"].append(link_url)
+
+    data["explorer_links_all"].sort()
+
+    return data
+
+
+_parse_executor: ThreadPoolExecutor | None = None
+_parse_executor_size = 0
+_parse_executor_lock = threading.Lock()
+
+
+def _get_parse_executor(max_workers: int) -> ThreadPoolExecutor:
+    """
+    Process-wide page parsing pool, created on first use and replaced by a larger
+    one when a call asks for more workers. The old pool is not shut down: another
+    thread may hold it and not have submitted yet; its idle workers exit once
+    nothing references it.
     """
+    global _parse_executor, _parse_executor_size
+    with _parse_executor_lock:
+        if _parse_executor is None or max_workers > _parse_executor_size:
+            _parse_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="parse")
+            _parse_executor_size = max_workers
+        return _parse_executor
+
+
+def _parse_single_page(
+    url: str,
+    html_content: str | None,
+    base_url: str,
+    gate_passed: bool,
+    store_debug_snippets: bool,
+    explorer_max_links: int,
+) -> tuple[str, dict[str, Any], list[str]]:
+    """Parse one page. Returns (page_type, page_result, explorer link URLs)."""
+    from src.auth.login_detector import is_double_session_popup
     from src.parse.explorer_enhanced import filter_and_tag_explorer_links
     from src.parse.extractors.view_extractor import (
         extract_basket_data,
@@ -130,161 +256,166 @@ def parse_html_pages(
         extract_orders_data,
     )
 
-    data = {
-        "pages": {},
-        "explorer_links_all": [],
-    }
-
-    # Parse each page
-    for url, html_content in responses.items():
-        page_type = _get_page_type(url)
-        
-        # Create page result even if html_content is None (failed fetch)
-        # This ensures all pages are recorded in Supabase even if they failed
-        if not html_content:
-            # Page failed to fetch - create minimal entry
-            page_result = {
-                "url": url,
-                "status_code": None,  # Will be set by caller if available
-                "final_url": url,  # Will be updated by caller
-                "hash": None,
-                "content_length": 0,
-                "extracted": {"fetch_error": "no_html_content"},
-            }
-            data["pages"][page_type] = page_result
-            continue
-
-        # Check for double session popup - this is not valid page content
-        from src.auth.login_detector import is_double_session_popup
-        if is_double_session_popup(html_content):
-            # Page contains double session popup - mark as error
-            page_result = {
-                "url": url,
-                "status_code": 200,  # HTTP 200 but content is popup
-                "final_url": url,
-                "hash": _compute_hash(html_content),
-                "content_length": len(html_content.encode("utf-8")),
-                "extracted": {"fetch_error": "double_session_popup"},
-            }
-            data["pages"][page_type] = page_result
-            continue
-
-        parser = HTMLParser(html_content)
-        content_length = len(html_content.encode("utf-8"))
+    page_type = get_page_type(url)
+    explorer_urls = []
 
+    # Create page result even if html_content is None (failed fetch)
+    # This ensures all pages are recorded in Supabase even if they failed
+    if not html_content:
+        # Page failed to fetch - create minimal entry
         page_result = {
             "url": url,
-            "status_code": 200,  # Will be set by caller if available
+            "status_code": None,  # Will be set by caller if available
             "final_url": url,  # Will be updated by caller
-            "hash": _compute_hash(html_content),
-            "content_length": content_length,
-            "extracted": {},
+            "hash": None,
+            "content_length": 0,
+            "extracted": {"fetch_error": "no_html_content"},
         }
+        return page_type, page_result, explorer_urls
 
-        # Only do full extraction if gate passed
-        if gate_passed:
-            # Extract JSinfos from this page (stored in extracted, not at root)
-            page_jsinfos = parse_jsinfos(html_content)
-            if page_jsinfos:
-                page_result["extracted"]["jsinfos"] = page_jsinfos
-
-            # Extract data based on page type
-            if page_type == "view":
-                # Extract basket data (with dev_mode for debug)
-                basket_data = extract_basket_data(html_content, dev_mode=store_debug_snippets)
-                # Always include basket data, even if empty (for debug info)
-                page_result["extracted"]["basket"] = basket_data
-
-                # Extract location véhicule
-                location = extract_location_vehicule(html_content)
-                if location:
-                    page_result["extracted"]["location"] = location
-
-                # Extract sale header
-                sale_header = extract_sale_header(html_content)
-                if sale_header:
-                    page_result["extracted"]["sale_header"] = sale_header
-
-            elif page_type == "payment":
-                payment_data = extract_payment_data(html_content, base_url)
-                page_result["extracted"] = payment_data
-
-            elif page_type == "logistic":
-                logistic_data = extract_logistic_data(html_content)
-                page_result["extracted"] = logistic_data
-
-            elif page_type == "infos":
-                infos_data = extract_infos_data(html_content)
-                page_result["extracted"] = infos_data
-
-            elif page_type == "orders":
-                orders_data = extract_orders_data(html_content)
-                page_result["extracted"] = orders_data
-
-            # Extract explorer links (filtered and tagged)
-            explorer_links = filter_and_tag_explorer_links(html_content, base_url, max_links=200)
-            if explorer_links:
-                page_result["explorer_links"] = explorer_links
-                # Collect URLs for global deduplication
-                for link in explorer_links:
-                    if isinstance(link, dict) and "url" in link:
-                        data["explorer_links_all"].append(link["url"])
-                    elif isinstance(link, str):
-                        data["explorer_links_all"].append(link)
-
-            # Extract debug snippets if requested (small, controlled)
-            if store_debug_snippets:
-                snippet = _extract_debug_snippet(html_content)
-                if snippet:
-                    page_result["extract_debug_snippet"] = snippet
-        else:
-            # Minimal extraction when gate not passed
-            page_result["extracted"] = {"gate_passed": False}
+    # Encode once for the hash and content_length; the bytes copy is dropped before extraction
+    html_bytes = html_content.encode("utf-8")
+    page_hash = _compute_hash(html_bytes)
+    content_length = len(html_bytes)
+    del html_bytes
 
-        data["pages"][page_type] = page_result
+    # Check for double session popup - this is not valid page content
+    if is_double_session_popup(html_content):
+        # Page contains double session popup - mark as error
+        page_result = {
+            "url": url,
+            "status_code": 200,  # HTTP 200 but content is popup
+            "final_url": url,
+            "hash": page_hash,
+            "content_length": content_length,
+            "extracted": {"fetch_error": "double_session_popup"},
+        }
+        return page_type, page_result, explorer_urls
+
+    page_result = {
+        "url": url,
+        "status_code": 200,  # Will be set by caller if available
+        "final_url": url,  # Will be updated by caller
+        "hash": page_hash,
+        "content_length": content_length,
+        "extracted": {},
+    }
 
-    # Deduplicate global explorer links
-    data["explorer_links_all"] = sorted(list(set(data["explorer_links_all"])))
+    # Only do full extraction if gate passed
+    if not gate_passed:
+        # Minimal extraction when gate not passed
+        page_result["extracted"] = {"gate_passed": False}
+        return page_type, page_result, explorer_urls
 
-    return data
+    # Parsed once per page, shared by every extractor, explorer links and debug snippet
+    page = ParsedPage(html_content)
+    parser = page.parser
 
+    # Extract JSinfos from this page (stored in extracted, not at root)
+    page_jsinfos = page.jsinfos
+    if page_jsinfos:
+        page_result["extracted"]["jsinfos"] = page_jsinfos
 
-def _extract_debug_snippet(html_content: str, max_bytes: int = 3000) -> str | None:
+    # Extract data based on page type
+    if page_type == "view":
+        # Extract basket data (with dev_mode for debug)
+        basket_data = extract_basket_data(html_content, dev_mode=store_debug_snippets, page=page)
+        # Always include basket data, even if empty (for debug info)
+        page_result["extracted"]["basket"] = basket_data
+
+        # Extract location véhicule
+        location = extract_location_vehicule(html_content, page=page)
+        if location:
+            page_result["extracted"]["location"] = location
+
+        # Extract sale header
+        sale_header = extract_sale_header(html_content, page=page)
+        if sale_header:
+            page_result["extracted"]["sale_header"] = sale_header
+
+    elif page_type == "payment":
+        payment_data = extract_payment_data(html_content, base_url, page=page)
+        page_result["extracted"] = payment_data
+
+    elif page_type == "logistic":
+        logistic_data = extract_logistic_data(html_content, page=page)
+        page_result["extracted"] = logistic_data
+
+    elif page_type == "infos":
+        infos_data = extract_infos_data(html_content, page=page)
+        page_result["extracted"] = infos_data
+
+    elif page_type == "orders":
+        orders_data = extract_orders_data(html_content, page=page)
+        page_result["extracted"] = orders_data
+
+    # Extract explorer links (filtered and tagged)
+    explorer_links = filter_and_tag_explorer_links(
+        html_content, base_url, max_links=explorer_max_links, parser=parser
+    )
+    if explorer_links:
+        page_result["explorer_links"] = explorer_links
+        # Collect URLs for global deduplication
+        for link in explorer_links:
+            if isinstance(link, dict) and "url" in link:
+                explorer_urls.append(link["url"])
+            elif isinstance(link, str):
+                explorer_urls.append(link)
+
+    # Extract debug snippets if requested (small, controlled)
+    if store_debug_snippets:
+        snippet = _extract_debug_snippet(html_content, parser=parser)
+        if snippet:
+            page_result["extract_debug_snippet"] = snippet
+
+    return page_type, page_result, explorer_urls
+
+
+def _extract_debug_snippet(
+    html_content: str,
+    max_bytes: int = 3000,
+    parser: HTMLParser | None = None,
+) -> str | None:
     """Extract a small debug snippet (max 3KB) for debugging."""
     if not html_content:
         return None
     
     # Extract first meaningful content (skip head, scripts, styles)
-    parser = HTMLParser(html_content)
+    if parser is None:
+        parser = HTMLParser(html_content)
     body = parser.body
     if not body:
         return None
     
-    # Get text content, limit size
-    snippet = body.text(separator=" ", strip=True)
+    # Same text as body.text(separator=" ", strip=True), but stop walking once past the limit
+    pieces = []
+    size = 0
+    for node in body.traverse(include_text=True):
+        if node.tag != "-text":
+            continue
+        text = (node.text_content or "").strip()
+        pieces.append(text)
+        size += len(text) + 1
+        if size > max_bytes:
+            break
+    snippet = " ".join(pieces)
     if len(snippet.encode("utf-8")) > max_bytes:
         snippet = snippet[:max_bytes] + "..."
     
     return snippet
 
 
-def _compute_hash(content: str) -> str:
-    """Compute SHA256 hash of content."""
-    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+def _compute_hash(content: str | bytes) -> str:
+    """Compute SHA256 hash of content (pass the UTF-8 bytes when already encoded)."""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()[:16]
 
 
-def _get_page_type(url: str) -> str:
-    """Determine page type from URL."""
-    if "viewLogistic" in url:
-        return "logistic"
-    elif "viewPayment" in url:
-        return "payment"
-    elif "viewInfos" in url:
-        return "infos"
-    elif "viewOrders" in url:
-        return "orders"
-    else:
-        return "view"
+def get_page_type(url: str) -> str:
+    """Determine page type from URL (one regex scan, "view" by default)."""
+    match = _RE_PAGE_TYPE.search(url)
+    return _PAGE_TYPES[match.group(1)] if match else "view"
 
 
 def _extract_page_data(parser: HTMLParser, page_type: str) -> dict[str, Any]:
@@ -293,73 +424,38 @@ def _extract_page_data(parser: HTMLParser, page_type: str) -> dict[str, Any]:
 
     # Common extractions (adjust based on actual HTML)
     # Look for common patterns: refs, dates, amounts, client info, etc.
-
-    # Example: Extract reference (BC-xxxx)
-    ref = extract_text_by_selector(parser, "span.ref, .ref, [class*='ref']")
-    if ref:
-        data["ref"] = ref
-
-    # Extract dates (commande, facturation, etc.)
-    date_patterns = [
-        ("commande", "date-commande, .date-commande"),
-        ("facturation", "date-facturation, .date-facturation"),
-        ("livraison", "date-livraison, .date-livraison"),
-    ]
-    for key, selector in date_patterns:
-        date_text = extract_text_by_selector(parser, selector)
-        if date_text:
-            data[key] = parse_date(date_text)
-
-    # Extract amounts (TTC, TVA, ports)
-    amount_patterns = [
-        ("ttc", "montant-ttc, .ttc, [class*='ttc']"),
-        ("tva", "montant-tva, .tva, [class*='tva']"),
-        ("ht", "montant-ht, .ht, [class*='ht']"),
-        ("port", "port, .port, [class*='port']"),
-    ]
-    for key, selector in amount_patterns:
-        amount_text = extract_text_by_selector(parser, selector)
-        if amount_text:
-            amount = extract_numeric(amount_text)
+    # Every field is resolved from one combined selector query (first match per field)
+    fields = _VIEW_PAGE_FIELDS if page_type == "view" else _PAGE_FIELDS
+    texts = extract_fields(parser, fields)
+
+    for key, text in texts.items():
+        if key in _PAGE_DATE_KEYS:
+            # Dates (commande, facturation, etc.)
+            data[key] = parse_date(text)
+        elif key in _PAGE_AMOUNT_KEYS:
+            # Amounts (TTC, TVA, ports)
+            amount = extract_numeric(text)
             if amount is not None:
                 data[key] = amount
-
-    # Extract client info
-    client_name = extract_text_by_selector(parser, ".client-name, [class*='client']")
-    if client_name:
-        data["client_name"] = client_name
-
-    # Extract entity/vehicule info
-    entity = extract_text_by_selector(parser, ".entity, [class*='entity']")
-    if entity:
-        data["entity"] = entity
-
-    vehicule = extract_text_by_selector(parser, ".vehicule, [class*='vehicule']")
-    if vehicule:
-        data["vehicule"] = vehicule
+        else:
+            data[key] = text
 
     # Extract Location de véhicule specific data (on view page)
     if page_type == "view":
-        # Extract semaine (week)
-        semaine = extract_text_by_selector(parser, ".semaine, [class*='semaine'], [class*='week']")
-        if semaine:
-            data["semaine"] = semaine
-
-        # Extract véhicule link
-        vehicule_link = None
-        for link in parser.css("a[href*='vehicles/view']"):
-            href = link.attributes.get("href", "")
-            if href:
-                data["vehicule_link"] = href
-                break
-
-        # Extract button links (Contrat initial & Caution, Dernière vente d'abonnement)
+        # One pass over the anchors: véhicule link and button links
+        # (Contrat initial & Caution, Dernière vente d'abonnement)
         button_links = []
-        for link in parser.css("a[href*='nr=']"):
-            href = link.attributes.get("href", "")
-            text = link.text(strip=True)
-            if href and ("contrat" in text.lower() or "caution" in text.lower() or "abonnement" in text.lower()):
-                button_links.append({"text": text, "href": href})
+        for link in parser.tags("a"):
+            href = link.attrs.get("href") or ""
+            if not href:
+                continue
+            if "vehicule_link" not in data and "vehicles/view" in href:
+                data["vehicule_link"] = href
+            if "nr=" in href:
+                text = link.text(strip=True)
+                text_lower = text.lower()
+                if "contrat" in text_lower or "caution" in text_lower or "abonnement" in text_lower:
+                    button_links.append({"text": text, "href": href})
         if button_links:
             data["button_links"] = button_links
 
@@ -367,4 +463,3 @@ def _extract_page_data(parser: HTMLParser, page_type: str) -> dict[str, Any]:
     # Use extract_debug_snippet if needed for debugging
 
     return data
-
@@ -1,51 +1,110 @@
 """Extract and decode span.JSinfos.base64 elements."""
-import base64
+import binascii
 import json
 import logging
-from typing import Any, Optional
+import re
+from functools import lru_cache
+from typing import Any, Iterable, Optional
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Opening tag of a span whose class list holds both JSinfos and base64 (any order, either quote)
+_RE_JSINFOS_OPEN = re.compile(
+    r"""<span\b[^>]*?\bclass\s*=\s*(["'])(?=[^"']*\bJSinfos\b)(?=[^"']*\bbase64\b)[^"']*\1[^>]*>"""
+)
+# Payload right after the opening tag: plain text up to the closing tag
+_RE_JSINFOS_BODY = re.compile(r"([^<]*)</span>")
+
+# Decoded payloads are parsed as JSON when they open with { or [ after whitespace
+_WHITESPACE_BYTES = frozenset(b" \t\r\n\f\v")
+_JSON_OPENING_BYTES = frozenset(b"{[")
+
 
+@lru_cache(maxsize=256)
 def decode_base64_safe(data: str) -> bytes:
-    """Decode base64 with padding handling."""
-    # Add padding if needed
-    missing_padding = len(data) % 4
-    if missing_padding:
-        data += "=" * (4 - missing_padding)
+    """
+    Decode base64 with padding handling (memoized: the same config blobs repeat across pages).
+    Non-strict a2b_base64 ignores surplus "=", so appending a full pad is enough for
+    any missing padding. Raises binascii.Error / ValueError on undecodable input.
+    """
+    return binascii.a2b_base64(data + "===", strict_mode=False)
+
+
+def _scan_jsinfos_payloads(html_content: str) -> list[str] | None:
+    """
+    Payload texts of the JSinfos spans found by a regex scan of the raw HTML.
+    Returns None whenever the scan may disagree with the DOM (the DOM is needed then):
+    comments or scripts that can hide span-like text, a "JSinfos" occurrence that did
+    not yield a span (e.g. a ">" inside another attribute), or non-plain-text content.
+    """
+    if "<!--" in html_content or "<script" in html_content:
+        return None
+    payloads = []
+    for opening in _RE_JSINFOS_OPEN.finditer(html_content):
+        body = _RE_JSINFOS_BODY.match(html_content, opening.end())
+        if body is None:
+            return None
+        payloads.append(body.group(1).strip())
+    if len(payloads) != html_content.count("JSinfos"):
+        return None
+    return payloads
+
+
+def _loads_lenient(decoded: bytes) -> Any:
+    """
+    JSON payload that orjson rejected (e.g. Latin-1 bytes, not UTF-8), parsed from its
+    text with invalid UTF-8 bytes dropped. None if it is still not valid JSON.
+    """
     try:
-        return base64.b64decode(data)
-    except Exception as e:
-        logger.warning(f"Base64 decode error: {e}")
-        raise
+        return json.loads(decoded.decode("utf-8", errors="ignore"))
+    except ValueError:
+        return None
 
 
-def parse_jsinfos(html_content: str) -> dict[str, Any]:
+def parse_jsinfos(html_content: str, parser: Any = None) -> dict[str, Any]:
     """
     Extract all span.JSinfos.base64 elements and decode them.
     Masks gmKey if present and stores config.title.
+    The spans are found with a regex scan of the raw HTML; the DOM (`parser`, an
+    already-parsed selectolax tree of `html_content`, built if not given) is only
+    used when the scan cannot be trusted to find the same spans (see _scan_jsinfos_payloads).
     """
-    from selectolax.parser import HTMLParser
+    if not html_content or "JSinfos" not in html_content:
+        return {}
 
-    parser = HTMLParser(html_content)
+    texts: Iterable[str] | None = _scan_jsinfos_payloads(html_content)
+    if texts is None:
+        if parser is None:
+            from selectolax.lexbor import LexborHTMLParser as HTMLParser
+
+            parser = HTMLParser(html_content)
+        # Find all span elements with classes "JSinfos" and "base64"
+        texts = (span.text(strip=True) for span in parser.css("span.JSinfos.base64"))
     jsinfos = {}
 
-    # Find all span elements with classes "JSinfos" and "base64"
-    for span in parser.css("span.JSinfos.base64"):
-        text = span.text(strip=True)
+    for text in texts:
         if not text:
             continue
 
         try:
             # Decode base64
             decoded = decode_base64_safe(text)
-            decoded_str = decoded.decode("utf-8", errors="ignore")
 
-            # Try to parse as JSON if it starts with { or [
-            if decoded_str.strip().startswith(("{", "[")):
+            # Try to parse as JSON if the first non-whitespace byte is { or [
+            first = next((byte for byte in decoded if byte not in _WHITESPACE_BYTES), 0)
+            if first in _JSON_OPENING_BYTES:
                 try:
-                    parsed = json.loads(decoded_str)
-                    
+                    # orjson parses the decoded bytes directly
+                    parsed = orjson.loads(decoded)
+                except orjson.JSONDecodeError:
+                    parsed = _loads_lenient(decoded)
+                if parsed is None:
+                    # Store as raw string if not valid JSON
+                    key = f"jsinfos_raw_{len(jsinfos)}"
+                    jsinfos[key] = decoded.decode("utf-8", errors="ignore")
+                else:
                     # Mask gmKey if present
                     if isinstance(parsed, dict):
                         if "gmKey" in parsed:
@@ -73,14 +132,10 @@ def parse_jsinfos(html_content: str) -> dict[str, Any]:
                         key = f"{key}_{len(jsinfos)}"
                     
                     jsinfos[key] = parsed
-                except json.JSONDecodeError:
-                    # Store as raw string if not valid JSON
-                    key = f"jsinfos_raw_{len(jsinfos)}"
-                    jsinfos[key] = decoded_str
             else:
                 # Store as raw string
                 key = f"jsinfos_raw_{len(jsinfos)}"
-                jsinfos[key] = decoded_str
+                jsinfos[key] = decoded.decode("utf-8", errors="ignore")
 
         except Exception as e:
             logger.debug(f"Error parsing JSinfos element: {e}")
@@ -1,21 +1,23 @@
 """Data models for scraped records."""
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, Optional
 from pydantic import BaseModel, Field
 
 
+def _utcnow() -> datetime:
+    """Timezone-aware current UTC time (datetime.utcnow is deprecated)."""
+    return datetime.now(timezone.utc)
+
+
 class SaleRecord(BaseModel):
-    """Complete sale record extracted from DigiFactory pages."""
+    """
+    Complete sale record extracted from DigiFactory pages.
+    Records built from already-parsed data can skip validation with SaleRecord.model_construct().
+    """
 
-    nr: int = Field(..., description="Sale number (primary key)")
-    fetched_at: datetime = Field(default_factory=datetime.utcnow)
+    nr: int = Field(..., frozen=True, description="Sale number (primary key)")
+    fetched_at: datetime = Field(default_factory=_utcnow, frozen=True)
     status: str = Field(default="ok", description="ok, not_found, auth_error, failed")
     data: dict[str, Any] = Field(default_factory=dict, description="All extracted data")
     raw: Optional[str] = Field(default=None, description="Compressed HTML (optional)")
     hash: Optional[str] = Field(default=None, description="Content hash for change detection")
-
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-        }
-
@@ -0,0 +1,36 @@
+"""A fetched HTML page parsed once and shared by every extractor."""
+from functools import cached_property
+from typing import Any
+
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
+from selectolax.parser import HTMLParser as ModestHTMLParser
+
+from src.config import config
+from src.parse.jsinfos import parse_jsinfos
+
+# Lexbor is the default; HTML_PARSER_BACKEND=modest switches back to the Modest engine
+_PARSER_CLASS = ModestHTMLParser if config.HTML_PARSER_BACKEND == "modest" else HTMLParser
+
+
+class ParsedPage:
+    """
+    Raw HTML plus its lazily-built DOM tree and decoded JSinfos.
+    Build one per page and pass it to the extractors so the HTML is
+    tokenized (and the JSinfos spans decoded) at most once.
+    """
+
+    def __init__(self, html_content: str, parser: HTMLParser | None = None):
+        self.html_content = html_content
+        if parser is not None:
+            self.parser = parser
+
+    @cached_property
+    def parser(self) -> HTMLParser:
+        """DOM tree of the page."""
+        return _PARSER_CLASS(self.html_content)
+
+    @cached_property
+    def jsinfos(self) -> dict[str, Any]:
+        """Decoded span.JSinfos.base64 payloads (see parse_jsinfos)."""
+        # Regex scan of the raw HTML; reuses the tree only if it is already built
+        return parse_jsinfos(self.html_content, parser=self.__dict__.get("parser"))
@@ -1,66 +1,157 @@
 """Redaction module to mask secrets in outputs and logs."""
 import re
-import json
+from functools import lru_cache
 from typing import Any, Dict, List
 
+import orjson
+
+# Patterns to redact, with their replacement text
+_REDACT_PATTERNS = [
+    (r'digiSuiteVars\.websocketAuthToken\s*[:=]\s*["\']([^"\']+)["\']', r'digiSuiteVars.websocketAuthToken = "[REDACTED]"'),
+    (r'gmKey["\']?\s*[:=]\s*["\']([^"\']+)["\']', r'gmKey = "[REDACTED]"'),
+    (r'access_token["\']?\s*[:=]\s*["\']([^"\']+)["\']', r'access_token = "[REDACTED]"'),
+    (r'refresh_token["\']?\s*[:=]\s*["\']([^"\']+)["\']', r'refresh_token = "[REDACTED]"'),
+    (r'Authorization["\']?\s*[:=]\s*["\']Bearer\s+([^"\']+)["\']', r'Authorization = "Bearer [REDACTED]"'),
+    (r'DigifactoryBO=([^;,\s]+)', r'DigifactoryBO=[REDACTED]'),
+]
+# All patterns as one alternation (one scan per string); the named group tells which one matched
+_RE_REDACT = re.compile(
+    "|".join(f"(?P<p{i}>{pattern})" for i, (pattern, _) in enumerate(_REDACT_PATTERNS)),
+    re.IGNORECASE,
+)
+_REDACT_REPLACEMENTS = {f"p{i}": replacement for i, (_, replacement) in enumerate(_REDACT_PATTERNS)}
+
+# Lowercased dict keys whose values are masked whole
+_REDACTED_KEYS = frozenset(("gmkey", "gm_key", "websocketauthtoken", "access_token", "refresh_token"))
+
+# Lowercased substrings every redacted key or pattern contains (patterns are case-insensitive)
+_SECRET_MARKERS = (
+    b"gmkey", b"gm_key", b"websocketauthtoken", b"access_token", b"refresh_token",
+    b"authorization", b"digifactorybo=",
+)
+
+
+def _redact_match(match: re.Match) -> str:
+    """Replacement text for whichever secret pattern matched."""
+    return _REDACT_REPLACEMENTS[match.lastgroup]
+
+
+# Lowercased substrings at least one of which every pattern match contains
+_REDACT_CHEAP_TOKENS = ("token", "gmkey", "bearer", "digifactorybo")
+_REDACT_MIN_LEN = 9
+
+# Strings up to this length go through the memoized path (values repeat across records)
+_REDACT_CACHE_MAX_LEN = 2048
+
+
+@lru_cache(maxsize=4096)
+def _redact_short_string(text: str) -> str:
+    """Memoized redaction of a short string."""
+    return _RE_REDACT.sub(_redact_match, text)
+
 
 def redact_string(text: str) -> str:
     """Redact secrets from a string."""
     if not text:
         return text
+    # Every match is at least 9 characters (gmKey:'x') and contains one of the cheap tokens
+    if len(text) < _REDACT_MIN_LEN:
+        return text
+    lowered = text.lower()
+    if not any(token in lowered for token in _REDACT_CHEAP_TOKENS):
+        return text
+    if len(text) <= _REDACT_CACHE_MAX_LEN:
+        return _redact_short_string(text)
     
-    # Patterns to redact
-    patterns = [
-        (r'digiSuiteVars\.websocketAuthToken\s*[:=]\s*["\']([^"\']+)["\']', r'digiSuiteVars.websocketAuthToken = "[REDACTED]"'),
-        (r'gmKey["\']?\s*[:=]\s*["\']([^"\']+)["\']', r'gmKey = "[REDACTED]"'),
-        (r'access_token["\']?\s*[:=]\s*["\']([^"\']+)["\']', r'access_token = "[REDACTED]"'),
-        (r'refresh_token["\']?\s*[:=]\s*["\']([^"\']+)["\']', r'refresh_token = "[REDACTED]"'),
-        (r'Authorization["\']?\s*[:=]\s*["\']Bearer\s+([^"\']+)["\']', r'Authorization = "Bearer [REDACTED]"'),
-        (r'DigifactoryBO=([^;,\s]+)', r'DigifactoryBO=[REDACTED]'),
-    ]
-    
-    result = text
-    for pattern, replacement in patterns:
-        result = re.sub(pattern, replacement, result, flags=re.IGNORECASE)
-    
-    return result
+    return _RE_REDACT.sub(_redact_match, text)
 
 
 def redact_dict(data: Dict[str, Any]) -> Dict[str, Any]:
-    """Recursively redact secrets from a dictionary."""
+    """Redact secrets from a dictionary, at any depth (returns a redacted copy)."""
     if not isinstance(data, dict):
         return data
-    
-    redacted = {}
-    for key, value in data.items():
-        # Skip gmKey entirely or mask it
-        if key.lower() in ('gmkey', 'gm_key', 'websocketauthtoken', 'access_token', 'refresh_token'):
-            redacted[key] = "[REDACTED]"
-        elif isinstance(value, dict):
-            redacted[key] = redact_dict(value)
-        elif isinstance(value, list):
-            redacted[key] = [redact_dict(item) if isinstance(item, dict) else redact_string(str(item)) if isinstance(item, str) else item for item in value]
-        elif isinstance(value, str):
-            redacted[key] = redact_string(value)
+    return _redact_tree(data)
+
+
+def _redact_tree(data: Any) -> Any:
+    """
+    Redacted copy of nested dicts / lists / strings, built with an explicit stack
+    (no recursion limit on deep payloads). Values of secret keys are masked whole.
+    """
+    stack: list = []
+    root = _redact_node(data, stack)
+    while stack:
+        source, target = stack.pop()
+        if isinstance(source, dict):
+            for key, value in source.items():
+                if isinstance(key, str) and key.lower() in _REDACTED_KEYS:
+                    target[key] = "[REDACTED]"
+                else:
+                    target[key] = _redact_node(value, stack)
         else:
-            redacted[key] = value
-    
-    # Special handling for nested config objects
-    if 'config' in redacted and isinstance(redacted['config'], dict):
-        if 'gmKey' in redacted['config']:
-            redacted['config']['gmKey'] = "[REDACTED]"
-    
-    return redacted
+            target.extend([_redact_node(item, stack) for item in source])
+    return root
 
 
-def redact_json(data: Any) -> Any:
-    """Redact secrets from JSON-serializable data."""
-    if isinstance(data, dict):
-        return redact_dict(data)
-    elif isinstance(data, list):
-        return [redact_json(item) for item in data]
-    elif isinstance(data, str):
-        return redact_string(data)
+def _redact_node(value: Any, stack: list) -> Any:
+    """Redacted strings as is; dicts / lists as empty copies queued on `stack` to be filled."""
+    if isinstance(value, str):
+        return redact_string(value)
+    if isinstance(value, dict):
+        copy: Any = {}
+    elif isinstance(value, list):
+        copy = []
     else:
+        return value
+    stack.append((value, copy))
+    return copy
+
+
+def _redact_tree_in_place(data: Any) -> Any:
+    """Like _redact_tree, but overwrites the values of the given dicts / lists instead of copying them."""
+    if isinstance(data, str):
+        return redact_string(data)
+    stack = [data] if isinstance(data, (dict, list)) else []
+    while stack:
+        container = stack.pop()
+        if isinstance(container, dict):
+            # Only values are reassigned: the dict size never changes while iterating
+            for key, value in container.items():
+                if isinstance(key, str) and key.lower() in _REDACTED_KEYS:
+                    container[key] = "[REDACTED]"
+                elif isinstance(value, str):
+                    container[key] = redact_string(value)
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
+        else:
+            for index, value in enumerate(container):
+                if isinstance(value, str):
+                    container[index] = redact_string(value)
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
+    return data
+
+
+def redact_json(data: Any, *, in_place: bool = False) -> Any:
+    """
+    Redact secrets from JSON-serializable data.
+    Containers without any secret marker anywhere are returned as is (not copied).
+    Callers that own `data` can pass `in_place=True` to redact it without
+    allocating a copy of the tree (the input is modified and returned).
+    """
+    if isinstance(data, (dict, list)) and (not data or not _may_contain_secret(data)):
         return data
+    if in_place:
+        return _redact_tree_in_place(data)
+    return _redact_tree(data)
+
+
+def _may_contain_secret(data: Any) -> bool:
+    """Cheap check on the serialized data: False only if no redacted key or pattern can match."""
+    try:
+        blob = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).lower()
+    except TypeError:
+        # Not serializable by orjson: let the walk decide
+        return True
+    return any(marker in blob for marker in _SECRET_MARKERS)
 
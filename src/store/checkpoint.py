@@ -0,0 +1,56 @@
+"""Atomic JSON checkpoint of completed nrs for a scrape range."""
+import logging
+import os
+from pathlib import Path
+
+import orjson
+
+from src.config import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_DIR = DATA_DIR / "checkpoints"
+
+
+def checkpoint_path_for(start: int, end: int) -> Path:
+    """Checkpoint file for a given range."""
+    return CHECKPOINT_DIR / f"{start}-{end}.json"
+
+
+class Checkpoint:
+    """
+    Set of nrs that reached a terminal state (ok / not_found), persisted to disk.
+    Saves write a .tmp file and os.replace() it, so a crash never leaves a torn file.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.completed: set[int] = set()
+        self._dirty = False
+
+    def load(self) -> set[int]:
+        """Load completed nrs from disk (empty if missing or unreadable)."""
+        if not self.path.exists():
+            return self.completed
+        try:
+            data = orjson.loads(self.path.read_bytes())
+            self.completed.update(int(nr) for nr in data.get("completed", []))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+        return self.completed
+
+    def add(self, nr: int) -> None:
+        """Record a completed nr (persisted on next save())."""
+        if nr not in self.completed:
+            self.completed.add(nr)
+            self._dirty = True
+
+    def save(self) -> None:
+        """Atomically write the checkpoint if it changed."""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_bytes(orjson.dumps({"completed": sorted(self.completed)}))
+        os.replace(tmp_path, self.path)
+        self._dirty = False
@@ -1,18 +1,37 @@
 """DEV mode storage: save outputs to data/dev/ for inspection."""
-import gzip
-import json
 import logging
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 import orjson
 
 from src.config import DATA_DIR
+from src.parse.html_parser import get_page_type
 from src.parse.redact import redact_json
 
 logger = logging.getLogger(__name__)
 
 DEV_DIR = DATA_DIR / "dev"
 
+# Shared pool for DEV file writes, created on first use
+_io_executor: ThreadPoolExecutor | None = None
+
+
+def _get_io_executor() -> ThreadPoolExecutor:
+    """Process-wide DEV storage write pool, created on first use."""
+    global _io_executor
+    if _io_executor is None:
+        _io_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="dev-io")
+    return _io_executor
+
+
+def _save_html_page(html_path: Path, html_content: str) -> None:
+    """Write one page gzipped (single compress call; level 1 is ~7x faster than the default 9)."""
+    # wbits=31 emits the gzip container from zlib directly: no separate CRC pass over the page
+    html_path.write_bytes(zlib.compress(html_content.encode("utf-8"), 1, wbits=31))
+    logger.debug(f"Saved HTML to {html_path}")
+
 
 class DevStorage:
     """Stores scraped data in DEV mode for inspection."""
@@ -34,7 +53,7 @@ class DevStorage:
         nr_dir = self.dev_dir / str(nr)
         nr_dir.mkdir(exist_ok=True)
 
-        # Save summary.json (redacted)
+        # Save summary.json (counts and status codes only: nothing to redact)
         summary = {
             "nr": nr,
             "gate_passed": gate_passed,
@@ -43,18 +62,14 @@ class DevStorage:
             "nb_basket_lines": len(extracted_data.get("basket_lines", [])),
             "nb_explorer_links": len(extracted_data.get("explorer_links", [])),
         }
-        summary = redact_json(summary)
         summary_path = nr_dir / "summary.json"
-        with open(summary_path, "w", encoding="utf-8") as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+        summary_path.write_bytes(orjson.dumps(summary, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         logger.info(f"Saved summary to {summary_path}")
 
-        # Save extracted.json (final data that would go to Supabase, redacted)
-        extracted_data_redacted = redact_json(extracted_data)
-        extracted_path = nr_dir / "extracted.json"
-        with open(extracted_path, "wb") as f:
-            f.write(orjson.dumps(extracted_data_redacted, option=orjson.OPT_INDENT_2))
-        logger.info(f"Saved extracted data to {extracted_path}")
+        # extracted.json and the HTML pages are independent files: write them concurrently
+        # (zlib compression and file writes release the GIL)
+        executor = _get_io_executor()
+        futures = [executor.submit(self._save_extracted, nr_dir, extracted_data)]
 
         # Save HTML pages (compressed) if requested
         if store_html and html_pages:
@@ -63,10 +78,19 @@ class DevStorage:
             for url, html_content in html_pages.items():
                 if html_content:
                     page_type = self._get_page_type_from_url(url)
-                    html_path = pages_dir / f"{page_type}.html.gz"
-                    with gzip.open(html_path, "wt", encoding="utf-8") as f:
-                        f.write(html_content)
-                    logger.debug(f"Saved HTML to {html_path}")
+                    futures.append(executor.submit(_save_html_page, pages_dir / f"{page_type}.html.gz", html_content))
+
+        # Wait for every write; re-raise the first failure like the serial version did
+        for future in futures:
+            future.result()
+
+    def _save_extracted(self, nr_dir: Path, extracted_data: dict[str, Any]) -> None:
+        """Save extracted.json (final data that would go to Supabase, redacted)."""
+        extracted_data_redacted = redact_json(extracted_data)
+        extracted_path = nr_dir / "extracted.json"
+        with open(extracted_path, "wb") as f:
+            f.write(orjson.dumps(extracted_data_redacted, option=orjson.OPT_INDENT_2))
+        logger.info(f"Saved extracted data to {extracted_path}")
 
     def _count_jsinfos(self, data: dict) -> int:
         """Count total JSinfos found."""
@@ -80,14 +104,5 @@ class DevStorage:
 
     def _get_page_type_from_url(self, url: str) -> str:
         """Extract page type from URL."""
-        if "viewLogistic" in url:
-            return "logistic"
-        elif "viewPayment" in url:
-            return "payment"
-        elif "viewInfos" in url:
-            return "infos"
-        elif "viewOrders" in url:
-            return "orders"
-        else:
-            return "view"
+        return get_page_type(url)
 
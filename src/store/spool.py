@@ -1,6 +1,7 @@
 """Disk spool for buffering records when Supabase is unavailable."""
-import json
+import asyncio
 import logging
+import os
 from pathlib import Path
 from typing import Iterator
 import aiofiles
@@ -27,8 +28,17 @@ class SpoolManager:
         """Write a record to spool file."""
         spool_file = self._get_spool_file(batch_id)
         async with aiofiles.open(spool_file, "ab") as f:
-            line = orjson.dumps(record.model_dump(mode="json")).decode() + "\n"
-            await f.write(line.encode())
+            await f.write(orjson.dumps(record.model_dump(mode="json"), option=orjson.OPT_APPEND_NEWLINE))
+
+    async def write_records(self, records: list[SaleRecord], batch_id: int) -> None:
+        """Write several records to a spool file with one open and one write."""
+        if not records:
+            return
+        payload = b"".join(
+            orjson.dumps(record.model_dump(mode="json"), option=orjson.OPT_APPEND_NEWLINE) for record in records
+        )
+        async with aiofiles.open(self._get_spool_file(batch_id), "ab") as f:
+            await f.write(payload)
 
     async def read_batch(self, batch_id: int) -> list[dict]:
         """Read all records from a spool file."""
@@ -36,15 +46,18 @@ class SpoolManager:
         if not spool_file.exists():
             return []
 
+        # One read in a worker thread instead of a thread hop per line
+        data = await asyncio.to_thread(spool_file.read_bytes)
         records = []
-        async with aiofiles.open(spool_file, "rb") as f:
-            async for line in f:
-                try:
-                    record = orjson.loads(line)
-                    records.append(record)
-                except Exception as e:
-                    logger.warning(f"Error reading spool line: {e}")
-                    continue
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = orjson.loads(line)
+                records.append(record)
+            except Exception as e:
+                logger.warning(f"Error reading spool line: {e}")
+                continue
 
         return records
 
@@ -58,3 +71,10 @@ class SpoolManager:
         """List all spool files."""
         return self.spool_dir.glob("batch_*.jsonl")
 
+    def iter_spool_entries(self) -> Iterator[os.DirEntry]:
+        """Spool files as os.DirEntry objects from a single directory scan."""
+        with os.scandir(self.spool_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith("batch_") and entry.name.endswith(".jsonl") and entry.is_file():
+                    yield entry
+
@@ -2,6 +2,7 @@
 import argparse
 import asyncio
 import logging
+import os
 from pathlib import Path
 
 from src.config import SPOOL_DIR
@@ -20,15 +21,15 @@ async def cleanup_spool(dry_run: bool = False, older_than_days: int = 7) -> None
     deleted = 0
     total_size = 0
     
-    for spool_file in spool.list_spool_files():
-        stat = spool_file.stat()
+    for entry in spool.iter_spool_entries():
+        stat = entry.stat()
         if stat.st_mtime < cutoff_time:
             size = stat.st_size
             if not dry_run:
-                spool_file.unlink()
-                logger.info(f"Deleted {spool_file.name} ({size} bytes)")
+                os.unlink(entry.path)
+                logger.info(f"Deleted {entry.name} ({size} bytes)")
             else:
-                logger.info(f"Would delete {spool_file.name} ({size} bytes)")
+                logger.info(f"Would delete {entry.name} ({size} bytes)")
             deleted += 1
             total_size += size
     
@@ -1,4 +1,5 @@
 """SQLite state database for tracking progress."""
+import asyncio
 import aiosqlite
 import logging
 from pathlib import Path
@@ -8,103 +9,195 @@ from src.config import STATE_DB
 
 logger = logging.getLogger(__name__)
 
+# Applied once when the shared connection opens: WAL with NORMAL sync (fsync at
+# checkpoints, not on every progress commit), 64 MB page cache, 256 MB mmap
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=30000",
+    "PRAGMA wal_autocheckpoint=1000",
+)
+
+# mark_* calls are coalesced and written in one transaction when this many are pending,
+# or after this delay (seconds), whichever comes first
+_MARK_BATCH_SIZE = 512
+_MARK_FLUSH_DELAY = 0.02
+
 
 class StateDB:
     """SQLite database for tracking scraping progress."""
 
     def __init__(self, db_path: Path = STATE_DB):
         self.db_path = db_path
+        # One long-lived connection shared by all calls (opened lazily, see close())
+        self._db: Optional[aiosqlite.Connection] = None
+        self._connect_lock = asyncio.Lock()
+        # Progress marks not written yet: nr -> (status, error); last mark wins, like INSERT OR REPLACE
+        self._pending: dict[int, tuple[str, Optional[str]]] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        # nrs with status 'ok' (written or pending), loaded by initialize(); None until then
+        self._done: Optional[set[int]] = None
+
+    async def _connection(self) -> aiosqlite.Connection:
+        """Shared connection, opened on first use."""
+        if self._db is None:
+            async with self._connect_lock:
+                if self._db is None:
+                    db = await aiosqlite.connect(self.db_path)
+                    for pragma in _CONNECTION_PRAGMAS:
+                        await db.execute(pragma)
+                    self._db = db
+        return self._db
+
+    async def flush(self) -> None:
+        """Write all pending progress marks in one transaction."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            rows = [(nr, status, error) for nr, (status, error) in pending.items()]
+            try:
+                db = await self._connection()
+                await db.executemany(
+                    """
+                    INSERT OR REPLACE INTO scrape_progress (nr, status, fetched_at, error)
+                    VALUES (?, ?, datetime('now'), ?)
+                    """,
+                    rows,
+                )
+                await db.commit()
+            except Exception:
+                # Keep the marks for the next flush (newer marks for the same nr win)
+                for nr, mark in pending.items():
+                    self._pending.setdefault(nr, mark)
+                raise
+
+    async def _flush_later(self) -> None:
+        """Background flush after the coalescing delay."""
+        await asyncio.sleep(_MARK_FLUSH_DELAY)
+        self._flush_task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Error writing progress marks: {e}")
+
+    async def _mark(self, nr: int, status: str, error: Optional[str] = None) -> None:
+        """Queue a progress mark; written by the next flush."""
+        self._pending[nr] = (status, error)
+        if self._done is not None:
+            if status == "ok":
+                self._done.add(nr)
+            else:
+                self._done.discard(nr)
+        if len(self._pending) >= _MARK_BATCH_SIZE:
+            await self.flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def close(self) -> None:
+        """
+        Write pending marks and close the shared connection
+        (its worker thread would otherwise keep the process alive).
+        """
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+        if self._db is not None:
+            db, self._db = self._db, None
+            # Refresh planner statistics if the table changed a lot (cheap no-op otherwise)
+            await db.execute("PRAGMA optimize")
+            await db.close()
 
     async def initialize(self) -> None:
         """Create tables if they don't exist."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                """
-                CREATE TABLE IF NOT EXISTS scrape_progress (
-                    nr INTEGER PRIMARY KEY,
-                    status TEXT NOT NULL,
-                    fetched_at TIMESTAMP,
-                    error TEXT
-                )
-                """
-            )
-            await db.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_status ON scrape_progress(status)
-                """
+        db = await self._connection()
+        await db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS scrape_progress (
+                nr INTEGER PRIMARY KEY,
+                status TEXT NOT NULL,
+                fetched_at TIMESTAMP,
+                error TEXT
             )
-            await db.commit()
-            logger.info(f"State database initialized at {self.db_path}")
+            """
+        )
+        # nr is the rowid, so this index is effectively (status, nr): it covers the
+        # status='ok' range scans and the GROUP BY status without touching table rows
+        await db.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_status ON scrape_progress(status)
+            """
+        )
+        await db.commit()
+        if self._done is None:
+            rows = await db.execute_fetchall("SELECT nr FROM scrape_progress WHERE status = 'ok'")
+            self._done = {nr for (nr,) in rows}
+            self._done.update(nr for nr, (status, _) in self._pending.items() if status == "ok")
+        logger.info(f"State database initialized at {self.db_path}")
 
     async def is_done(self, nr: int) -> bool:
         """Check if nr has been successfully processed."""
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
-                "SELECT status FROM scrape_progress WHERE nr = ? AND status = 'ok'",
-                (nr,),
-            )
-            row = await cursor.fetchone()
-            return row is not None
+        if self._done is not None:
+            # In-memory set kept in step with every mark: no SQLite round-trip
+            return nr in self._done
+        mark = self._pending.get(nr)
+        if mark is not None:
+            return mark[0] == "ok"
+        db = await self._connection()
+        rows = await db.execute_fetchall(
+            "SELECT status FROM scrape_progress WHERE nr = ? AND status = 'ok'",
+            (nr,),
+        )
+        return bool(rows)
 
     async def mark_done(self, nr: int) -> None:
         """Mark nr as successfully processed."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                """
-                INSERT OR REPLACE INTO scrape_progress (nr, status, fetched_at)
-                VALUES (?, 'ok', datetime('now'))
-                """,
-                (nr,),
-            )
-            await db.commit()
+        await self._mark(nr, "ok")
 
     async def mark_failed(self, nr: int, error: str) -> None:
         """Mark nr as failed."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                """
-                INSERT OR REPLACE INTO scrape_progress (nr, status, fetched_at, error)
-                VALUES (?, 'failed', datetime('now'), ?)
-                """,
-                (nr, error[:500]),  # Limit error length
-            )
-            await db.commit()
+        await self._mark(nr, "failed", error[:500])  # Limit error length
 
     async def mark_not_found(self, nr: int) -> None:
         """Mark nr as not found."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                """
-                INSERT OR REPLACE INTO scrape_progress (nr, status, fetched_at)
-                VALUES (?, 'not_found', datetime('now'))
-                """,
-                (nr,),
-            )
-            await db.commit()
+        await self._mark(nr, "not_found")
 
     async def get_next_undone(self, start: int, end: int) -> list[int]:
         """Get list of nr that haven't been processed yet."""
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
-                """
-                SELECT nr FROM scrape_progress
-                WHERE nr >= ? AND nr <= ? AND status = 'ok'
-                """,
-                (start, end),
-            )
-            done_nrs = {row[0] for row in await cursor.fetchall()}
-            all_nrs = set(range(start, end + 1))
-            return sorted(all_nrs - done_nrs)
+        await self.flush()
+        db = await self._connection()
+        rows = await db.execute_fetchall(
+            """
+            SELECT nr FROM scrape_progress
+            WHERE nr >= ? AND nr <= ? AND status = 'ok'
+            ORDER BY nr
+            """,
+            (start, end),
+        )
+        # Merge-walk the sorted done nrs against the range: the gaps are the undone nrs
+        undone: list[int] = []
+        next_nr = start
+        for (done_nr,) in rows:
+            undone.extend(range(next_nr, done_nr))
+            next_nr = done_nr + 1
+        undone.extend(range(next_nr, end + 1))
+        return undone
 
     async def get_stats(self) -> dict:
         """Get statistics about progress."""
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
-                """
-                SELECT status, COUNT(*) FROM scrape_progress
-                GROUP BY status
-                """
-            )
-            stats = {row[0]: row[1] for row in await cursor.fetchall()}
-            return stats
+        await self.flush()
+        db = await self._connection()
+        rows = await db.execute_fetchall(
+            """
+            SELECT status, COUNT(*) FROM scrape_progress
+            GROUP BY status
+            """
+        )
+        stats = {row[0]: row[1] for row in rows}
+        return stats
 
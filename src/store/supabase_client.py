@@ -0,0 +1,25 @@
+"""Supabase client factory sharing one pooled HTTP/2 connection across requests."""
+import httpx
+from supabase import create_client, Client
+from supabase.lib.client_options import SyncClientOptions
+
+from src.config import config
+
+# PostgREST calls are short and frequent: keep connections open between upserts
+# so each write skips the TCP/TLS handshake
+_HTTP_LIMITS = httpx.Limits(
+    max_connections=32,
+    max_keepalive_connections=32,
+    keepalive_expiry=60,
+)
+_HTTP_TIMEOUT = 30.0
+
+
+def create_supabase_client() -> Client:
+    """Create a Supabase client backed by a keep-alive httpx.Client (HTTP/2)."""
+    http_client = httpx.Client(http2=True, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+    return create_client(
+        config.SUPABASE_URL,
+        config.SUPABASE_SERVICE_ROLE,
+        options=SyncClientOptions(httpx_client=http_client),
+    )
@@ -1,12 +1,15 @@
 """Supabase writer with batch upsert and retries."""
 import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
-from supabase import create_client, Client
+from postgrest.types import ReturningMethod
+from supabase import Client
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 from src.config import config
 from src.parse.models import SaleRecord
+from src.store.supabase_client import create_supabase_client
 
 logger = logging.getLogger(__name__)
 
@@ -17,9 +20,10 @@ class SupabaseWriter:
     def __init__(self):
         if not config.SUPABASE_URL or not config.SUPABASE_SERVICE_ROLE:
             raise ValueError("Supabase configuration missing")
-        self.client: Client = create_client(
-            config.SUPABASE_URL, config.SUPABASE_SERVICE_ROLE
-        )
+        # One pooled client for every call (upserts, connection test)
+        self.client: Client = create_supabase_client()
+        # Dedicated pool: blocking PostgREST calls never queue behind the loop's default executor
+        self._executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="supabase")
         self.table = config.SUPABASE_TABLE
 
     async def upsert_batch(self, records: list[SaleRecord]) -> None:
@@ -34,7 +38,7 @@ class SupabaseWriter:
         loop = asyncio.get_event_loop()
         try:
             response = await loop.run_in_executor(
-                None, self._upsert_sync, data
+                self._executor, self._upsert_sync, data
             )
             logger.info(f"Upserted {len(records)} records to Supabase")
         except Exception as e:
@@ -50,7 +54,7 @@ class SupabaseWriter:
         """Synchronous upsert (called from thread pool)."""
         (
             self.client.table(self.table)
-            .upsert(data, on_conflict="nr")
+            .upsert(data, on_conflict="nr", returning=ReturningMethod.minimal)
             .execute()
         )
 
@@ -65,16 +69,20 @@ class SupabaseWriter:
             "hash": record.hash,
         }
 
+    async def close(self) -> None:
+        """Wait for in-flight Supabase calls and stop the writer's thread pool."""
+        self._executor.shutdown(wait=True)
+
     async def test_connection(self) -> bool:
-        """Test Supabase connection."""
+        """Test Supabase connection (also opens the pooled connection reused by later writes)."""
         try:
             # Run sync query in thread pool
             loop = asyncio.get_event_loop()
             await loop.run_in_executor(
-                None,
+                self._executor,
                 lambda: (
                     self.client.table(self.table)
-                    .select("nr", count="exact")
+                    .select("nr")
                     .limit(1)
                     .execute()
                 ),
@@ -1,31 +1,49 @@
 """Supabase writer for 2-table schema (cto_runs + cto_pages)."""
 import asyncio
 import base64
-import gzip
 import logging
+import traceback
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
-from supabase import create_client, Client
+from postgrest.types import CountMethod, ReturningMethod
+from supabase import Client
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 from src.config import config
 from src.parse.models import SaleRecord
 from src.parse.redact import redact_json
+from src.store.supabase_client import create_supabase_client
 
 logger = logging.getLogger(__name__)
 
 
+def _is_missing_function_error(error: Exception) -> bool:
+    """True if PostgREST reports the RPC function as unknown (PGRST202 / undefined_function)."""
+    message = str(error)
+    return "PGRST202" in message or "42883" in message or "Could not find the function" in message
+
+
 class SupabaseWriterV2:
     """Writes records to Supabase using 2-table schema."""
 
     def __init__(self):
         if not config.SUPABASE_URL or not config.SUPABASE_SERVICE_ROLE:
             raise ValueError("Supabase configuration missing")
-        self.client: Client = create_client(
-            config.SUPABASE_URL, config.SUPABASE_SERVICE_ROLE
-        )
+        # One pooled client for every call (upserts, error logs, connection test)
+        self.client: Client = create_supabase_client()
+        # Dedicated pool: blocking PostgREST calls never queue behind the loop's default executor
+        self._executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="supabase")
         self.runs_table = "cto_runs"
         self.pages_table = "cto_pages"
         self.errors_table = "cto_errors"
+        # SQL functions from migration_upsert_run_and_pages.sql (one round-trip per record / per batch);
+        # switched off for the process once the database reports them missing
+        self.upsert_rpc = "upsert_run_and_pages"
+        self.upsert_batch_rpc = "upsert_runs_and_pages"
+        self._rpc_available = True
+        # cto_errors inserts started without awaiting them (awaited by close())
+        self._pending_errors: set[asyncio.Task] = set()
 
     async def upsert_run_and_pages(
         self,
@@ -34,6 +52,89 @@ class SupabaseWriterV2:
         max_html_bytes: Optional[int] = None,
     ) -> None:
         """Upsert run and pages to Supabase."""
+        run_data, pages_data = self._prepare_run_and_pages(run_id, record, max_html_bytes)
+        gate_passed = run_data.get("gate_passed", False)
+
+        # Upsert in transaction-like manner
+        loop = asyncio.get_event_loop()
+        try:
+            await loop.run_in_executor(
+                self._executor, self._upsert_sync, run_data, pages_data
+            )
+            if gate_passed and len(pages_data) == 0:
+                logger.warning(
+                    f"[SUPABASE_WRITE] Upserted run {run_id} (nr={record.nr}) with gate_passed=True but 0 pages!"
+                )
+            elif gate_passed:
+                page_types = [p.get("page_type") for p in pages_data]
+                logger.info(
+                    f"[SUPABASE_WRITE] Successfully upserted run {run_id} (nr={record.nr}) "
+                    f"with {len(pages_data)} pages: {page_types}"
+                )
+            else:
+                logger.debug(f"[SUPABASE_WRITE] Upserted run {run_id} (nr={record.nr}) with gate_passed=False (no pages)")
+        except Exception as e:
+            logger.error(f"Supabase upsert error for run {run_id} (nr={record.nr}): {e}", exc_info=True)
+            # Log error to errors table in the background: re-raise without waiting for the insert
+            task = asyncio.create_task(
+                self.log_error(
+                    run_id=run_id,
+                    error_type="supabase_error",
+                    error_message=str(e)[:500],
+                    error_details={
+                        "nr": record.nr,
+                        "gate_passed": record.data.get("gate_passed"),
+                        "pages_count": len(pages_data),
+                        # Captured here: the task runs after this except block has exited
+                        "traceback": traceback.format_exc(),
+                    },
+                    nr=record.nr,
+                )
+            )
+            self._pending_errors.add(task)
+            task.add_done_callback(self._pending_errors.discard)
+            raise
+
+    async def upsert_runs_and_pages_batch(
+        self,
+        run_id: str,
+        records: list[SaleRecord],
+        max_html_bytes: Optional[int] = None,
+    ) -> None:
+        """
+        Upsert several runs and their pages in one RPC (three bulk requests without it).
+        Raises on failure without logging to cto_errors: callers fall back to
+        upsert_run_and_pages() per record, which does.
+        """
+        from datetime import datetime
+
+        finished_at = datetime.utcnow().isoformat()
+        runs_data: list[dict] = []
+        pages_data: list[dict] = []
+        for record in records:
+            run_data, record_pages = self._prepare_run_and_pages(run_id, record, max_html_bytes, finished_at)
+            runs_data.append(run_data)
+            pages_data.extend(record_pages)
+
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(
+            self._executor, self._upsert_batch_sync, runs_data, pages_data
+        )
+        logger.info(
+            f"[SUPABASE_WRITE] Bulk-upserted {len(runs_data)} runs with {len(pages_data)} pages (run_id={run_id})"
+        )
+
+    def _prepare_run_and_pages(
+        self,
+        run_id: str,
+        record: SaleRecord,
+        max_html_bytes: Optional[int] = None,
+        finished_at: Optional[str] = None,
+    ) -> tuple[dict, list[dict]]:
+        """
+        Build the redacted cto_runs row and cto_pages rows for one record
+        (`finished_at` defaults to now; batches pass one timestamp for all records).
+        """
         from datetime import datetime
         
         # Prepare run data (redacted)
@@ -45,11 +146,11 @@ class SupabaseWriterV2:
             "gate_reason": record.data.get("gate_reason"),  # Fixed: was "reason", should be "gate_reason"
             "status": record.status,
             "started_at": record.fetched_at.isoformat(),
-            "finished_at": datetime.utcnow().isoformat(),
+            "finished_at": finished_at or datetime.utcnow().isoformat(),
             "error": record.data.get("error"),
             "metrics": record.data.get("metrics"),
         }
-        run_data = redact_json(run_data)
+        run_data = redact_json(run_data, in_place=True)
 
         # Prepare pages data
         pages_data = []
@@ -84,14 +185,16 @@ class SupabaseWriterV2:
             # Extract HTML if available and within limits
             raw_html_gz_b64 = None
             html_content = page_info.get("_html_content")  # Stored temporarily
-            if html_content and max_html_bytes:
-                html_bytes = len(html_content.encode("utf-8"))
-                if html_bytes <= max_html_bytes:
-                    # Compress and encode
-                    compressed = gzip.compress(html_content.encode("utf-8"))
-                    raw_html_gz_b64 = base64.b64encode(compressed).decode("utf-8")
-                # Remove from page_info before storing
-                page_info = {k: v for k, v in page_info.items() if k != "_html_content"}
+            # UTF-8 needs at least one byte per character: longer pages cannot fit, skip encoding them
+            if html_content and max_html_bytes and len(html_content) <= max_html_bytes:
+                html_bytes = html_content.encode("utf-8")
+                if len(html_bytes) <= max_html_bytes:
+                    # Gzip (level 1: several times faster than the default 9) and encode;
+                    # wbits=31 writes the gzip container in the same pass as the deflate
+                    compressed = zlib.compress(html_bytes, 1, wbits=31)
+                    raw_html_gz_b64 = base64.b64encode(compressed).decode("ascii")
+            # _html_content stays in page_info (a per-record retry needs it again):
+            # page_data below picks its fields explicitly, so it is never stored
             
             # Extract and redact only the "extracted" field, keep other fields intact
             extracted_raw = page_info.get("extracted", {})
@@ -111,39 +214,7 @@ class SupabaseWriterV2:
             }
             pages_data.append(page_data)
 
-        # Upsert in transaction-like manner
-        loop = asyncio.get_event_loop()
-        try:
-            await loop.run_in_executor(
-                None, self._upsert_sync, run_data, pages_data
-            )
-            if gate_passed and len(pages_data) == 0:
-                logger.warning(
-                    f"[SUPABASE_WRITE] Upserted run {run_id} (nr={record.nr}) with gate_passed=True but 0 pages!"
-                )
-            elif gate_passed:
-                page_types = [p.get("page_type") for p in pages_data]
-                logger.info(
-                    f"[SUPABASE_WRITE] Successfully upserted run {run_id} (nr={record.nr}) "
-                    f"with {len(pages_data)} pages: {page_types}"
-                )
-            else:
-                logger.debug(f"[SUPABASE_WRITE] Upserted run {run_id} (nr={record.nr}) with gate_passed=False (no pages)")
-        except Exception as e:
-            logger.error(f"Supabase upsert error for run {run_id} (nr={record.nr}): {e}", exc_info=True)
-            # Log error to errors table
-            await self.log_error(
-                run_id=run_id,
-                error_type="supabase_error",
-                error_message=str(e)[:500],
-                error_details={
-                    "nr": record.nr,
-                    "gate_passed": record.data.get("gate_passed"),
-                    "pages_count": len(pages_data),
-                },
-                nr=record.nr,
-            )
-            raise
+        return run_data, pages_data
 
     @retry(
         stop=stop_after_attempt(3),
@@ -151,7 +222,28 @@ class SupabaseWriterV2:
         retry=retry_if_exception_type((Exception,)),
     )
     def _upsert_sync(self, run_data: dict, pages_data: list[dict]) -> None:
-        """Synchronous upsert (called from thread pool)."""
+        """Synchronous upsert (called from thread pool): one RPC, or the REST fallback."""
+        if self._rpc_available:
+            try:
+                self.client.rpc(self.upsert_rpc, {"run": run_data, "pages": pages_data}).execute()
+            except Exception as e:
+                if _is_missing_function_error(e):
+                    self._rpc_available = False
+                    logger.warning(
+                        f"[SUPABASE_WRITE] Function {self.upsert_rpc} not found, using 3 requests per record. "
+                        f"Run migration_upsert_run_and_pages.sql to enable single-request writes."
+                    )
+                else:
+                    # The function runs in one transaction: nothing was written, retry over REST
+                    logger.warning(f"[SUPABASE_WRITE] {self.upsert_rpc} failed for nr={run_data.get('nr')}, falling back: {e}")
+            else:
+                if run_data.get("gate_passed", False) and not pages_data:
+                    logger.warning(f"Run nr={run_data.get('nr')} run_id={run_data.get('run_id')} has gate_passed=True but 0 pages to insert!")
+                return
+        self._upsert_rest_sync(run_data, pages_data)
+
+    def _upsert_rest_sync(self, run_data: dict, pages_data: list[dict]) -> None:
+        """Delete old pages, upsert the run, insert the pages (three PostgREST requests)."""
         nr = run_data.get("nr")
         run_id = run_data.get("run_id")
         gate_passed = run_data.get("gate_passed", False)
@@ -164,12 +256,12 @@ class SupabaseWriterV2:
             # This ensures each nr only has its own pages
             delete_response = (
                 self.client.table(self.pages_table)
-                .delete()
+                .delete(count=CountMethod.exact, returning=ReturningMethod.minimal)
                 .eq("nr", nr)
                 .execute()
             )
-            # Supabase delete returns the deleted rows in response.data
-            deleted_count = len(delete_response.data) if delete_response.data else 0
+            # Only the count comes back (return=minimal), not the deleted rows with their HTML
+            deleted_count = delete_response.count or 0
             if deleted_count > 0:
                 logger.info(
                     f"[SUPABASE_WRITE] Deleted {deleted_count} existing pages for nr={nr} "
@@ -187,7 +279,7 @@ class SupabaseWriterV2:
         try:
             (
                 self.client.table(self.runs_table)
-                .upsert(run_data, on_conflict="nr")
+                .upsert(run_data, on_conflict="nr", returning=ReturningMethod.minimal)
                 .execute()
             )
         except Exception as e:
@@ -206,7 +298,7 @@ class SupabaseWriterV2:
                 # Try batch insert first
                 (
                     self.client.table(self.pages_table)
-                    .insert(pages_data)  # Insert all pages in one operation
+                    .insert(pages_data, returning=ReturningMethod.minimal)  # Insert all pages in one operation
                     .execute()
                 )
                 logger.debug(
@@ -226,7 +318,7 @@ class SupabaseWriterV2:
                     try:
                         (
                             self.client.table(self.pages_table)
-                            .upsert(pages_data, on_conflict="nr,page_type")
+                            .upsert(pages_data, on_conflict="nr,page_type", returning=ReturningMethod.minimal)
                             .execute()
                         )
                         logger.info(
@@ -238,23 +330,7 @@ class SupabaseWriterV2:
                             f"[SUPABASE_WRITE] Upsert also failed, trying one by one: {e2}",
                             exc_info=True
                         )
-                        successful_pages = 0
-                        failed_pages = 0
-                        for page_data in pages_data:
-                            try:
-                                (
-                                    self.client.table(self.pages_table)
-                                    .upsert(page_data, on_conflict="nr,page_type")
-                                    .execute()
-                                )
-                                successful_pages += 1
-                            except Exception as e3:
-                                failed_pages += 1
-                                logger.error(
-                                    f"[SUPABASE_WRITE] Failed to upsert page page_type={page_data.get('page_type')} "
-                                    f"nr={page_data.get('nr')}: {e3}",
-                                    exc_info=True
-                                )
+                        successful_pages, failed_pages = self._write_pages_one_by_one(pages_data, upsert=True)
                         
                         if failed_pages > 0:
                             raise RuntimeError(
@@ -267,23 +343,7 @@ class SupabaseWriterV2:
                         f"[SUPABASE_WRITE] Batch insert failed for nr={nr}, trying one by one: {e}",
                         exc_info=True
                     )
-                    successful_pages = 0
-                    failed_pages = 0
-                    for page_data in pages_data:
-                        try:
-                            (
-                                self.client.table(self.pages_table)
-                                .insert(page_data)
-                                .execute()
-                            )
-                            successful_pages += 1
-                        except Exception as e2:
-                            failed_pages += 1
-                            logger.error(
-                                f"[SUPABASE_WRITE] Failed to insert page run_id={page_data.get('run_id')} "
-                                f"page_type={page_data.get('page_type')} nr={page_data.get('nr')}: {e2}",
-                                exc_info=True
-                            )
+                    successful_pages, failed_pages = self._write_pages_one_by_one(pages_data, upsert=False)
                     
                     if failed_pages > 0:
                         raise RuntimeError(
@@ -305,6 +365,72 @@ class SupabaseWriterV2:
                     f"for run_id={run_id} nr={nr}: {page_types_written}"
                 )
 
+    def _write_pages_one_by_one(self, pages_data: list[dict], upsert: bool) -> tuple[int, int]:
+        """
+        Write each page with its own request, all in parallel (last-resort fallback).
+        Returns (successful, failed) counts; failures are logged per page.
+        """
+        def write_page(page_data: dict) -> bool:
+            query = self.client.table(self.pages_table)
+            try:
+                if upsert:
+                    query.upsert(page_data, on_conflict="nr,page_type", returning=ReturningMethod.minimal).execute()
+                else:
+                    query.insert(page_data, returning=ReturningMethod.minimal).execute()
+                return True
+            except Exception as e:
+                logger.error(
+                    f"[SUPABASE_WRITE] Failed to {'upsert' if upsert else 'insert'} page run_id={page_data.get('run_id')} "
+                    f"page_type={page_data.get('page_type')} nr={page_data.get('nr')}: {e}",
+                    exc_info=True
+                )
+                return False
+
+        # Own short-lived pool: this already runs on self._executor, and waiting there on
+        # tasks queued to the same pool could deadlock when every worker does it
+        with ThreadPoolExecutor(max_workers=len(pages_data), thread_name_prefix="supabase-page") as pool:
+            results = list(pool.map(write_page, pages_data))
+        successful = sum(results)
+        return successful, len(results) - successful
+
+    def _upsert_batch_sync(self, runs_data: list[dict], pages_data: list[dict]) -> None:
+        """Synchronous bulk write (called from thread pool): one RPC, or the REST fallback."""
+        if self._rpc_available:
+            try:
+                self.client.rpc(self.upsert_batch_rpc, {"runs": runs_data, "pages": pages_data}).execute()
+                return
+            except Exception as e:
+                if not _is_missing_function_error(e):
+                    raise
+                self._rpc_available = False
+                logger.warning(
+                    f"[SUPABASE_WRITE] Function {self.upsert_batch_rpc} not found, using 3 requests per batch. "
+                    f"Run migration_upsert_run_and_pages.sql to enable single-request writes."
+                )
+        self._upsert_batch_rest_sync(runs_data, pages_data)
+
+    def _upsert_batch_rest_sync(self, runs_data: list[dict], pages_data: list[dict]) -> None:
+        """Delete old pages, upsert the runs, insert the pages (three PostgREST requests)."""
+        nrs = [run_data["nr"] for run_data in runs_data]
+        # Same order as _upsert_rest_sync; return=minimal skips echoing the rows back
+        (
+            self.client.table(self.pages_table)
+            .delete(returning=ReturningMethod.minimal)
+            .in_("nr", nrs)
+            .execute()
+        )
+        (
+            self.client.table(self.runs_table)
+            .upsert(runs_data, on_conflict="nr", returning=ReturningMethod.minimal)
+            .execute()
+        )
+        if pages_data:
+            (
+                self.client.table(self.pages_table)
+                .insert(pages_data, returning=ReturningMethod.minimal)
+                .execute()
+            )
+
     async def log_error(
         self,
         run_id: str,
@@ -342,7 +468,7 @@ class SupabaseWriterV2:
         loop = asyncio.get_event_loop()
         try:
             await loop.run_in_executor(
-                None, self._insert_error_sync, error_data
+                self._executor, self._insert_error_sync, error_data
             )
         except Exception as e:
             # Don't fail the main process if error logging fails
@@ -353,22 +479,29 @@ class SupabaseWriterV2:
         try:
             (
                 self.client.table(self.errors_table)
-                .insert(error_data)
+                .insert(error_data, returning=ReturningMethod.minimal)
                 .execute()
             )
         except Exception as e:
             # Log but don't raise - error logging should never break the main flow
             logger.warning(f"Failed to insert error log: {e}")
 
+    async def close(self) -> None:
+        """Wait for in-flight Supabase calls (including background error logs) and stop the writer's thread pool."""
+        if self._pending_errors:
+            # log_error never raises
+            await asyncio.gather(*self._pending_errors)
+        self._executor.shutdown(wait=True)
+
     async def test_connection(self) -> bool:
-        """Test Supabase connection."""
+        """Test Supabase connection (also opens the pooled connection reused by later writes)."""
         try:
             loop = asyncio.get_event_loop()
             await loop.run_in_executor(
-                None,
+                self._executor,
                 lambda: (
                     self.client.table(self.runs_table)
-                    .select("nr", count="exact")
+                    .select("nr")
                     .limit(1)
                     .execute()
                 ),
@@ -67,3 +67,34 @@ def test_extract_basket_lines_normalizes_fields():
     assert result[0].get("name") == "Product" or result[0].get("nom") == "Product"
     assert result[0].get("ref") == "REF1" or result[0].get("reference") == "REF1"
 
+
+def test_extract_basket_lines_nested():
+    """Test that nested arrays/objects and brackets inside strings are kept whole."""
+    html = """
+    <script>
+    jBasketComposer({"items": [
+        {"name": "Pack [A]", "ref": "P1", "price": 10, "qtty": 1, "options": [{"code": "x"}]},
+        {"name": "Pack }B{", "ref": "P2", "price": 20, "qtty": 3}
+    ]});
+    </script>
+    """
+    result = extract_basket_lines(html)
+
+    assert len(result) == 2
+    assert result[0]["name"] == "Pack [A]"
+    assert result[1]["name"] == "Pack }B{"
+    assert result[1]["qtty"] == 3
+
+
+def test_extract_basket_lines_alias_priority():
+    """Test that the standard key wins over its aliases and aliases are kept."""
+    html = """
+    <script>
+    jBasketComposer([{"nom": "Alias", "name": "Standard", "total_ttc": 12, "total_ht": 10}]);
+    </script>
+    """
+    result = extract_basket_lines(html)
+
+    assert result[0]["name"] == "Standard"
+    assert result[0]["nom"] == "Alias"
+    assert result[0]["total"] == 10
@@ -47,3 +47,20 @@ def test_extract_basket_totals():
     assert "total_ht" in totals or "total_ttc" in totals
     assert totals.get("currency") == "EUR"
 
+
+def test_extract_basket_totals_from_lines():
+    """Test that total HT is summed from basket lines when the page has no total."""
+    html = """
+    <script>
+    new jBasketComposer({"lines": [
+        {"name": "A", "price": 0.1, "qtty": 3},
+        {"name": "B", "price": 0.2, "qtty": 1},
+        {"name": "C", "price": 5}
+    ]});
+    </script>
+    """
+    result = extract_basket_data(html)
+
+    assert len(result["basket_lines"]) == 3
+    assert result["basket_totals"]["total_ht"] == 0.5
+    assert result["basket_totals"]["currency"] == "EUR"
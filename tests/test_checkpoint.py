@@ -0,0 +1,25 @@
+"""Tests for the scrape range checkpoint."""
+import pytest
+from src.store.checkpoint import Checkpoint
+
+
+def test_checkpoint_roundtrip(tmp_path):
+    """Test that saved nrs are loaded back and no temp file is left."""
+    path = tmp_path / "checkpoints" / "1-10.json"
+    checkpoint = Checkpoint(path)
+    checkpoint.add(3)
+    checkpoint.add(1)
+    checkpoint.save()
+
+    assert path.exists()
+    assert not path.with_suffix(".json.tmp").exists()
+    assert Checkpoint(path).load() == {1, 3}
+
+
+def test_checkpoint_missing_or_corrupt(tmp_path):
+    """Test that a missing or unreadable checkpoint loads as empty."""
+    path = tmp_path / "1-10.json"
+    assert Checkpoint(path).load() == set()
+
+    path.write_text("{not json")
+    assert Checkpoint(path).load() == set()
@@ -0,0 +1,47 @@
+"""Tests for DEV mode storage."""
+import json
+import pytest
+from src.store import dev_storage
+from src.store.dev_storage import DevStorage
+
+
+def test_summary_holds_only_counts_and_status(tmp_path, monkeypatch):
+    """Test that summary.json (written unredacted) never carries extracted values."""
+    monkeypatch.setattr(dev_storage, "DEV_DIR", tmp_path)
+    extracted = {
+        "jsinfos": {"view": {"jsinfos_0": {"gmKey": "secret-key"}}},
+        "basket_lines": [{"name": "Location"}],
+        "access_token": "secret-token",
+    }
+    DevStorage().save_nr_data(
+        nr=5,
+        gate_passed=True,
+        urls_status={"https://example.com/view?nr=5": 200},
+        extracted_data=extracted,
+    )
+
+    summary = json.loads((tmp_path / "5" / "summary.json").read_text(encoding="utf-8"))
+    assert set(summary) == {"nr", "gate_passed", "urls_status", "nb_jsinfos", "nb_basket_lines", "nb_explorer_links"}
+    assert summary["nb_jsinfos"] == 1
+    assert "secret" not in json.dumps(summary)
+    assert "secret" not in (tmp_path / "5" / "extracted.json").read_text(encoding="utf-8")
+
+
+def test_html_pages_saved_gzipped(tmp_path, monkeypatch):
+    """Test that stored HTML pages decompress back to the original text."""
+    import gzip
+
+    monkeypatch.setattr(dev_storage, "DEV_DIR", tmp_path)
+    html = "<html><body>Location de véhicule</body></html>"
+    DevStorage().save_nr_data(
+        nr=6,
+        gate_passed=True,
+        urls_status={},
+        extracted_data={},
+        html_pages={"https://example.com/viewPayment?nr=6": html, "https://example.com/view?nr=6": None},
+        store_html=True,
+    )
+
+    pages_dir = tmp_path / "6" / "pages"
+    assert [p.name for p in pages_dir.iterdir()] == ["payment.html.gz"]
+    assert gzip.decompress((pages_dir / "payment.html.gz").read_bytes()).decode("utf-8") == html
@@ -0,0 +1,116 @@
+"""Tests for explorer links extraction."""
+import pytest
+from src.parse.explorer import extract_explorer_links
+
+
+BASE_URL = "https://example.com/digi/com/cto/view?nr=1"
+
+
+def test_extract_href_links():
+    """Test extraction of <a href> links."""
+    html = """
+    <a href="/digi/com/cto/viewPayment?nr=1">Paiement</a>
+    <a href="https://other.com/page">Other</a>
+    <a href="#top">Top</a>
+    <a href="javascript:void(0)">JS</a>
+    """
+    result = extract_explorer_links(html, BASE_URL)
+
+    assert "https://example.com/digi/com/cto/viewPayment?nr=1" in result
+    assert "https://other.com/page" in result
+    assert len(result) == 2
+
+
+def test_extract_jsinfos_links():
+    """Test extraction of url from jsinfos attributes."""
+    html = """
+    <div jsinfos="url:'/digi/com/ct/view?nr=5'"></div>
+    <div jsinfos="{url:'/digi/com/biz/view?nr=6', xact:'open'}"></div>
+    """
+    result = extract_explorer_links(html, BASE_URL)
+
+    assert "https://example.com/digi/com/ct/view?nr=5" in result
+    assert "https://example.com/digi/com/biz/view?nr=6" in result
+
+
+def test_extract_data_attribute_links():
+    """Test extraction of data-url / data-href attributes."""
+    html = """
+    <div data-url="/digi/mod-ep/vehicles/view?nr=7"></div>
+    <span data-href="/digi/com/cto/viewInfos?nr=1"></span>
+    """
+    result = extract_explorer_links(html, BASE_URL)
+
+    assert "https://example.com/digi/mod-ep/vehicles/view?nr=7" in result
+    assert "https://example.com/digi/com/cto/viewInfos?nr=1" in result
+
+
+def test_extract_deduplicates():
+    """Test that the same link found through several attributes is returned once."""
+    html = """
+    <a href="/digi/com/ct/view?nr=5" jsinfos="url:'/digi/com/ct/view?nr=5'">Contact</a>
+    <a href="/digi/com/ct/view?nr=5">Contact</a>
+    """
+    result = extract_explorer_links(html, BASE_URL)
+
+    assert result == ["https://example.com/digi/com/ct/view?nr=5"]
+
+
+def test_extract_empty_html():
+    """Test empty HTML."""
+    assert extract_explorer_links("", BASE_URL) == []
+
+
+def test_extract_preserves_document_order():
+    """Test that links come back in document order unless sort is requested."""
+    html = """
+    <a href="/digi/com/ct/view?nr=9">Z</a>
+    <a href="/digi/com/biz/view?nr=1">A</a>
+    """
+    result = extract_explorer_links(html, BASE_URL)
+    assert result == [
+        "https://example.com/digi/com/ct/view?nr=9",
+        "https://example.com/digi/com/biz/view?nr=1",
+    ]
+    assert extract_explorer_links(html, BASE_URL, sort=True) == sorted(result)
+
+
+def test_extract_relative_links():
+    """Test that path-relative links resolve against the base URL directory."""
+    html = """
+    <a href="viewPayment?nr=1">Paiement</a>
+    <a href="../ct/view?nr=5">Contact</a>
+    """
+    result = extract_explorer_links(html, BASE_URL)
+
+    assert "https://example.com/digi/com/cto/viewPayment?nr=1" in result
+    assert "https://example.com/digi/com/ct/view?nr=5" in result
+
+
+def test_extract_uppercase_attribute_names():
+    """Test that link attributes are found whatever the casing of their names."""
+    html = """
+    <div JSINFOS="url:'/digi/com/ct/view?nr=5'"></div>
+    <span DATA-URL="/digi/com/biz/view?nr=6"></span>
+    """
+    result = extract_explorer_links(html, BASE_URL)
+
+    assert result == [
+        "https://example.com/digi/com/ct/view?nr=5",
+        "https://example.com/digi/com/biz/view?nr=6",
+    ]
+
+
+def test_extract_relative_links_without_absolute_base():
+    """Test that relative links fall back to urljoin when the base URL is not absolute."""
+    html = '<a href="view?nr=1">Vente</a>'
+
+    assert extract_explorer_links(html, "/digi/com/cto/view?nr=1") == ["/digi/com/cto/view?nr=1"]
+    assert extract_explorer_links(html, "") == ["view?nr=1"]
+
+
+def test_extract_jsinfos_url_key_only():
+    """Test that keys merely ending in "url" (returnUrl) are not taken for the url key."""
+    html = """<div jsinfos="{returnUrl:'/r', url:'/digi/com/ct/view?nr=5'}"></div>"""
+
+    assert extract_explorer_links(html, BASE_URL) == ["https://example.com/digi/com/ct/view?nr=5"]
@@ -0,0 +1,100 @@
+"""Tests for explorer link tagging and filtering."""
+import pytest
+from src.parse.explorer_enhanced import (
+    _extract_scope,
+    classify_url,
+    filter_and_tag_explorer_links,
+    get_explorer_links_summary,
+    is_dangerous_link,
+    is_heavy_download,
+    tag_link_type,
+)
+
+
+BASE_URL = "https://example.com/digi/com/cto/view?nr=1"
+
+
+def test_tag_link_type():
+    """Test link type tagging."""
+    assert tag_link_type("https://example.com/digi/com/cto/viewPayment?nr=1") == "tab"
+    assert tag_link_type("https://example.com/digi/com/ct/view?nr=5") == "contact"
+    assert tag_link_type("https://example.com/digi/mod-ep/vehicles/view?nr=7") == "vehicle"
+    assert tag_link_type("https://example.com/digi/com/biz/view?nr=6") == "biz"
+    assert tag_link_type("https://example.com/files/CGV.PDF") == "doc"
+    assert tag_link_type("https://example.com/digi/logout") == "dangerous"
+    assert tag_link_type("https://example.com/digi/home") == "other"
+
+
+def test_dangerous_and_heavy_links():
+    """Test dangerous / heavy download detection."""
+    assert is_dangerous_link("https://example.com/digi/com/cto/del?nr=1")
+    assert is_dangerous_link("https://example.com/?quit=1")
+    assert not is_dangerous_link("https://example.com/digi/com/cto/view?nr=1")
+    assert is_heavy_download("https://example.com/export.zip")
+    assert not is_heavy_download("https://example.com/digi/com/cto/view?nr=1")
+
+
+def test_filter_and_tag_explorer_links():
+    """Test that links are canonicalized, deduplicated and tagged."""
+    html = """
+    <a href="/digi/digi/com/ct/view?nr=5">Contact</a>
+    <a href="/digi/com/ct/view?nr=5">Contact</a>
+    <a href="/digi/logout">Logout</a>
+    <a href="/help/manuel.pdf">Manuel</a>
+    """
+    result = {link["url"]: link for link in filter_and_tag_explorer_links(html, BASE_URL)}
+
+    assert len(result) == 3
+    assert result["https://example.com/digi/com/ct/view?nr=5"]["type"] == "contact"
+    assert result["https://example.com/digi/com/ct/view?nr=5"]["scope"] == "digi"
+    assert result["https://example.com/digi/logout"]["type"] == "dangerous"
+    assert result["https://example.com/digi/logout"]["reason"] == "dangerous_action"
+    assert result["https://example.com/help/manuel.pdf"]["type"] == "doc"
+    assert result["https://example.com/help/manuel.pdf"]["scope"] == "help"
+    assert result["https://example.com/help/manuel.pdf"]["notes"] == ["heavy_download"]
+
+
+def test_filter_and_tag_max_links_counts_distinct_urls():
+    """Test that max_links caps distinct canonical URLs, duplicates not counted."""
+    html = """
+    <a href="/digi/digi/com/ct/view?nr=5">Contact</a>
+    <a href="/digi/com/ct/view?nr=5">Contact</a>
+    <a href="/digi/com/biz/view?nr=6">Biz</a>
+    <a href="/digi/home">Home</a>
+    """
+    result = filter_and_tag_explorer_links(html, BASE_URL, max_links=2)
+
+    assert [link["url"] for link in result] == [
+        "https://example.com/digi/com/ct/view?nr=5",
+        "https://example.com/digi/com/biz/view?nr=6",
+    ]
+
+
+def test_classify_url_matches_helpers():
+    """Test that the fused classifier agrees with the individual helpers."""
+    urls = [
+        "https://example.com/digi/com/cto/viewPayment?nr=1",
+        "https://example.com/digi/com/cto/del?nr=1",
+        "https://example.com/help/manuel.pdf",
+        "https://example.com/crm/ct/view?nr=2",
+        "https://example.com/archive.tar",
+    ]
+    for url in urls:
+        assert classify_url(url) == (
+            tag_link_type(url),
+            _extract_scope(url),
+            is_dangerous_link(url),
+            is_heavy_download(url),
+        )
+
+
+def test_get_explorer_links_summary():
+    """Test per-type counts in the summary."""
+    links = [{"type": "tab"}, {"type": "tab"}, {"type": "dangerous"}, {}]
+    summary = get_explorer_links_summary(links)
+
+    assert summary["total"] == 4
+    assert summary["tab"] == 2
+    assert summary["dangerous"] == 1
+    assert summary["other"] == 1
+    assert summary["biz"] == 0
@@ -38,3 +38,15 @@ def test_empty_html():
     assert contains_location_vehicule("") is False
     assert contains_location_vehicule(None) is False
 
+
+def test_contains_location_vehicule_reports_original_case():
+    """Test that the regex match is found on any casing and reported as written in the page."""
+    html = "<div>Type: LOCATION   de Véhicule</div>"
+    passed, reason = contains_location_vehicule(html)
+    assert passed
+    assert reason["gate_matched_text"] == "LOCATION   de Véhicule"
+
+
+def test_contains_location_vehicule_mixed_case():
+    """Test that the prefilter accepts any casing of "location"."""
+    assert contains_location_vehicule('<h5>LoCation de véhicule</h5>')[0] is True
@@ -65,3 +65,88 @@ def test_parse_jsinfos_masks_gmkey():
     assert parsed is not None
     assert parsed["config"]["gmKey"] == "[MASKED]"
 
+
+def test_parse_jsinfos_invalid_json_kept_raw():
+    """Test that a payload that looks like JSON but does not parse is stored as text."""
+    encoded = base64.b64encode(b'{"title": "x", broken').decode()
+    html = f'<span class="JSinfos base64">{encoded}</span>'
+
+    assert parse_jsinfos(html) == {"jsinfos_raw_0": '{"title": "x", broken'}
+
+
+def test_parse_jsinfos_json_detected_after_whitespace():
+    """Test that leading whitespace does not hide a JSON payload, and plain text stays raw."""
+    as_json = base64.b64encode(b'\r\n  {"title": "Carte"}').decode()
+    as_text = base64.b64encode(b"  plain text").decode()
+    html = f'<span class="JSinfos base64">{as_json}</span><span class="JSinfos base64">{as_text}</span>'
+
+    assert parse_jsinfos(html) == {"jsinfos_Carte": {"title": "Carte"}, "jsinfos_raw_1": "  plain text"}
+
+
+def test_decode_base64_with_whitespace_and_extra_padding():
+    """Test decoding tolerates line breaks and surplus padding."""
+    encoded = base64.b64encode(b'{"a": 1}').decode()
+    wrapped = encoded[:4] + "\n" + encoded[4:].rstrip("=")
+
+    assert decode_base64_safe(wrapped) == b'{"a": 1}'
+    assert decode_base64_safe(encoded + "==") == b'{"a": 1}'
+
+
+def test_parse_jsinfos_regex_scan_matches_dom():
+    """Test that the raw-HTML scan finds the same spans as the DOM query."""
+    from selectolax.lexbor import LexborHTMLParser
+
+    first = base64.b64encode(json.dumps({"config": {"title": "A"}}).encode()).decode()
+    second = base64.b64encode(json.dumps({"title": "B"}).encode()).decode()
+    html = (
+        f'<div><span class="hidden JSinfos base64">\n  {first}\n</span>'
+        f"<span data-x='1' class='base64 JSinfos'>{second}</span>"
+        f'<span class="JSinfos">{first}</span></div>'
+    )
+
+    result = parse_jsinfos(html)
+    assert set(result) == {"jsinfos_A", "jsinfos_B"}
+    assert result == parse_jsinfos(html, parser=LexborHTMLParser(html))
+
+
+def test_parse_jsinfos_falls_back_to_dom():
+    """Test that spans with markup inside are still decoded through the DOM."""
+    encoded = base64.b64encode(json.dumps({"title": "C"}).encode()).decode()
+    html = f'<span class="JSinfos base64">{encoded[:8]}<!-- x -->{encoded[8:]}</span>'
+
+    assert "jsinfos_C" in parse_jsinfos(html)
+    assert parse_jsinfos("<p>nothing here</p>") == {}
+
+
+def test_parse_jsinfos_repeated_blob_gives_fresh_objects():
+    """Test that a blob seen on several pages is decoded once and parsed into independent dicts."""
+    encoded = base64.b64encode(json.dumps({"config": {"title": "Shared"}}).encode()).decode()
+    html = f'<span class="JSinfos base64">{encoded}</span>'
+
+    first = parse_jsinfos(html)
+    first["jsinfos_Shared"]["config"]["title"] = "changed"
+    hits = decode_base64_safe.cache_info().hits
+    second = parse_jsinfos(html)
+
+    assert decode_base64_safe.cache_info().hits == hits + 1
+    assert second["jsinfos_Shared"]["config"]["title"] == "Shared"
+
+
+def test_parse_jsinfos_scan_edge_cases_use_dom():
+    """Test that a ">" inside another attribute or a commented-out span does not fool the scan."""
+    first = base64.b64encode(json.dumps({"a": 1}).encode()).decode()
+    second = base64.b64encode(json.dumps({"b": 2}).encode()).decode()
+
+    html = f'<span title="x>y" class="JSinfos base64">{first}</span><span class="JSinfos base64">{second}</span>'
+    assert parse_jsinfos(html) == {"jsinfos_0": {"a": 1}, "jsinfos_1": {"b": 2}}
+
+    html = f'<span class="JSinfos base64">{first}</span><!-- <span class="JSinfos base64">{second}</span> -->'
+    assert parse_jsinfos(html) == {"jsinfos_0": {"a": 1}}
+
+
+def test_parse_jsinfos_latin1_payload_still_parsed():
+    """Test that a non-UTF-8 JSON payload is still parsed (invalid bytes dropped), not kept raw."""
+    encoded = base64.b64encode('{"title": "Café", "n": 1}'.encode("latin-1")).decode()
+    html = f'<span class="JSinfos base64">{encoded}</span>'
+
+    assert parse_jsinfos(html) == {"jsinfos_Caf": {"title": "Caf", "n": 1}}
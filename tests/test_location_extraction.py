@@ -45,3 +45,37 @@ def test_extract_location_vehicule_minimal():
     # Should return dict even if empty
     assert isinstance(result, dict)
 
+
+def test_extract_location_vehicule_single_link_pass():
+    """Test that each slot keeps the first matching anchor."""
+    html = """
+    <h5>Location de véhicule</h5>
+    <a href="/digi/mod-ep/vehicles/view?nr=1">RENAULT ZOE (AB-123-CD)</a>
+    <a href="/digi/mod-ep/vehicles/view?nr=2">OTHER</a>
+    <a href="/digi/com/cto/view?nr=10">Contrat initial &amp; Caution</a>
+    <a href="/digi/com/cto/view?nr=11">Contrat initial &amp; Caution</a>
+    <a href="/digi/com/cto/view?nr=20">Derniere vente d'abonnement</a>
+    """
+    result = extract_location_vehicule(html)
+
+    assert result["vehicle_nr"] == 1
+    assert result["plate"] == "AB-123-CD"
+    assert result["contract_cto_nr"] == 10
+    assert result["last_subscription_cto_nr"] == 20
+
+
+def test_extract_location_vehicule_semaine_from_text():
+    """Test the semaine fallback on raw HTML and across inline markup."""
+    assert extract_location_vehicule("<p>Semaine : 2025-7</p>")["semaine"] == "2025-7"
+    assert extract_location_vehicule("<p>Semaine <b>2025-8</b></p>")["semaine"] == "2025-8"
+
+
+def test_extract_location_vehicule_nr_parameter_only():
+    """Test that the vehicle nr comes from the nr parameter, not from a longer *nr= parameter."""
+    html = """
+    <h5>Location de véhicule</h5>
+    <a href="/digi/mod-ep/vehicles/view?ordernr=77&nr=28953">RENAULT ZOE</a>
+    """
+    result = extract_location_vehicule(html)
+
+    assert result["vehicle_nr"] == 28953
@@ -0,0 +1,23 @@
+"""Tests for login page detection."""
+import pytest
+from src.auth.login_detector import is_double_session_popup, is_login_page
+
+
+def test_is_login_page_strong_indicator_any_case():
+    """Test that a login form is detected whatever the casing of the HTML."""
+    html = '<html><body><form><INPUT NAME="Password" type="password"></form></body></html>'
+    assert is_login_page(html, 200, "https://example.com/digi/com/cto/view?nr=1")
+
+
+def test_is_login_page_regular_page():
+    """Test that a normal sale page is not taken for a login page."""
+    html = "<html><head><title>Vente 123</title></head><body><h5>Location de véhicule</h5></body></html>"
+    assert not is_login_page(html, 200, "https://example.com/digi/com/cto/view?nr=1")
+
+
+def test_double_session_popup_needs_two_indicators():
+    """Test the double session popup detection threshold."""
+    assert not is_double_session_popup("<div>Double session</div>")
+    html = "<div>DOUBLE SESSION : quittez et reconnectez-vous</div>"
+    assert is_double_session_popup(html)
+    assert is_login_page(html, 200, "https://example.com/digi/com/cto/view?nr=1")
@@ -0,0 +1,20 @@
+"""Tests for the metrics exporter."""
+import asyncio
+
+import orjson
+
+from src.jobs.metrics_exporter import MetricsExporter
+
+
+def test_export_metrics_appends_json_lines(tmp_path):
+    """Test that each export appends one JSON line to the metrics file."""
+    exporter = MetricsExporter("run-1")
+    exporter.metrics_file = tmp_path / "metrics.jsonl"
+
+    for processed in (1, 2):
+        asyncio.run(exporter.export_metrics(processed, 0, processed, 0, 0, 0, 1.234, 5.0, 0.5))
+
+    lines = [orjson.loads(line) for line in exporter.metrics_file.read_bytes().splitlines()]
+    assert [line["processed"] for line in lines] == [1, 2]
+    assert lines[0]["run_id"] == "run-1"
+    assert lines[0]["rps"] == 1.23
@@ -1,6 +1,7 @@
 """Tests to verify _raw_text is not present by default."""
 import pytest
-from src.parse.html_parser import parse_html_pages
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
+from src.parse.html_parser import _extract_debug_snippet, get_page_type, parse_html_pages
 
 
 def test_no_raw_text_by_default():
@@ -37,3 +38,50 @@ def test_debug_snippet_only_when_requested():
     # May or may not have snippet depending on content, but should not have _raw_text
     assert "_raw_text" not in str(result)
 
+
+def test_debug_snippet_matches_body_text():
+    """Verify the early-exit snippet equals a truncated body.text()."""
+    short = "<html><body><div> a  b <script>x=1</script></div><p>\u00e9t\u00e9</p> <span>c</span></body></html>"
+    long = "<html><body>" + "<p> ligne de texte </p>" * 2000 + "</body></html>"
+    for html in (short, long):
+        full = HTMLParser(html).body.text(separator=" ", strip=True)
+        expected = full if len(full.encode("utf-8")) <= 3000 else full[:3000] + "..."
+        assert _extract_debug_snippet(html) == expected
+
+
+def test_parallel_parsing_matches_sequential():
+    """Verify the thread-pool path returns the same result as the sequential one."""
+    responses = {
+        "https://example.com/digi/com/cto/view?nr=1": '<html><body><a href="/digi/com/ct/view?nr=5">Contact</a></body></html>',
+        "https://example.com/digi/com/cto/viewLogistic?nr=1": '<html><body><a href="/docs/bl.pdf">BL</a></body></html>',
+        "https://example.com/digi/com/cto/viewPayment?nr=1": None,
+    }
+
+    sequential = parse_html_pages(responses, "https://example.com", max_workers=1)
+    parallel = parse_html_pages(responses, "https://example.com", max_workers=3)
+
+    assert parallel == sequential
+    assert list(parallel["pages"]) == list(sequential["pages"])
+
+
+def test_parse_executor_grows_with_max_workers():
+    """Verify a call asking for more workers than the shared pool has gets a larger pool."""
+    from src.parse.html_parser import _get_parse_executor
+
+    small = _get_parse_executor(2)
+    assert _get_parse_executor(1) is small
+    large = _get_parse_executor(small._max_workers + 2)
+    assert large is not small
+    assert large._max_workers == small._max_workers + 2
+    # A caller still holding the previous pool can keep submitting to it
+    assert small.submit(sum, (1, 2)).result() == 3
+
+
+def test_get_page_type():
+    """Test page type detection from tab URLs."""
+    base = "https://example.com/digi/com/cto"
+    assert get_page_type(f"{base}/viewLogistic?nr=1") == "logistic"
+    assert get_page_type(f"{base}/viewPayment?nr=1") == "payment"
+    assert get_page_type(f"{base}/viewInfos?nr=1") == "infos"
+    assert get_page_type(f"{base}/viewOrders?nr=1") == "orders"
+    assert get_page_type(f"{base}/view?nr=1") == "view"
@@ -0,0 +1,22 @@
+"""Tests for date parsing."""
+import pytest
+from src.parse.html_parser import parse_date
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("01/02/2024", "2024-02-01T00:00:00"),
+    (" 31/12/2023 ", "2023-12-31T00:00:00"),
+    ("1/2/2024", "2024-02-01T00:00:00"),
+    ("2024-03-05", "2024-03-05T00:00:00"),
+    ("05.06.2024", "2024-06-05T00:00:00"),
+])
+def test_parse_date_formats(raw, expected):
+    """Test the dd/mm/yyyy fast path and the strptime fallbacks."""
+    assert parse_date(raw) == expected
+
+
+def test_parse_date_invalid():
+    """Test that unparseable dates are returned as-is."""
+    assert parse_date("31/02/2024") == "31/02/2024"
+    assert parse_date("bientôt") == "bientôt"
+    assert parse_date("") is None
@@ -74,3 +74,65 @@ def test_redact_json_preserves_structure():
     assert result["gate_passed"] is True
     assert result["pages"]["view"]["jsinfos"]["config"]["gmKey"] == "[REDACTED]"
 
+
+def test_redact_string_several_secrets_in_one_pass():
+    """Test that each secret kind gets its own replacement when they share a string."""
+    text = (
+        'digiSuiteVars.websocketAuthToken = "ws"; gmKey: "gm"; '
+        'REFRESH_TOKEN="rt"; Authorization: "Bearer bt"; DigifactoryBO=ck; keep=me'
+    )
+    assert redact_string(text) == (
+        'digiSuiteVars.websocketAuthToken = "[REDACTED]"; gmKey = "[REDACTED]"; '
+        'refresh_token = "[REDACTED]"; Authorization = "Bearer [REDACTED]"; DigifactoryBO=[REDACTED]; keep=me'
+    )
+
+
+def test_redact_json_skips_clean_payloads():
+    """Test that payloads without secret markers are returned untouched, others still redacted."""
+    clean = {"nr": 1, "lines": [{"name": "Location", "price": 10.0}], 2: "int key"}
+    assert redact_json(clean) is clean
+    empty = {}
+    assert redact_json(empty) is empty
+
+    dirty = {"nr": 1, "pages": [{"GMKEY": "k"}, 'authorization: "Bearer abc"']}
+    result = redact_json(dirty)
+    assert result["pages"][0]["GMKEY"] == "[REDACTED]"
+    assert result["pages"][1] == 'Authorization = "Bearer [REDACTED]"'
+
+
+def test_redact_string_prefilter_is_case_insensitive():
+    """Test that the cheap token check does not skip upper-case secrets."""
+    assert redact_string("GMKEY:'x'") == 'gmKey = "[REDACTED]"'
+    assert redact_string("digifactorybo=abc") == "DigifactoryBO=[REDACTED]"
+    assert redact_string("Rien à masquer ici") == "Rien à masquer ici"
+    assert redact_string(None) is None
+
+
+def test_redact_json_deep_and_nested_lists():
+    """Test redaction inside lists of lists, non-str keys, and payloads deeper than the recursion limit."""
+    data = {1: "plain", "rows": [[{"access_token": "t"}, "gmKey: 'abc'"]]}
+    result = redact_json(data)
+    assert result["rows"][0][0]["access_token"] == "[REDACTED]"
+    assert result["rows"][0][1] == 'gmKey = "[REDACTED]"'
+    assert data["rows"][0][0]["access_token"] == "t"  # input left untouched
+
+    deep = node = {}
+    for _ in range(5000):
+        node["child"] = node = {}
+    node["gmKey"] = "secret"
+    result = redact_dict(deep)
+    for _ in range(5000):
+        result = result["child"]
+    assert result["gmKey"] == "[REDACTED]"
+
+
+def test_redact_json_in_place():
+    """Test that in_place=True redacts the given containers instead of copying them."""
+    rows = [{"gmKey": "secret"}, "access_token: 'abc'"]
+    data = {"rows": rows, "nb": 2}
+    result = redact_json(data, in_place=True)
+    assert result is data
+    assert data["rows"] is rows
+    assert rows[0]["gmKey"] == "[REDACTED]"
+    assert rows[1] == 'access_token = "[REDACTED]"'
+    assert data["nb"] == 2
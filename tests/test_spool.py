@@ -0,0 +1,39 @@
+"""Tests for the disk spool."""
+import asyncio
+import pytest
+from src.parse.models import SaleRecord
+from src.store.spool import SpoolManager
+
+
+def test_write_records_roundtrip(tmp_path):
+    """Test that a batch written in one go reads back line by line, appending to the file."""
+    spool = SpoolManager(tmp_path)
+    records = [SaleRecord(nr=nr, data={"nr": nr}) for nr in (1, 2)]
+
+    asyncio.run(spool.write_records(records, batch_id=7))
+    asyncio.run(spool.write_record(SaleRecord(nr=3), batch_id=7))
+    asyncio.run(spool.write_records([], batch_id=7))
+
+    loaded = asyncio.run(spool.read_batch(7))
+    assert [r["nr"] for r in loaded] == [1, 2, 3]
+    assert loaded[0]["data"] == {"nr": 1}
+
+
+def test_read_batch_skips_bad_lines(tmp_path):
+    """Test that blank and corrupt lines are skipped without losing the others."""
+    spool = SpoolManager(tmp_path)
+    (tmp_path / "batch_3.jsonl").write_bytes(b'{"nr": 1}\n\n{broken\n{"nr": 2}')
+
+    assert asyncio.run(spool.read_batch(3)) == [{"nr": 1}, {"nr": 2}]
+    assert asyncio.run(spool.read_batch(4)) == []
+
+
+def test_iter_spool_entries_filters_batch_files(tmp_path):
+    """Test that only batch_*.jsonl files are listed, matching list_spool_files."""
+    spool = SpoolManager(tmp_path)
+    for name in ("batch_1.jsonl", "batch_2.jsonl", "batch_3.jsonl.tmp", "other.jsonl"):
+        (tmp_path / name).write_bytes(b"")
+    (tmp_path / "batch_4.jsonl").mkdir()
+
+    names = sorted(entry.name for entry in spool.iter_spool_entries())
+    assert names == ["batch_1.jsonl", "batch_2.jsonl"]
@@ -0,0 +1,95 @@
+"""Tests for the SQLite progress state."""
+import asyncio
+import pytest
+from src.store.state import StateDB
+
+
+def test_state_db_shared_connection(tmp_path):
+    """Test progress tracking over the shared connection, and reopening after close."""
+    async def scenario():
+        state = StateDB(tmp_path / "state.db")
+        await state.initialize()
+        await asyncio.gather(state.mark_done(1), state.mark_not_found(2), state.mark_failed(3, "boom"))
+        assert await state.is_done(1)
+        assert not await state.is_done(2)
+        assert await state.get_next_undone(1, 4) == [2, 3, 4]
+        await state.close()
+
+        # A closed StateDB reconnects on next use
+        assert await state.get_stats() == {"ok": 1, "not_found": 1, "failed": 1}
+        await state.close()
+
+    asyncio.run(scenario())
+
+
+def test_state_db_uses_wal(tmp_path):
+    """Test that the shared connection runs in WAL mode."""
+    async def scenario():
+        state = StateDB(tmp_path / "state.db")
+        await state.initialize()
+        db = await state._connection()
+        rows = await db.execute_fetchall("PRAGMA journal_mode")
+        await state.close()
+        return rows[0][0]
+
+    assert asyncio.run(scenario()) == "wal"
+
+
+def test_state_db_pending_marks_written_on_close(tmp_path):
+    """Test that coalesced marks are visible before the write and persisted by close()."""
+    async def scenario():
+        state = StateDB(tmp_path / "state.db")
+        await state.initialize()
+        await state.mark_failed(5, "x" * 600)
+        await state.mark_done(5)
+        assert await state.is_done(5)
+        await state.close()
+
+        reopened = StateDB(tmp_path / "state.db")
+        db = await reopened._connection()
+        rows = await db.execute_fetchall("SELECT nr, status, error FROM scrape_progress")
+        await reopened.close()
+        return rows
+
+    assert asyncio.run(scenario()) == [(5, "ok", None)]
+
+
+def test_get_next_undone_gaps(tmp_path):
+    """Test the undone list at range edges, with non-ok statuses and done nrs outside the range."""
+    async def scenario():
+        state = StateDB(tmp_path / "state.db")
+        await state.initialize()
+        for nr in (0, 1, 4, 5, 7, 11):
+            await state.mark_done(nr)
+        await state.mark_failed(6, "boom")
+        undone = await state.get_next_undone(1, 10)
+        all_done = await state.get_next_undone(4, 5)
+        await state.close()
+        return undone, all_done
+
+    assert asyncio.run(scenario()) == ([2, 3, 6, 8, 9, 10], [])
+
+
+def test_is_done_answers_from_memory(tmp_path):
+    """Test that is_done uses the set loaded at initialize() and follows later marks."""
+    async def scenario():
+        state = StateDB(tmp_path / "state.db")
+        await state.initialize()
+        await state.mark_done(1)
+        await state.mark_done(2)
+        await state.close()
+
+        reopened = StateDB(tmp_path / "state.db")
+        await reopened.initialize()
+        db = await reopened._connection()
+        # Rows changed behind its back are not seen: the answer comes from memory
+        await db.execute("DELETE FROM scrape_progress")
+        await db.commit()
+        results = [await reopened.is_done(1), await reopened.is_done(3)]
+        await reopened.mark_done(3)
+        await reopened.mark_failed(1, "boom")
+        results += [await reopened.is_done(3), await reopened.is_done(1)]
+        await reopened.close()
+        return results
+
+    assert asyncio.run(scenario()) == [True, False, True, False]
@@ -53,6 +53,35 @@ def test_extract_infos_data():
     assert result["infos_fields"].get("Label 1") == "Value 1"
 
 
+def test_extract_infos_data_reads_every_pair():
+    """Test that every dt/dd pair of a list is read, not only the first."""
+    html = """
+    <dl>
+        <dt>Agence</dt>
+        <dd>Lyon</dd>
+        <dt>Canal</dt>
+        <dd>Web</dd>
+    </dl>
+    """
+    result = extract_infos_data(html)
+
+    assert result["infos_fields"] == {"Agence": "Lyon", "Canal": "Web"}
+
+
+def test_extract_infos_data_dl_with_div_groups():
+    """Test that dt/dd pairs wrapped in <div> groups are read, and a dt without dd is skipped."""
+    html = """
+    <dl>
+        <div><dt>Agence</dt><dd>Lyon</dd></div>
+        <dt>Orphan</dt>
+        <div><dt>Canal</dt><dd>Web</dd></div>
+    </dl>
+    """
+    result = extract_infos_data(html)
+
+    assert result["infos_fields"] == {"Agence": "Lyon", "Canal": "Web"}
+
+
 def test_extract_orders_data():
     """Test orders tab extraction."""
     html = """
@@ -64,6 +93,20 @@ def test_extract_orders_data():
     assert "orders_summary" in result or "margin" in result
 
 
+def test_extract_orders_data_purchase_line_containers():
+    """Test that purchase-line containers wrapping a table are read once, nested rows included."""
+    html = """
+    <div class="purchase-line"><table><tr class="order-line"><td><b>Widget</b></td><td>10,00</td></tr></table></div>
+    <table><tr data-line="2"><td>Gadget</td><td>5,50</td></tr></table>
+    """
+    result = extract_orders_data(html)
+
+    assert result["purchase_lines"] == [
+        {"name": "Widget", "amount": 10.0},
+        {"name": "Gadget", "amount": 5.5},
+    ]
+
+
 def test_extract_empty_tab():
     """Test extraction from empty tab."""
     html = "<html><body>Empty</body></html>"
@@ -74,3 +117,200 @@ def test_extract_empty_tab():
     # Should not have _raw_text
     assert "_raw_text" not in result
 
+
+def test_extract_infos_data_resolves_js_totals():
+    """Test that template cells are resolved from JS variables and JSON keys."""
+    html = """
+    <script>var totalTax = 20.5; var data = {"totalprice": 120.5};</script>
+    <dl><dt>TVA</dt><dd>{{totalTax}}</dd></dl>
+    <dl><dt>Total</dt><dd>{{price(totalPrice)}}</dd></dl>
+    """
+    result = extract_infos_data(html)
+
+    assert result["infos_fields"]["TVA"] == 20.5
+    assert result["infos_fields"]["Total"] == 120.5
+
+
+def test_extract_numeric_from_text_formats():
+    """Test numeric parsing with French separators and surrounding text."""
+    from src.parse.extractors.tabs_extractors import _extract_numeric_from_text
+
+    assert _extract_numeric_from_text("1 234,56 €") == 1234.56
+    assert _extract_numeric_from_text("Total: 12.5") == 12.5
+    assert _extract_numeric_from_text("1 000,00") == 1000.0
+    assert _extract_numeric_from_text("n/a") is None
+    assert _extract_numeric_from_text("") is None
+
+
+def test_extract_payment_data_skips_dom_without_markers():
+    """Test that a page without payment markers never builds the DOM tree."""
+    from src.parse.page import ParsedPage
+
+    page = ParsedPage("<div><p>Rien ici</p></div>")
+    result = extract_payment_data(page.html_content, page=page)
+
+    assert result == {}
+    assert "parser" not in page.__dict__
+
+
+def test_payment_jsinfos_span_counted_once():
+    """Test that a span.JSinfos table yields each payment request once."""
+    from src.parse.payment_details import extract_payment_data_from_jsinfos
+
+    html = '<span class="JSinfos">{"data": [{"nr": 7, "bref": "PR-7", "state": "sent"}]}</span>'
+    result = extract_payment_data_from_jsinfos(html, "https://example.com")
+
+    assert result["debug"]["jsinfos_spans_total"] == 1
+    assert [r["nr"] for r in result["payment_requests"]] == [7]
+
+
+def test_payment_jsinfos_menu_span_not_parsed():
+    """Test that spans without any payment/transaction key are skipped before parsing."""
+    from src.parse.payment_details import extract_payment_data_from_jsinfos
+
+    html = (
+        '<span class="JSinfos">{"data": [{"label": "Sections principales", "url": "/menu"}]}</span>'
+        '<span class="JSinfos">{"data": [{"nr": 3, "paymentmethodnr": 1, "date": "2024-01-02", '
+        '"amount": 10, "num": "T3"}]}</span>'
+    )
+    result = extract_payment_data_from_jsinfos(html, "https://example.com")
+
+    assert result["debug"]["skipped_no_table_keys"] == 1
+    assert result["debug"]["parsed_ok"] == 1
+    assert [t["nr"] for t in result["transactions"]] == [3]
+
+
+def test_gocardless_modal_label_priority():
+    """Test that the earlier label fragment wins even when a weaker match comes first."""
+    from src.parse.payment_details import parse_gocardless_modal
+
+    html = """
+    <fieldset>
+      <article><label>Montant remboursé</label><div>0,00 €</div></article>
+      <article><label>Montant demande</label><div>1 210,50 €</div></article>
+      <article><label>ÉTAT</label><div>Payé</div></article>
+    </fieldset>
+    """
+    details = parse_gocardless_modal(html, 1, "")["details"]
+
+    assert details["montant_demande"] == 1210.5
+    assert details["montant_rembourse"] == 0.0
+    assert details["etat_demande_prelevement"] == "Payé"
+
+
+def test_gocardless_modal_amount_with_no_break_spaces():
+    """Test that thousands separated by no-break spaces (as rendered by the portal) parse whole."""
+    from src.parse.payment_details import parse_gocardless_modal
+
+    html = "<fieldset><article><label>Montant demande</label><div>1\u00a0210,50\u00a0€</div></article></fieldset>"
+    details = parse_gocardless_modal(html, 1, "")["details"]
+
+    assert details["montant_demande"] == 1210.5
+
+
+def test_modal_labels_match_without_accents_or_case():
+    """Test that labels match schema fragments whatever their accents and casing."""
+    from src.parse.payment_details import parse_gocardless_modal, parse_transaction_modal
+
+    html = """
+    <fieldset>
+      <article><label>Montant remboursé</label><div>0,00 €</div></article>
+      <article><label>MONTANT DEMANDÉ</label><div>50,00 €</div></article>
+    </fieldset>
+    """
+    assert parse_gocardless_modal(html, 1, "")["details"]["montant_demande"] == 50.0
+
+    html = "<fieldset><article><label>Numero Transaction</label><div>TX-9</div></article></fieldset>"
+    assert parse_transaction_modal(html, 1, "")["transaction_id"] == "TX-9"
+
+
+def test_transaction_modal_section_fields_take_precedence():
+    """Test that section articles win and carry links, plain fieldset articles only fill gaps."""
+    from src.parse.payment_details import parse_transaction_modal
+
+    html = """
+    <fieldset><article><label>Compte bancaire</label><div><a href="/old">Ancien</a></div></article>
+      <article><label>Type</label><div>Virement</div></article></fieldset>
+    <section><fieldset>
+      <article><label>Compte bancaire</label><div><a href="/bank/1">BNP</a></div></article>
+    </fieldset></section>
+    <article><label>Montant</label><div>99 €</div></article>
+    """
+    result = parse_transaction_modal(html, 1, "")
+
+    assert result["raw_fields"] == {
+        "Compte bancaire": "BNP",
+        "Type": "Virement",
+        "Compte bancaire_url": "/bank/1",
+        "Compte bancaire_link": "BNP",
+    }
+    assert list(result["raw_fields"]) == ["Compte bancaire", "Compte bancaire_url", "Compte bancaire_link", "Type"]
+    assert result["bank_account_href"] == "/bank/1"
+
+
+def test_transaction_modal_section_fields_matched_first():
+    """Test that a section field wins the label match over a plain fieldset field placed before it."""
+    from src.parse.payment_details import parse_transaction_modal
+
+    html = """
+    <fieldset><article><label>Montant total</label><div>5 EUR</div></article></fieldset>
+    <section><fieldset><article><label>Montant</label><div>10 EUR</div></article></fieldset></section>
+    """
+    assert parse_transaction_modal(html, 1, "")["amount"] == 10.0
+
+
+def test_extract_fields_matches_per_selector_fallbacks():
+    """Test that the single-query field resolver keeps selector priority per field."""
+    from selectolax.lexbor import LexborHTMLParser
+    from src.parse.extractors._common import extract_fields, extract_numeric, extract_text_by_patterns
+
+    html = """
+    <div class="x-total-due">n/a</div>
+    <div data-total-due="1">12,50</div>
+    <div class="total-due">99</div>
+    <div class="balance"></div>
+    <span data-balance="1">3</span>
+    <p class="statut-livraison">Expédié</p>
+    """
+    parser = LexborHTMLParser(html)
+    numeric_fields = {
+        "total_due": ["[class*='total-due']", "[data-total-due]", ".total-due"],
+        "total_paid": [".total-paid"],
+        "balance": [".balance", "[data-balance]"],
+    }
+    text_fields = {"shipping_status": [".shipping-status", ".statut-livraison"]}
+
+    numbers = extract_fields(parser, numeric_fields, numeric=True)
+    assert numbers == {
+        field: value
+        for field, selectors in numeric_fields.items()
+        if (value := extract_numeric(parser, selectors)) is not None
+    }
+    assert numbers == {"total_due": 12.5, "balance": 3.0}
+    assert extract_fields(parser, text_fields) == {
+        "shipping_status": extract_text_by_patterns(parser, text_fields["shipping_status"])
+    }
+
+
+def test_classify_document_link_priority():
+    """Test document type priority (bl > tracking > pdf) and whole-word BL matching."""
+    from src.parse.extractors.tabs_extractors import _classify_document_link
+
+    assert _classify_document_link("/documents/bl.pdf", "Bon de livraison") == "bl"
+    assert _classify_document_link("/docs/suivi.pdf", "Colis") == "tracking"
+    assert _classify_document_link("/docs/facture.pdf", "Facture") == "pdf"
+    assert _classify_document_link("/tables/tracking", "Voir") == "tracking"
+    assert _classify_document_link("/documents/42", "Voir") == "document"
+    assert _classify_document_link("/docs/bl_123.html", "Voir") == "bl"
+
+
+def test_extract_logistic_data_bl_token_only():
+    """Test that "bl" inside a word (tables) does not make a link a document."""
+    html = """
+    <a href="/tables/list">Tableaux</a>
+    <a href="/docs/bl_123.html">Voir</a>
+    """
+    result = extract_logistic_data(html)
+
+    assert [doc["url"] for doc in result["documents"]] == ["/docs/bl_123.html"]
+    assert result["documents"][0]["type"] == "bl"